@@ -1,11 +1,16 @@
 from django.contrib import admin
 
 from .models import User
+from extensions.admin import FastChangeListMixin, jalali_column
+from extensions.jalali_filters import JalaliYearFilter, JalaliMonthFilter
 
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = ('first_name', 'email', 'phone',
                     'image_tag', 'jdate_joined')
-    list_filter = ('date_joined',)
-    search_fields = ('first_name', 'last_name', 'email', 'description')
+    list_filter = (JalaliYearFilter, JalaliMonthFilter)
+    # Prefix and exact lookups of indexed columns
+    search_fields = ('=id', '^first_name', '^email')
+
+    jdate_joined = jalali_column('date_joined', 'تاریخ عضویت')
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import User
+
+
+# Fields of the cached user of requests. They are enough for the login and
+# permission checks and the dashboard mixins; any other field is loaded
+# when it is first read.
+SNAPSHOT_FIELDS = ('id', 'password', 'email', 'first_name', 'image', 
+				   'is_active', 'is_staff', 'is_superuser', 
+				   'is_email_verified')
+
+SNAPSHOT_TIMEOUT = getattr(settings, 'USER_SNAPSHOT_TIMEOUT', 30 * 60)
+
+
+def _key(user_id):
+	return 'user_snapshot:{}'.format(user_id)
+
+
+def invalidate(user_id):
+	"""
+	Drop the cached user now and again after the current transaction
+	commits, so a user read before the commit is not kept.
+	"""
+	cache.delete(_key(user_id))
+	transaction.on_commit(lambda: cache.delete(_key(user_id)))
+
+
+class CachedUserBackend(ModelBackend):
+	"""
+	Authenticate like ModelBackend, but load request.user from a cached
+	compact copy of the user, so logged in requests do not query the user.
+	The copy is dropped when the user is saved or deleted.
+	"""
+	def get_user(self, user_id):
+		key = _key(user_id)
+		user = cache.get(key)
+		if user is None:
+			user = User._default_manager.only(*SNAPSHOT_FIELDS) \
+										.filter(pk=user_id).first()
+			if user is None:
+				return None
+			cache.set(key, user, SNAPSHOT_TIMEOUT)
+		return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db.models import Count, Q
+
+from extensions.pagination import cursor_paginate
+
+
+# Rows of one page of the dashboard tables.
+DASHBOARD_PAGE_SIZE = getattr(settings, 'DASHBOARD_PAGE_SIZE', 20)
+
+# Status of the url to the published_status it shows.
+STATUS_SLUGS = {
+	'published': 'p',
+	'draft': 'd',
+	'check': 'c',
+	'back': 'b',
+}
+
+
+def status_counts(queryset):
+	"""
+	return the number of objects of queryset in every status of STATUS_SLUGS
+	and in total, with one conditional aggregation query.
+	"""
+	return queryset.order_by().aggregate(
+		all=Count('id'),
+		**{slug: Count('id', filter=Q(published_status=value)) 
+		   for slug, value in STATUS_SLUGS.items()}
+	)
+
+
+def dashboard_context(request, queryset, status, fields, field):
+	"""
+	return the context of a dashboard table: one page of the objects of
+	queryset in a status, ordered by field, and the counts of all statuses.
+	"""
+	counts = status_counts(queryset)
+	if status in STATUS_SLUGS:
+		queryset = queryset.filter(published_status=STATUS_SLUGS[status])
+	page = cursor_paginate(queryset.only(*fields), request.GET.get('cursor'), 
+						   DASHBOARD_PAGE_SIZE, field)
+	return {'page': page, 'status': status, 'counts': counts}
@@ -1,3 +1,4 @@
+from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import get_user_model
 
@@ -11,3 +12,45 @@ class RegisterForm(UserCreationForm):
 	error_messages = {
 		'password_mismatch': 'رمزهای عبور با یک‌دیگر تفاوت دارند.',
 	}
+
+
+class EstateBulkForm(forms.Form):
+	"""An operation of the agent dashboard on the chosen estates."""
+	ACTION_CHOICES = (
+		('review', 'ارسال برای بررسی'),
+		('draft', 'پیش‌نویس'),
+		('price', 'تغییر قیمت'),
+		('delete', 'حذف'),
+	)
+	PRICE_FIELD_CHOICES = (
+		('price', 'قیمت'),
+		('monthly_rent', 'اجاره ماهانه'),
+	)
+	MAX_ESTATES = 1000
+
+	action = forms.ChoiceField(choices=ACTION_CHOICES, label='عملیات')
+	estates = forms.Field(widget=forms.MultipleHiddenInput, label='املاک')
+	percent = forms.IntegerField(required=False, min_value=-99, 
+								 max_value=1000, label='درصد تغییر')
+	price_field = forms.ChoiceField(choices=PRICE_FIELD_CHOICES, 
+									required=False, label='قیمت')
+
+	def clean_estates(self):
+		try:
+			ids = {int(pk) for pk in self.cleaned_data['estates']}
+		except (TypeError, ValueError):
+			raise forms.ValidationError('شناسه ملک نامعتبر است.')
+		if len(ids) > self.MAX_ESTATES:
+			raise forms.ValidationError(
+				'حداکثر {} ملک را می‌توان با هم تغییر داد.'.format(
+					self.MAX_ESTATES
+				)
+			)
+		return sorted(ids)
+
+	def clean(self):
+		cleaned_data = super().clean()
+		if cleaned_data.get('action') == 'price' and \
+				not cleaned_data.get('percent'):
+			self.add_error('percent', 'درصد تغییر قیمت را وارد کنید.')
+		return cleaned_data
@@ -1,11 +1,12 @@
 from django.http.response import HttpResponseRedirect
 from django.urls.base import reverse
 from django.http import Http404
-from django.shortcuts import get_object_or_404
+from django.db import transaction
 
 from real_estate.models import Estate
 from blog.models import Article
-from subscription.models import Subscription
+from subscription import entitlements
+from extensions import object_cache
 
 
 class ArticleFieldsMixin():
@@ -33,11 +34,18 @@ class ArticleUpdateMixin():
 	article's published status is checking.
 	"""	
 	def dispatch(self, request, pk, *args, **kwargs):
-		article = get_object_or_404(Article, pk = pk)
-		if article.published_status == 'c' or article.author != request.user:
+		article = object_cache.get_object_or_404(Article, pk, shared=False)
+		if article.published_status == 'c' or \
+				article.author_id != request.user.id:
 			raise Http404
 		return super().dispatch(request, *args, **kwargs)
 
+	def get_object(self, queryset=None):
+		# The article is already loaded by dispatch in this request.
+		return object_cache.get_object(
+			Article, self.kwargs['pk'], shared=False
+		)
+
 
 class ArticleDeleteMixin():
 	"""
@@ -45,11 +53,17 @@ class ArticleDeleteMixin():
 	The app will raise a 404 error if user is not the author of article.
 	"""
 	def dispatch(self, request, pk, *args, **kwargs):
-		article = get_object_or_404(Article, pk = pk)
-		if article.author != request.user:
+		article = object_cache.get_object_or_404(Article, pk, shared=False)
+		if article.author_id != request.user.id:
 			raise Http404
 		return super().dispatch(request, *args, **kwargs)
 
+	def get_object(self, queryset=None):
+		# The article is already loaded by dispatch in this request.
+		return object_cache.get_object(
+			Article, self.kwargs['pk'], shared=False
+		)
+
 
 class CheckSubscriptionMixin():
 	"""Check the agent subscription."""
@@ -58,10 +72,7 @@ class CheckSubscriptionMixin():
 		if agent.is_superuser:
 			return super().dispatch(request, *args, **kwargs)
 
-		subscription = Subscription.objects.filter(
-			active=True, agent=agent
-		).last()
-		if not subscription or not subscription.is_active():
+		if not entitlements.has_quota(agent.id):
 			return HttpResponseRedirect(
 				reverse('subscription:subscription_alert')
 			)
@@ -97,18 +108,19 @@ class EstateFormValidMixin():
 		return super().form_valid(form)
 
 
-class AddCreatedEstatesMixin():
+class ReserveEstateMixin():
 	"""
-	Add one to the created estates after create a new estate.
+	Use one estate of the agent subscription in the transaction that creates
+	the estate, and redirect if the quota is used up in the meantime.
 	"""
 	def form_valid(self, form):
-		subscription = Subscription.objects.filter(
-					active=True, agent=self.obj.agent
-		).last()
-		if subscription:
-			subscription.created_estates += 1
-			subscription.save()
-		return super().form_valid(form)
+		with transaction.atomic():
+			if entitlements.reserve(self.request.user.id) is None and \
+					not self.request.user.is_superuser:
+				return HttpResponseRedirect(
+					reverse('subscription:subscription_alert')
+				)
+			return super().form_valid(form)
 
 class EstateUpdateMixin():
 	"""
@@ -116,11 +128,18 @@ class EstateUpdateMixin():
 	estate's published status is checking.
 	"""		
 	def dispatch(self, request, pk, *args, **kwargs):
-		estate = get_object_or_404(Estate, pk = pk)
-		if estate.published_status == 'c' or estate.agent != request.user:
+		estate = object_cache.get_object_or_404(Estate, pk, shared=False)
+		if estate.published_status == 'c' or \
+				estate.agent_id != request.user.id:
 			raise Http404
 		return super().dispatch(request, *args, **kwargs)
 
+	def get_object(self, queryset=None):
+		# The estate is already loaded by dispatch in this request.
+		return object_cache.get_object(
+			Estate, self.kwargs['pk'], shared=False
+		)
+
 
 class EstateDeleteMixin():
 	"""
@@ -128,11 +147,17 @@ class EstateDeleteMixin():
 	The app will raise a 404 error if user is not the owner of estate.
 	"""	
 	def dispatch(self, request, pk, *args, **kwargs):
-		estate = get_object_or_404(Estate, pk = pk)
-		if estate.agent != request.user:
+		estate = object_cache.get_object_or_404(Estate, pk, shared=False)
+		if estate.agent_id != request.user.id:
 			raise Http404
 		return super().dispatch(request, *args, **kwargs)
 
+	def get_object(self, queryset=None):
+		# The estate is already loaded by dispatch in this request.
+		return object_cache.get_object(
+			Estate, self.kwargs['pk'], shared=False
+		)
+
 
 class LogInMixin():
 	"""Redirect user to home page if he already logged in."""
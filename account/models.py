@@ -3,6 +3,7 @@ from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.base_user import BaseUserManager
 from django.utils.html import format_html
 
+from extensions.fields import JalaliYearMonthField
 from extensions.utils import jalali_converter
 
 
@@ -71,6 +72,8 @@ class User(AbstractUser):
 	email_verify_code = models.CharField(
 		blank=True, null=True, max_length=4, verbose_name='کد تأیید ایمیل'
 	)
+	jalali_year_month = JalaliYearMonthField(source='date_joined', 
+											 verbose_name='ماه عضویت')
 	
 	__original_email = None
 
@@ -86,6 +89,12 @@ class User(AbstractUser):
 
 	class Meta:
 		ordering = ('-date_joined',)
+		indexes = [
+			# Active agents, newest first.
+			models.Index(fields=['is_active', 'date_joined']),
+			# Admin search
+			models.Index(fields=['first_name']),
+		]
 		verbose_name = "نماینده"
 		verbose_name_plural = "نمایندگان"		
 
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .backends import invalidate as invalidate_snapshot
+from .models import User
+from blog.models import Article
+from real_estate.models import Estate
+from extensions import object_cache
+
+
+object_cache.register(User, lambda: User.objects.all())
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, update_fields=None, **kwargs):
+	"""
+	Drop the cached user, its snapshot of requests and the cached estates and
+	articles that embed it.
+	"""
+	object_cache.invalidate(User, instance.pk)
+	invalidate_snapshot(instance.pk)
+	# Logging in only updates last_login which is not cached with others.
+	if update_fields and set(update_fields) == {'last_login'}:
+		return
+	object_cache.invalidate_all(Estate)
+	object_cache.invalidate_all(Article)
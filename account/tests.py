@@ -1,3 +1,71 @@
+import datetime
+
 from django.test import TestCase
+from django.utils import timezone
+
+from .models import User
+from extensions.pagination import cursor_paginate
+
+
+class CursorPaginateTests(TestCase):
+	def setUp(self):
+		now = timezone.now()
+		for number in range(5):
+			user = User.objects.create_user(
+				'user{}@example.com'.format(number), 'password', 
+				first_name='user', phone='09120000000', image='image.png'
+			)
+			# The last two users joined at the same time.
+			User.objects.filter(pk=user.pk).update(
+				date_joined=now + datetime.timedelta(minutes=min(number, 3))
+			)
+		self.ids = list(User.objects.order_by('-date_joined', '-pk')
+									.values_list('id', flat=True))
+
+	def page(self, cursor=None):
+		return cursor_paginate(User.objects.all(), cursor, 2, 'date_joined')
+
+	def ids_of(self, page):
+		return [user.id for user in page]
+
+	def test_next_pages(self):
+		first = self.page()
+		self.assertEqual(self.ids_of(first), self.ids[:2])
+		self.assertFalse(first.has_previous())
+		self.assertTrue(first.has_next())
+
+		second = self.page(first.next_cursor)
+		self.assertEqual(self.ids_of(second), self.ids[2:4])
+		self.assertTrue(second.has_previous())
+		self.assertTrue(second.has_next())
+
+		last = self.page(second.next_cursor)
+		self.assertEqual(self.ids_of(last), self.ids[4:])
+		self.assertTrue(last.has_previous())
+		self.assertFalse(last.has_next())
+
+	def test_previous_pages(self):
+		second = self.page(self.page().next_cursor)
+		last = self.page(second.next_cursor)
+
+		back = self.page(last.previous_cursor)
+		self.assertEqual(self.ids_of(back), self.ids[2:4])
+		self.assertTrue(back.has_previous())
+		self.assertTrue(back.has_next())
+
+		first = self.page(back.previous_cursor)
+		self.assertEqual(self.ids_of(first), self.ids[:2])
+		self.assertFalse(first.has_previous())
+		self.assertTrue(first.has_next())
+
+	def test_page_ending_at_the_last_row(self):
+		page = cursor_paginate(User.objects.all(), None, 5, 'date_joined')
+		self.assertEqual(self.ids_of(page), self.ids)
+		self.assertFalse(page.has_next())
+		self.assertFalse(page.has_previous())
 
-# Create your tests here.
+	def test_invalid_cursor_gives_the_first_page(self):
+		for cursor in ('invalid', 'WyJ4IiwgMSwgMl0='):
+			page = self.page(cursor)
+			self.assertEqual(self.ids_of(page), self.ids[:2])
+			self.assertFalse(page.has_previous())
@@ -6,7 +6,7 @@ from django.contrib.auth.views import (
 from .views import (
 	UserList, UserDetail, ArticleList, ArticleCreate, ArticlePreview, 
 	ArticleUpdate, ArticleDelete, EstateList, EstateCreate, EstateUpdate, 
-	EstateDelete, EstatePreview, EstateImageDelete, SubscriptionList,
+	EstateDelete, EstatePreview, EstateBulk, EstateImageDelete, SubscriptionList,
 	LogIn, Register, PasswordChange, UserUpdate, PasswordReset, 
 	PasswordResetDone, PasswordResetConfirm, PasswordResetComplete, EmailAlert,
 	SendEmailVerifyCode, EmailVerify
@@ -39,6 +39,7 @@ urlpatterns = [
 		 name="estate_update"),
 	path('estate_delete/<int:pk>/', EstateDelete.as_view(), 
 		 name="estate_delete"),
+	path('estate_bulk/', EstateBulk.as_view(), name="estate_bulk"),
 	path('estate_preview/<int:estate_id>/', EstatePreview.as_view(), 
 		 name="estate_preview"),
 	path('estate_image_delete/<int:image_id>/', EstateImageDelete.as_view(), 
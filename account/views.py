@@ -1,11 +1,13 @@
 from django.urls import reverse_lazy
 from django.conf import settings
 from django.http import Http404
-from django.db.models import Q, Count
+from django.contrib import messages
+from django.db import transaction
+from django.db.models import Q
 from django.contrib.auth import authenticate, login
 from django.core.mail import send_mail
 from django.views.generic import (
-	CreateView, TemplateView, UpdateView, DeleteView
+	CreateView, TemplateView, UpdateView, DeleteView, View
 )
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.contrib.auth.decorators import login_required
@@ -18,14 +20,21 @@ from django.shortcuts import redirect, render, get_object_or_404
 from .models import User
 from .mixins import (ArticleFieldsMixin, ArticleFormValidMixin, 
 	ArticleUpdateMixin, ArticleDeleteMixin, CheckSubscriptionMixin, 
-	AddCreatedEstatesMixin, EstateFieldsMixin, EstateFormValidMixin, 
+	ReserveEstateMixin, EstateFieldsMixin, EstateFormValidMixin, 
 	EstateUpdateMixin, EstateDeleteMixin, LogInMixin, UserFieldsMixin, 
 	EmailVerifyRedirectMixin, CheckEmailActivationMixin)
-from .forms import RegisterForm
+from .forms import RegisterForm, EstateBulkForm
 from .generate_random_number import generate_random_number
-from real_estate.models import Estate, EstateImage, City
+from .dashboard import dashboard_context
+from real_estate import bulk
+from real_estate.models import (Estate, EstateImage, 
+	DASHBOARD_FIELDS as ESTATE_DASHBOARD_FIELDS)
+from real_estate.search import get_search_form_context
 from site_setting.models import SiteSetting
-from blog.models import Article, Category
+from blog.models import (Article, Category, LIST_FIELDS, 
+	DASHBOARD_FIELDS as ARTICLE_DASHBOARD_FIELDS)
+from counter.utils import get_count, get_counts, agent_estates
+from extensions import object_cache
 from site_setting.models import SiteSetting
 
 
@@ -35,7 +44,7 @@ class UserList(TemplateView):
 	This view also handle the search and filters objects by given search key.
 	"""
 	def get(self, request, *args, **kwargs):
-		users = User.active.annotate(estates_count=Count('estates'))
+		users = User.active.all()
 
 		search = request.GET.get('s', None)
 		if search:
@@ -56,6 +65,11 @@ class UserList(TemplateView):
 			# if page is out of range deliver last page of results
 			users = paginator.page(paginator.num_pages)	
 
+		# Published estates count of each agent from maintained counters
+		estates_counts = get_counts([agent_estates(user.id) for user in users])
+		for user in users:
+			user.estates_count = estates_counts[agent_estates(user.id)]
+
 		# Last 3 published estates
 		latest_estates = Estate.published.all()[:3]
 
@@ -73,9 +87,10 @@ class UserList(TemplateView):
 class UserDetail(TemplateView):
 	"""Retrieve a user by id and raise a 404 error if not found."""	
 	def get(self, request, id, *args, **kwargs):
-		user = get_object_or_404(
-			User.active.annotate(estates_count=Count('estates')), id=id
-		)
+		user = object_cache.get_object_or_404(User, id)
+		if not user.is_active:
+			raise Http404
+		user.estates_count = get_count(agent_estates(user.id))
 
 		# Last 3 published estates
 		latest_estates = Estate.published.all()[:3]
@@ -84,7 +99,9 @@ class UserDetail(TemplateView):
 		user_estates = Estate.published.prefetch_related('city').filter(agent=user)[:2]
 
 		# Last 2 published articles of user
-		user_articles = Article.published.filter(author=user)[:2]
+		user_articles = Article.published.filter(author=user) \
+										 .select_related('author') \
+										 .only(*LIST_FIELDS)[:2]
 
 		# Some settings of site such as footer context and ...
 		site_setting = SiteSetting.objects.filter(is_active=True)
@@ -101,23 +118,16 @@ class UserDetail(TemplateView):
 
 class ArticleList(LoginRequiredMixin, TemplateView):
 	"""
-	Retrieve list of user articles and filter objects by given status.
+	Retrieve a page of user articles in given status and the number of
+	articles in every status.
 	"""	
 	def get(self, request, status=None, *args, **kwargs):
-		user = request.user
-		articles = user.articles.all()
-		if status:
-			if status == 'published':
-				articles = articles.filter(published_status='p')
-			elif status == 'draft':
-				articles = articles.filter(published_status='d')
-			elif status == 'check':
-				articles = articles.filter(published_status='c')
-			elif status == 'back':
-				articles = articles.filter(published_status='b')
-
-		return render(request, 'account/dashboard/article_list.html',
-					{'articles': articles, 'status': status,})
+		context = dashboard_context(
+			request, Article.objects.filter(author_id=request.user.id), status, 
+			ARTICLE_DASHBOARD_FIELDS, 'publish'
+		)
+		context['articles'] = context['page']
+		return render(request, 'account/dashboard/article_list.html', context)
 
 
 class ArticleCreate(LoginRequiredMixin, CheckEmailActivationMixin, 
@@ -173,29 +183,59 @@ class ArticlePreview(LoginRequiredMixin, CheckEmailActivationMixin,
 
 class EstateList(LoginRequiredMixin, TemplateView):
 	"""
-	Retrieve list of user estates and filter objects by given status.
+	Retrieve a page of user estates in given status and the number of
+	estates in every status.
 	"""		
 	def get(self, request, status=None, *args, **kwargs):
-		user = request.user
-		estates = user.estates.all()
-		if status:
-			if status == 'published':
-				estates = estates.filter(published_status='p')
-			elif status == 'draft':
-				estates = estates.filter(published_status='d')
-			elif status == 'check':
-				estates = estates.filter(published_status='c')
-			elif status == 'back':
-				estates = estates.filter(published_status='b')
+		context = dashboard_context(
+			request, 
+			Estate.objects.filter(agent_id=request.user.id) \
+						  .select_related('city'), 
+			status, ESTATE_DASHBOARD_FIELDS, 'created'
+		)
+		context['estates'] = context['page']
+		return render(request, 'account/dashboard/estate_list.html', context)
+
+
+class EstateBulk(LoginRequiredMixin, CheckEmailActivationMixin, View):
+	"""
+	Submit for review, make draft, reprice or delete the chosen estates of
+	user, each with one set-based query.
+	"""
+	operations = {
+		'review': bulk.submit_for_review,
+		'draft': bulk.mark_as_draft,
+		'delete': bulk.delete,
+	}
 
-		return render(request, 'account/dashboard/estate_list.html',
-					{'estates': estates, 'status': status,})
+	def post(self, request, *args, **kwargs):
+		form = EstateBulkForm(request.POST)
+		if not form.is_valid():
+			for errors in form.errors.values():
+				for error in errors:
+					messages.error(request, error)
+			return redirect('account:estate_list')
+
+		data = form.cleaned_data
+		if data['action'] == 'price':
+			try:
+				count = bulk.change_price(request.user.id, data['estates'], 
+										  data['percent'], 
+										  data['price_field'] or 'price')
+			except ValueError:
+				messages.error(request, 'قیمت جدید برخی از املاک از حداکثر '
+										'قیمت مجاز بیشتر می‌شود.')
+				return redirect('account:estate_list')
+		else:
+			count = self.operations[data['action']](request.user.id, 
+													data['estates'])
+		messages.success(request, '{} ملک تغییر کرد.'.format(count))
+		return redirect('account:estate_list')
 
 
 class EstateCreate(LoginRequiredMixin, CheckEmailActivationMixin, 
 				   CheckSubscriptionMixin, EstateFieldsMixin, 
-				   EstateFormValidMixin, AddCreatedEstatesMixin, 
-				   CreateView):
+				   ReserveEstateMixin, EstateFormValidMixin, CreateView):
 	model = Estate
 	template_name = "account/dashboard/estate_create_update.html"
 	success_url = reverse_lazy('account:estate_list')
@@ -223,11 +263,11 @@ class EstatePreview(LoginRequiredMixin, CheckEmailActivationMixin,
 	the user is not the agent of estate or super user.
 	"""	
 	def get(self, request, estate_id, *args, **kwargs):
-		estate = get_object_or_404(
-			Estate.objects.filter(published_status__in=['d', 'c', 'b']), 
-								  id=estate_id
-		)
-		if estate.agent != request.user and not request.user.is_superuser:
+		estate = object_cache.get_object_or_404(Estate, estate_id)
+		if estate.published_status not in ['d', 'c', 'b']:
+			raise Http404
+		if estate.agent_id != request.user.id and \
+				not request.user.is_superuser:
 			raise Http404
 
 		latest_estates = Estate.published.all().exclude(id=estate.id)[:3]
@@ -237,28 +277,14 @@ class EstatePreview(LoginRequiredMixin, CheckEmailActivationMixin,
 		if site_setting:
 			site_setting = site_setting[0] 
 
-		# Get maximum amount of price, size and room to render search form in 
-		# template.		
-		obj = Estate.published.all()
-		if obj:
-			max_price = obj.order_by('-price')[0].price
-			max_size = obj.order_by('-size')[0].size
-			max_room = obj.order_by('-room')[0].room
-		else:
-			max_price = 1000000
-			max_size = 1000
-			max_room = 10
-
-		cities = City.objects.all()
+		# Maximum price, size and room and the cities of search form
+		search_form = get_search_form_context()
 
 		return render(request, 'real_estate/estate_detail.html',
 					{'estate': estate, 
 					'latest_estates': latest_estates,
 					'site_setting': site_setting,
-					'max_price':max_price, 
-				    'max_size': max_size, 
-				    'max_room': max_room,
-				    'cities': cities})
+					**search_form})
 
 
 class EstateImageDelete(LoginRequiredMixin, CheckEmailActivationMixin, 
@@ -326,8 +352,8 @@ class UserUpdate(LoginRequiredMixin, UserFieldsMixin, UpdateView):
 	success_url = reverse_lazy('account:user_update')	
 
 	def get_object(self):
-		obj = self.request.user
-		return obj
+		# request.user is a compact cached copy, the form needs all fields.
+		return User.objects.get(pk=self.request.user.pk)
 
 
 class PasswordChange(PasswordChangeView):
@@ -402,15 +428,17 @@ class SendEmailVerifyCode(LoginRequiredMixin, EmailVerifyRedirectMixin,
 	def get(self, request, *args, **kwargs):
 		code = generate_random_number()
 
-		user = self.request.user
-		user.email_verify_code = code
-		user.save()
-
-		subject = 'کد تایید ایمیل'
-		message = 'کد تایید ایمیل شما: {}'.format(code)
-		email_from = settings.EMAIL_HOST_USER
-		recipient_list = [self.request.user.email]
-		send_mail(subject, message, email_from, recipient_list)		
+		with transaction.atomic():
+			user = self.request.user
+			user.email_verify_code = code
+			user.save()
+
+			# Queued in the outbox, sent after the code is committed.
+			subject = 'کد تایید ایمیل'
+			message = 'کد تایید ایمیل شما: {}'.format(code)
+			email_from = settings.EMAIL_HOST_USER
+			recipient_list = [self.request.user.email]
+			send_mail(subject, message, email_from, recipient_list)		
 		return redirect('account:email_verify')
 
 
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class AutocompleteConfig(AppConfig):
+    name = 'autocomplete'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,159 @@
+import threading
+
+from django.core.cache import cache
+
+from .trie import PrefixTrie, normalize, sound_key
+from account.models import User
+from blog.models import Category
+from extensions.cache import get_generation, bump_generation
+from real_estate.models import City
+
+
+# Name of the cache generation bumped on every change of the sources.
+AUTOCOMPLETE = 'autocomplete'
+
+# Kind to a function returning (id, label) rows of the suggested objects.
+SOURCES = {
+	'city': lambda: City.objects.values_list('id', 'name'),
+	'agent': lambda: User.active.values_list('id', 'first_name'),
+	'category': lambda: Category.objects.values_list('id', 'title'),
+}
+
+MAX_LIMIT = 20
+
+# Changes that a process applies to its index before it rather builds the
+# index again, and seconds that a change is kept for it.
+MAX_CHANGES = 1000
+CHANGE_TIMEOUT = 24 * 60 * 60
+
+
+class KindIndex():
+	"""Suggestions of one kind in a word trie and a sound trie."""
+	def __init__(self):
+		self.labels = {}
+		self.words = PrefixTrie()
+		self.sounds = PrefixTrie()
+
+	@staticmethod
+	def keys(label):
+		text = normalize(label)
+		words = set(text.split())
+		words.add(text)
+		sounds = {sound_key(word) for word in words}
+		sounds.discard('')
+		return words, sounds
+
+	def add(self, pk, label):
+		self.remove(pk)
+		self.labels[pk] = label
+		words, sounds = self.keys(label)
+		for word in words:
+			self.words.insert(word, pk)
+		for sound in sounds:
+			self.sounds.insert(sound, pk)
+
+	def remove(self, pk):
+		label = self.labels.pop(pk, None)
+		if label is None:
+			return
+		words, sounds = self.keys(label)
+		for word in words:
+			self.words.remove(word, pk)
+		for sound in sounds:
+			self.sounds.remove(sound, pk)
+
+	def search(self, text, limit):
+		"""
+		return up to limit (id, label) of labels with a word starting with
+		text, then of labels that sound like it.
+		"""
+		by_length = lambda pk: (len(self.labels[pk]), pk)
+		found = self.words.search(text, limit, by_length)
+		sound = sound_key(text)
+		if len(found) < limit and sound:
+			found += [pk for pk in self.sounds.search(sound, limit, by_length)
+					  if pk not in found]
+		return [(pk, self.labels[pk]) for pk in found[:limit]]
+
+
+def _change_key(generation):
+	return 'autocomplete:change:{}'.format(generation)
+
+
+class AutocompleteIndex():
+	"""
+	The suggestions of all kinds in the memory of this process. It is built
+	from the database on first use. Every change of a source is stored in
+	the cache under the generation it bumped, and processes apply the
+	changes they missed in order instead of building the index again.
+	"""
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.kinds = None
+		self.generation = None
+
+	def build(self):
+		kinds = {}
+		for kind, rows in SOURCES.items():
+			kinds[kind] = KindIndex()
+			for pk, label in rows():
+				if label:
+					kinds[kind].add(pk, label)
+		return kinds
+
+	def _apply(self, change):
+		kind, pk, label = change
+		if label:
+			self.kinds[kind].add(pk, label)
+		else:
+			self.kinds[kind].remove(pk)
+
+	def current(self):
+		"""return the index of every kind, updated to the last change."""
+		generation = get_generation(AUTOCOMPLETE)
+		with self.lock:
+			if self.generation == generation:
+				return self.kinds
+			missed = range(self.generation + 1, generation + 1) \
+				if self.kinds is not None else ()
+			if 0 < len(missed) <= MAX_CHANGES:
+				keys = [_change_key(number) for number in missed]
+				changes = cache.get_many(keys)
+				if len(changes) == len(keys):
+					for key in keys:
+						self._apply(changes[key])
+					self.generation = generation
+					return self.kinds
+		# Too many or expired changes.
+		kinds = self.build()
+		with self.lock:
+			self.kinds, self.generation = kinds, generation
+			return kinds
+
+	def update(self, kind, pk, label):
+		"""
+		Record that an object was added, changed or removed (label is None)
+		for all processes.
+		"""
+		generation = bump_generation(AUTOCOMPLETE)
+		cache.set(_change_key(generation), (kind, pk, label), CHANGE_TIMEOUT)
+
+	def search(self, text, kinds=None, limit=10):
+		"""return up to limit suggestions of kinds as dicts."""
+		text = normalize(text)
+		if not text:
+			return []
+		index = self.current()
+		results = []
+		with self.lock:
+			for kind in kinds or SOURCES:
+				results += [
+					{'kind': kind, 'id': pk, 'label': label} for pk, label in 
+					index[kind].search(text, limit - len(results))
+				]
+				if len(results) >= limit:
+					break
+		return results
+
+
+index = AutocompleteIndex()
@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .index import index
+from account.models import User
+from blog.models import Category
+from real_estate.models import City
+
+
+def _update(kind, pk, label):
+	transaction.on_commit(lambda: index.update(kind, pk, label))
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+def update_city(sender, instance, signal, **kwargs):
+	_update('city', instance.pk, 
+			instance.name if signal is post_save else None)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def update_category(sender, instance, signal, **kwargs):
+	_update('category', instance.pk, 
+			instance.title if signal is post_save else None)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def update_agent(sender, instance, signal, update_fields=None, **kwargs):
+	# Logging in only updates last_login which is not suggested.
+	if update_fields and set(update_fields) == {'last_login'}:
+		return
+	if signal is post_delete or not instance.is_active:
+		label = None
+	else:
+		label = instance.first_name
+	_update('agent', instance.pk, label)
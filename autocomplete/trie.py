@@ -0,0 +1,94 @@
+import re
+from collections import deque
+
+from extensions.utils import normalize_persian
+
+
+# Latin spelling of Persian letters. Short vowels are not written in Persian,
+# so names are matched by their consonants only, see sound_key.
+TRANSLITERATION = {
+	'ا': 'a', 'آ': 'a', 'ء': '', 'ئ': 'y', 'ب': 'b', 'پ': 'p', 'ت': 't', 
+	'ث': 's', 'ج': 'j', 'چ': 'ch', 'ح': 'h', 'خ': 'kh', 'د': 'd', 'ذ': 'z', 
+	'ر': 'r', 'ز': 'z', 'ژ': 'zh', 'س': 's', 'ش': 'sh', 'ص': 's', 'ض': 'z', 
+	'ط': 't', 'ظ': 'z', 'ع': '', 'غ': 'gh', 'ف': 'f', 'ق': 'gh', 'ک': 'k', 
+	'گ': 'g', 'ل': 'l', 'م': 'm', 'ن': 'n', 'و': 'v', 'ه': 'h', 'ی': 'y', 
+	'\u200c': '',
+}
+
+VOWELS = re.compile('[aeiouyv]')
+REPEATED = re.compile(r'(.)\1+')
+NOT_SOUND = re.compile('[^a-z0-9]')
+
+
+def normalize(text):
+	"""return text in the form it is stored and searched in word tries."""
+	return normalize_persian(text.replace('\u200c', ' '))
+
+
+def sound_key(text):
+	"""
+	return the consonants of the Latin spelling of a normalized text, e.g.
+	tehran and تهران both give thrn, so Latin input finds Persian names.
+	"""
+	latin = ''.join(TRANSLITERATION.get(char, char) for char in text)
+	latin = latin.replace('q', 'gh').replace('x', 'kh').replace('w', 'v')
+	latin = re.sub('c(?!h)', 'k', latin)
+	latin = NOT_SOUND.sub('', VOWELS.sub('', latin))
+	return REPEATED.sub(r'\1', latin)
+
+
+class Node():
+	__slots__ = ('children', 'entries')
+
+	def __init__(self):
+		self.children = {}
+		self.entries = set()
+
+
+class PrefixTrie():
+	"""
+	A prefix tree of keys to entries. Entries of the shortest completions of
+	a prefix are found first, so a search stops as soon as it has enough.
+	"""
+	def __init__(self):
+		self.root = Node()
+
+	def insert(self, key, entry):
+		node = self.root
+		for char in key:
+			node = node.children.setdefault(char, Node())
+		node.entries.add(entry)
+
+	def remove(self, key, entry):
+		path = [self.root]
+		for char in key:
+			node = path[-1].children.get(char)
+			if node is None:
+				return
+			path.append(node)
+		path[-1].entries.discard(entry)
+		# Drop the nodes that lead to nothing anymore.
+		for depth in range(len(key), 0, -1):
+			node = path[depth]
+			if node.entries or node.children:
+				break
+			del path[depth - 1].children[key[depth - 1]]
+
+	def search(self, prefix, limit, sort_key=None):
+		"""return up to limit entries of keys starting with prefix."""
+		node = self.root
+		for char in prefix:
+			node = node.children.get(char)
+			if node is None:
+				return []
+		found = []
+		seen = set()
+		queue = deque([node])
+		while queue and len(found) < limit:
+			node = queue.popleft()
+			for entry in sorted(node.entries, key=sort_key):
+				if entry not in seen:
+					seen.add(entry)
+					found.append(entry)
+			queue.extend(node.children.values())
+		return found[:limit]
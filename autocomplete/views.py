@@ -0,0 +1,22 @@
+from django.http import JsonResponse
+from django.views import View
+
+from .index import index, SOURCES, MAX_LIMIT
+
+
+class AutocompleteView(View):
+	"""
+	return suggestions of cities, agents and categories whose name starts
+	with q as JSON. kind limits them to some kinds, e.g. ?q=تهر&kind=city
+	"""
+	def get(self, request, *args, **kwargs):
+		kinds = [kind for kind in request.GET.getlist('kind') 
+				 if kind in SOURCES]
+		try:
+			limit = min(max(int(request.GET.get('limit', 10)), 1), MAX_LIMIT)
+		except ValueError:
+			limit = 10
+		results = index.search(request.GET.get('q', '')[:100], kinds, limit)
+		response = JsonResponse({'results': results})
+		response['Cache-Control'] = 'max-age=60'
+		return response
@@ -1,5 +1,8 @@
 from django.contrib import admin
+from django.utils.html import format_html
 from .models import Article, Category
+from extensions.admin import FastChangeListMixin, jalali_column, url_format
+from extensions.jalali_filters import JalaliYearFilter, JalaliMonthFilter
 
 
 @admin.register(Category)
@@ -9,10 +12,22 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Article)
-class ArticleAdmin(admin.ModelAdmin):
-	list_display = ['author', 'title', 'published_status', 'jpublish', 
-					'image_tag', 'link_tag']
-	list_filter = ('published_status', 'publish')
-	search_fields = ('title', 'description')
+class ArticleAdmin(FastChangeListMixin, admin.ModelAdmin):
+	list_display = ['author', 'title', 'published_status', 'views', 
+					'jpublish', 'image_tag', 'link_tag']
+	list_filter = ('published_status', JalaliYearFilter, JalaliMonthFilter)
+	list_select_related = ('author',)
+	# Prefix and exact lookups of indexed columns
+	search_fields = ('=id', '^title', '^author__first_name')
 	raw_id_fields = ('author',)
 	list_editable = ('published_status',)
+
+	jpublish = jalali_column('publish', 'زمان انتشار')
+
+	def link_tag(self, obj):
+		if obj.published_status == 'p':
+			url = url_format('blog:article_detail', 'article_id')
+			return format_html('<a href="{}">نمایش</a>', url.format(obj.pk))
+		url = url_format('account:article_preview', 'article_id')
+		return format_html('<a href="{}">پیش‌نمایش</a>', url.format(obj.pk))
+	link_tag.short_description = "مشاهده مقاله"
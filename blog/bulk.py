@@ -0,0 +1,44 @@
+from django.db import transaction
+
+from . import category_index
+from .models import Article
+from .signals import update_related_articles
+from counter import utils as counters
+from extensions import object_cache
+from extensions.cache import bump_generation_on_commit, PAGES
+from publisher.pages import affected_articles_paths
+from publisher.publish import schedule, PUBLISH_ROOT
+
+
+def get_rows(queryset):
+	"""return (id, author id, published status) of articles."""
+	return list(queryset.values_list('id', 'author_id', 'published_status'))
+
+
+def invalidate(rows, publish=False):
+	"""
+	Update the indexes, counters and caches after the articles of rows
+	changed with a set-based query. rows have the status from before the
+	change. With publish all of them have just been published, otherwise
+	the published ones have been unpublished.
+	"""
+	if not rows:
+		return
+	object_cache.invalidate_all(Article)
+	bump_generation_on_commit(PAGES)
+	published = [(pk, author_id) for pk, author_id, status in rows 
+				 if publish or status == 'p']
+	if not published:
+		return
+
+	counters.increment(counters.ARTICLES, 
+					   len(published) if publish else -len(published))
+	for pk, _ in published:
+		category_index.sync(pk)
+		update_related_articles(pk)
+
+	from sitemap.builder import schedule_build
+	transaction.on_commit(schedule_build)
+	if PUBLISH_ROOT:
+		paths = affected_articles_paths(published)
+		transaction.on_commit(lambda: schedule(paths))
@@ -0,0 +1,104 @@
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Article, Category, CategoryArticle
+
+
+def _add_counts(category_ids, amount):
+	if category_ids:
+		Category.objects.filter(id__in=category_ids) \
+						.update(published_count=F('published_count') + amount)
+
+
+def sync(article_id):
+	"""
+	Update the index rows and the published counts of the categories of an
+	article after its status, publish time or categories changed.
+	"""
+	with transaction.atomic():
+		# Lock the article so two updates of it never count twice.
+		article = Article.objects.select_for_update() \
+								 .filter(pk=article_id) \
+								 .only('id', 'publish', 'published_status') \
+								 .first()
+		indexed = dict(CategoryArticle.objects.filter(article_id=article_id)
+											  .values_list('category_id',
+														   'publish'))
+		if article is None or article.published_status != 'p':
+			categories = set()
+		else:
+			categories = set(
+				Article.categories.through.objects.filter(article_id=article_id)
+												  .values_list('category_id',
+															   flat=True)
+			)
+
+		removed = set(indexed) - categories
+		added = categories - set(indexed)
+		CategoryArticle.objects.filter(article_id=article_id,
+									   category_id__in=removed).delete()
+		CategoryArticle.objects.bulk_create(
+			CategoryArticle(category_id=category_id, article_id=article_id,
+							publish=article.publish)
+			for category_id in added
+		)
+		moved = [category_id for category_id in categories - added
+				 if indexed[category_id] != article.publish]
+		if moved:
+			CategoryArticle.objects.filter(article_id=article_id) \
+								   .update(publish=article.publish)
+		_add_counts(removed, -1)
+		_add_counts(added, 1)
+
+
+def remove(article_id):
+	"""Remove an article that is going to be deleted from the index."""
+	with transaction.atomic():
+		rows = CategoryArticle.objects.filter(article_id=article_id)
+		category_ids = list(rows.values_list('category_id', flat=True))
+		rows.delete()
+		_add_counts(category_ids, -1)
+
+
+def clear_category(category_id):
+	"""Remove all articles of a category from the index."""
+	with transaction.atomic():
+		CategoryArticle.objects.filter(category_id=category_id).delete()
+		Category.objects.filter(id=category_id).update(published_count=0)
+
+
+def rebuild():
+	"""
+	Fill the index and counts of all categories again from the articles.
+	return the number of index rows.
+	"""
+	through = Article.categories.through.objects \
+									   .filter(article__published_status='p')
+	rows = [
+		CategoryArticle(category_id=category_id, article_id=article_id,
+						publish=publish)
+		for category_id, article_id, publish in through.values_list(
+			'category_id', 'article_id', 'article__publish'
+		).iterator()
+	]
+	counts = dict(through.values_list('category_id')
+						 .annotate(count=Count('id'))
+						 .order_by())
+	with transaction.atomic():
+		CategoryArticle.objects.all().delete()
+		CategoryArticle.objects.bulk_create(rows, batch_size=1000)
+		Category.objects.update(published_count=0)
+		for category_id, count in counts.items():
+			Category.objects.filter(id=category_id) \
+							.update(published_count=count)
+	return len(rows)
+
+
+def category_article_ids(category):
+	"""
+	return a queryset of ids of published articles of category, newest
+	first. Paginating it only scans the (category, publish) index.
+	"""
+	return CategoryArticle.objects.filter(category=category) \
+								  .order_by('-publish', '-article_id') \
+								  .values_list('article_id', flat=True)
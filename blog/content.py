@@ -0,0 +1,136 @@
+import math
+from html import escape
+from html.parser import HTMLParser
+
+from django.utils.text import Truncator
+
+from extensions.utils import normalize_persian
+
+
+# Tags and attributes kept in the rendered body of articles. Everything else
+# is removed, and the content of DROP_CONTENT_TAGS is removed with it.
+ALLOWED_TAGS = {
+	'a', 'b', 'blockquote', 'br', 'code', 'em', 'figcaption', 'figure', 'h2',
+	'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 'span',
+	'strong', 'table', 'tbody', 'td', 'th', 'thead', 'tr', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+	'a': {'href', 'title'},
+	'img': {'src', 'alt', 'title', 'width', 'height'},
+	'td': {'colspan', 'rowspan'},
+	'th': {'colspan', 'rowspan'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+URL_SCHEMES = ('http:', 'https:', 'mailto:')
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed'}
+VOID_TAGS = {'br', 'hr', 'img'}
+
+# Tags that separate words in the plain text, e.g. <p>a</p><p>b</p>.
+BLOCK_TAGS = {
+	'blockquote', 'br', 'div', 'figcaption', 'h1', 'h2', 'h3', 'h4', 'h5',
+	'h6', 'hr', 'li', 'p', 'pre', 'td', 'th', 'tr',
+}
+
+EXCERPT_WORDS = 40
+EXCERPT_MAX_LENGTH = 500
+WORDS_PER_MINUTE = 200
+
+
+def _safe_url(url):
+	"""return True if url is relative or has an allowed scheme."""
+	url = ''.join(url.split()).lower()
+	if ':' not in url.split('/', 1)[0]:
+		return True
+	return url.startswith(URL_SCHEMES)
+
+
+class ArticleParser(HTMLParser):
+	"""
+	Parse the HTML of an article body into a sanitized HTML with only the
+	allowed tags and attributes, and its plain text.
+	"""
+	def __init__(self):
+		super().__init__(convert_charrefs=True)
+		self.html = []
+		self.text = []
+		self.open_tags = []
+		self.dropping = 0
+
+	def handle_starttag(self, tag, attrs):
+		if tag in DROP_CONTENT_TAGS:
+			self.dropping += 1
+			return
+		if tag in BLOCK_TAGS:
+			self.text.append(' ')
+		if self.dropping or tag not in ALLOWED_TAGS:
+			return
+		allowed = ALLOWED_ATTRIBUTES.get(tag, ())
+		kept = ''
+		for name, value in attrs:
+			if name not in allowed or value is None:
+				continue
+			if name in URL_ATTRIBUTES and not _safe_url(value):
+				continue
+			kept += ' {}="{}"'.format(name, escape(value))
+		if tag == 'a':
+			kept += ' rel="nofollow noopener"'
+		self.html.append('<{}{}>'.format(tag, kept))
+		if tag not in VOID_TAGS:
+			self.open_tags.append(tag)
+
+	def handle_startendtag(self, tag, attrs):
+		self.handle_starttag(tag, attrs)
+		if tag not in VOID_TAGS:
+			self.handle_endtag(tag)
+
+	def handle_endtag(self, tag):
+		if tag in DROP_CONTENT_TAGS:
+			self.dropping = max(self.dropping - 1, 0)
+			return
+		if tag in BLOCK_TAGS:
+			self.text.append(' ')
+		if tag not in self.open_tags:
+			return
+		# Close the tags that were left open inside this one.
+		while self.open_tags:
+			open_tag = self.open_tags.pop()
+			self.html.append('</{}>'.format(open_tag))
+			if open_tag == tag:
+				break
+
+	def handle_data(self, data):
+		if self.dropping:
+			return
+		self.html.append(escape(data, quote=False))
+		self.text.append(data)
+
+	def close(self):
+		super().close()
+		while self.open_tags:
+			self.html.append('</{}>'.format(self.open_tags.pop()))
+
+
+def parse(html):
+	"""return the sanitized HTML and the plain text of html."""
+	parser = ArticleParser()
+	parser.feed(html or '')
+	parser.close()
+	return ''.join(parser.html), ' '.join(''.join(parser.text).split())
+
+
+def render_content(article):
+	"""
+	Set the rendered fields of article from its title and description. The
+	article is not saved.
+	"""
+	body_html, text = parse(article.description)
+	words = len(text.split())
+	article.body_html = body_html
+	article.excerpt = Truncator(
+		Truncator(text).words(EXCERPT_WORDS, truncate='…')
+	).chars(EXCERPT_MAX_LENGTH, truncate='…')
+	article.word_count = words
+	article.reading_time = max(math.ceil(words / WORDS_PER_MINUTE), 1)
+	article.search_text = normalize_persian(
+		'{} {}'.format(article.title, text)
+	)
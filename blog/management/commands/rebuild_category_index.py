@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.category_index import rebuild
+
+
+class Command(BaseCommand):
+	help = 'Fill the category index and published counts of categories again.'
+
+	def handle(self, *args, **options):
+		count = rebuild()
+		self.stdout.write(self.style.SUCCESS(
+			'{} articles indexed in categories.'.format(count)
+		))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Article
+from blog.related import rebuild
+from extensions import object_cache
+from extensions.cache import bump_generation, PAGES
+
+
+class Command(BaseCommand):
+	help = 'Compute the related articles of all published articles.'
+
+	def handle(self, *args, **options):
+		count = rebuild()
+		object_cache.invalidate_all(Article)
+		bump_generation(PAGES)
+		self.stdout.write(self.style.SUCCESS(
+			'Related articles of {} articles computed.'.format(count)
+		))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from blog.content import render_content
+from blog.models import Article, CONTENT_FIELDS
+from extensions import object_cache
+from extensions.cache import bump_generation, PAGES
+
+
+class Command(BaseCommand):
+	help = 'Render the sanitized body, excerpt and search text of articles.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--chunk-size', type=int, default=500)
+		parser.add_argument('--missing', action='store_true', 
+							help='Only render articles never rendered.')
+
+	def handle(self, *args, **options):
+		articles = Article.objects.only('id', 'title', 'description') \
+								  .order_by('id')
+		if options['missing']:
+			articles = articles.filter(word_count=0)
+
+		size = options['chunk_size']
+		rendered = 0
+		last_id = 0
+		while True:
+			# Walk by id so a chunk never loads all articles.
+			chunk = list(articles.filter(id__gt=last_id)[:size])
+			if not chunk:
+				break
+			for article in chunk:
+				render_content(article)
+			Article.objects.bulk_update(chunk, CONTENT_FIELDS)
+			rendered += len(chunk)
+			last_id = chunk[-1].id
+
+		# bulk_update does not send signals.
+		object_cache.invalidate_all(Article)
+		bump_generation(PAGES)
+		self.stdout.write(self.style.SUCCESS(
+			'{} articles rendered.'.format(rendered)
+		))
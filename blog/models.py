@@ -3,7 +3,9 @@ from django.utils import timezone
 from django.urls import reverse
 from django.utils.html import format_html
 
+from .content import render_content
 from account.models import User
+from extensions.fields import JalaliYearMonthField
 from extensions.utils import jalali_converter
 
 
@@ -14,8 +16,26 @@ class PublishedManager(models.Manager):
 											.filter(published_status='p')
 
 
+# Fields loaded to show an article in lists. The full body is never loaded.
+# User.__init__ reads the email, so it is loaded with the author.
+LIST_FIELDS = ('id', 'title', 'excerpt', 'word_count', 'reading_time', 'image',
+			   'publish', 'views', 'author__id', 'author__first_name', 
+			   'author__email', 'author__image')
+
+# Fields loaded for the rows of the article table of the agent dashboard.
+DASHBOARD_FIELDS = ('id', 'title', 'image', 'published_status', 'publish', 
+					'views', 'update_guide', 'author_id')
+
+# Fields set by blog.content.render_content
+CONTENT_FIELDS = ('body_html', 'excerpt', 'word_count', 'reading_time', 
+				  'search_text')
+
+
 class Category(models.Model):
 	title = models.CharField(max_length = 150, verbose_name = "عنوان دسته‌بندی")
+	published_count = models.PositiveIntegerField(
+		default=0, editable=False, verbose_name='تعداد مقالات منتشر شده'
+	)
 
 	class Meta:
 		verbose_name = "دسته‌بندی"
@@ -47,9 +67,34 @@ class Article(models.Model):
 								   verbose_name="زمان انتشار")
 	created = models.DateTimeField(auto_now_add=True)
 	updated = models.DateTimeField(auto_now=True)
+	jalali_year_month = JalaliYearMonthField(source='publish', 
+											 verbose_name='ماه انتشار')
 
 	update_guide = models.TextField(verbose_name='راهنمای به‌روزرسانی', 
 									null=True, blank=True)
+	views = models.PositiveIntegerField(default=0, editable=False, 
+										verbose_name='تعداد بازدید')
+	# Moderator reviewing the article, see moderation.queue
+	claimed_by = models.ForeignKey(User, null=True, blank=True, 
+								   editable=False, on_delete=models.SET_NULL, 
+								   related_name='+', 
+								   verbose_name='بررسی کننده')
+	claimed_until = models.DateTimeField(null=True, blank=True, 
+										 editable=False, 
+										 verbose_name='مهلت بررسی')
+
+	# Rendered from the description on save, see blog.content
+	body_html = models.TextField(default='', editable=False, 
+								 verbose_name='محتوای پاک‌سازی شده')
+	excerpt = models.CharField(max_length=500, default='', editable=False, 
+							   verbose_name='خلاصه')
+	word_count = models.PositiveIntegerField(default=0, editable=False, 
+											 verbose_name='تعداد کلمات')
+	reading_time = models.PositiveSmallIntegerField(
+		default=0, editable=False, verbose_name='زمان مطالعه (دقیقه)'
+	)
+	search_text = models.TextField(default='', editable=False, 
+								   verbose_name='متن جستجو')
 
 	objects = models.Manager()
 	published = PublishedManager()
@@ -58,17 +103,34 @@ class Article(models.Model):
 		verbose_name = "مقاله"
 		verbose_name_plural = "مقالات"
 		ordering = ['-publish']
+		indexes = [
+			# Published lists and feeds, newest and most viewed first.
+			models.Index(fields=['published_status', 'publish']),
+			models.Index(fields=['published_status', 'views']),
+			# Dashboard lists of an author, all and by status.
+			models.Index(fields=['author', 'published_status', 'publish']),
+			models.Index(fields=['author', 'publish']),
+			# Moderation queue
+			models.Index(fields=['published_status', 'claimed_until']),
+			# Admin search
+			models.Index(fields=['title']),
+		]
 
 	def __str__(self):
 		return self.title
 
 	def save(self, *args, **kwargs):
 		"""
-		Set update_guide field to None if published status is not back.
-		And resize article image.
+		Set update_guide field to None if published status is not back, 
+		render the content fields and resize article image.
 		"""			
 		if self.published_status != 'b':
 			self.update_guide = None
+		update_fields = kwargs.get('update_fields')
+		if update_fields is None or {'title', 'description'} & set(update_fields):
+			render_content(self)
+			if update_fields is not None:
+				kwargs['update_fields'] = set(update_fields) | set(CONTENT_FIELDS)
 		super(Article, self).save(*args, **kwargs)
 		
 		# Resize article image
@@ -107,3 +169,62 @@ class Article(models.Model):
 								   kwargs={'article_id':self.id}))
 			)
 	link_tag.short_description = "مشاهده مقاله"
+
+
+class ArticleTerm(models.Model):
+	"""
+	Weight of a term in the TF-IDF vector of a published article. Rows with a
+	term are the inverted index used to find similar articles.
+	"""
+	article = models.ForeignKey(Article, on_delete=models.CASCADE, 
+								related_name='terms', verbose_name='مقاله')
+	term = models.CharField(max_length=64, verbose_name='واژه')
+	weight = models.FloatField(verbose_name='وزن')
+
+	class Meta:
+		unique_together = ('term', 'article')
+		verbose_name = "واژه مقاله"
+		verbose_name_plural = "واژه‌های مقالات"
+
+	def __str__(self):
+		return f"{self.article_id} - {self.term}"
+
+
+class RelatedArticle(models.Model):
+	"""One of the most similar articles of an article, see blog.related"""
+	article = models.ForeignKey(Article, on_delete=models.CASCADE, 
+								related_name='related_articles', 
+								verbose_name='مقاله')
+	related = models.ForeignKey(Article, on_delete=models.CASCADE, 
+								related_name='+', verbose_name='مقاله مرتبط')
+	score = models.FloatField(verbose_name='امتیاز شباهت')
+
+	class Meta:
+		unique_together = ('article', 'related')
+		indexes = [models.Index(fields=['article', '-score'])]
+		verbose_name = "مقاله مرتبط"
+		verbose_name_plural = "مقالات مرتبط"
+
+	def __str__(self):
+		return f"{self.article_id} - {self.related_id}"
+
+
+class CategoryArticle(models.Model):
+	"""
+	A published article of a category, ordered by publish time. Category pages
+	are read from this table with an index range scan, see blog.category_index
+	"""
+	category = models.ForeignKey(Category, on_delete=models.CASCADE, 
+								 related_name='+', verbose_name='دسته‌بندی')
+	article = models.ForeignKey(Article, on_delete=models.CASCADE, 
+								related_name='+', verbose_name='مقاله')
+	publish = models.DateTimeField(verbose_name='زمان انتشار')
+
+	class Meta:
+		unique_together = ('category', 'article')
+		indexes = [models.Index(fields=['category', '-publish', '-article'])]
+		verbose_name = "مقاله دسته‌بندی"
+		verbose_name_plural = "مقالات دسته‌بندی‌ها"
+
+	def __str__(self):
+		return f"{self.category_id} - {self.article_id}"
@@ -0,0 +1,256 @@
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import Article, ArticleTerm, RelatedArticle
+from extensions.utils import normalize_persian
+
+
+# Number of related articles kept for every article.
+RELATED_COUNT = 4
+
+# Most terms kept in the vector of an article. The rest have too little weight
+# to change the neighbours and only make the inverted index longer.
+MAX_TERMS = 100
+
+# Terms of the title are counted this many times.
+TITLE_WEIGHT = 2
+
+# Weight of the share of common categories added to the text similarity.
+CATEGORY_WEIGHT = 0.2
+
+STOP_WORDS = frozenset(normalize_persian(
+	'و در به از که این را با است برای آن یک تا هم بر می شود شده ها های ای '
+	'نیز کرد کند کنید بود باشد خود او ما شما آنها اما یا هر بین پس اگر چه '
+	'دارد داشت باید شد وی همه روی هیچ بی نمی کنیم توان کار'
+).split())
+
+TOKEN_PATTERN = re.compile(r'[^\W\d_]{2,64}')
+
+
+def tokenize(text):
+	"""return the normalized words of text without stop words."""
+	return [word for word in TOKEN_PATTERN.findall(normalize_persian(text))
+			if word not in STOP_WORDS]
+
+
+def term_counts(article):
+	counts = Counter(tokenize(article.search_text))
+	for word in tokenize(article.title):
+		counts[word] += TITLE_WEIGHT - 1
+	return counts
+
+
+def vector(counts, df, total):
+	"""
+	return the normalized TF-IDF vector of term counts as a sparse dict.
+	df is the number of articles that have each term, of total articles.
+	"""
+	weights = {
+		term: (1 + math.log(count)) *
+			  (math.log((1 + total) / (1 + df.get(term, 0))) + 1)
+		for term, count in counts.items()
+	}
+	if len(weights) > MAX_TERMS:
+		weights = dict(heapq.nlargest(MAX_TERMS, weights.items(),
+									  key=lambda item: item[1]))
+	norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+	return {term: weight / norm for term, weight in weights.items()} \
+		if norm else {}
+
+
+def similarities(article_id, terms, index):
+	"""
+	return {other article id: cosine similarity} of an article with vector
+	terms, using index of {term: [(article id, weight)]}. Only articles with
+	a common term are visited.
+	"""
+	scores = defaultdict(float)
+	for term, weight in terms.items():
+		for other_id, other_weight in index.get(term, ()):
+			scores[other_id] += weight * other_weight
+	scores.pop(article_id, None)
+	return scores
+
+
+def add_category_scores(scores, categories, category_of):
+	"""Add the share of common categories to the scores of articles."""
+	for other_id in scores:
+		other = category_of.get(other_id, set())
+		if categories and other:
+			scores[other_id] += CATEGORY_WEIGHT * \
+				len(categories & other) / len(categories | other)
+
+
+def top(scores):
+	"""return the RELATED_COUNT best (score, article id) pairs."""
+	return heapq.nlargest(
+		RELATED_COUNT, ((score, pk) for pk, score in scores.items() if score > 0)
+	)
+
+
+def _categories(article_ids=None, category_ids=None):
+	"""return {article id: set of category ids} of published articles."""
+	through = Article.categories.through.objects \
+									   .filter(article__published_status='p')
+	if article_ids is not None:
+		through = through.filter(article_id__in=article_ids)
+	if category_ids is not None:
+		through = through.filter(category_id__in=category_ids)
+	category_of = defaultdict(set)
+	for article_id, category_id in through.values_list('article_id',
+													   'category_id'):
+		category_of[article_id].add(category_id)
+	return category_of
+
+
+def rebuild():
+	"""
+	Compute the vectors and related articles of all published articles in
+	one batch. Every article is compared only with the articles sharing a
+	term or a category, through in-memory inverted indexes. return the number
+	of articles.
+	"""
+	articles = Article.published.only('id', 'title', 'search_text')
+	counts = {article.id: term_counts(article) for article in articles}
+	df = Counter()
+	for article_counts in counts.values():
+		df.update(article_counts.keys())
+	vectors = {pk: vector(article_counts, df, len(counts))
+			   for pk, article_counts in counts.items()}
+
+	index = defaultdict(list)
+	for pk, terms in vectors.items():
+		for term, weight in terms.items():
+			index[term].append((pk, weight))
+	category_of = _categories()
+	by_category = defaultdict(list)
+	for pk, categories in category_of.items():
+		for category_id in categories:
+			by_category[category_id].append(pk)
+
+	related = []
+	for pk, terms in vectors.items():
+		scores = similarities(pk, terms, index)
+		categories = category_of.get(pk, set())
+		for category_id in categories:
+			for other_id in by_category[category_id]:
+				if other_id != pk:
+					scores.setdefault(other_id, 0.0)
+		add_category_scores(scores, categories, category_of)
+		related.extend(RelatedArticle(article_id=pk, related_id=other_id,
+									  score=score)
+					   for score, other_id in top(scores))
+
+	with transaction.atomic():
+		ArticleTerm.objects.all().delete()
+		ArticleTerm.objects.bulk_create(
+			(ArticleTerm(article_id=pk, term=term, weight=weight)
+			 for pk, terms in vectors.items() for term, weight in terms.items()),
+			batch_size=1000
+		)
+		RelatedArticle.objects.all().delete()
+		RelatedArticle.objects.bulk_create(related, batch_size=1000)
+	return len(vectors)
+
+
+def remove(article_id):
+	"""
+	Remove an article that is not published anymore from the index. return
+	ids of articles whose related articles changed.
+	"""
+	changed = set(RelatedArticle.objects.filter(related_id=article_id)
+										.values_list('article_id', flat=True))
+	ArticleTerm.objects.filter(article_id=article_id).delete()
+	RelatedArticle.objects.filter(
+		Q(article_id=article_id) | Q(related_id=article_id)
+	).delete()
+	return changed
+
+
+def update(article_id):
+	"""
+	Update the vector and related articles of one article after it is saved,
+	and add it to the related articles of others where it ranks high enough.
+	Vectors of other articles keep the idf they were computed with, and an
+	article that drops out of a list is replaced on the next rebuild().
+	return ids of articles whose related articles changed.
+	"""
+	article = Article.objects.filter(pk=article_id) \
+							 .only('id', 'title', 'search_text',
+								   'published_status').first()
+	if article is None or article.published_status != 'p':
+		return remove(article_id)
+
+	counts = term_counts(article)
+	df = dict(ArticleTerm.objects.filter(term__in=list(counts))
+								 .exclude(article_id=article_id)
+								 .values_list('term')
+								 .annotate(Count('id')))
+	df = {term: df.get(term, 0) + 1 for term in counts}
+	terms = vector(counts, df, Article.published.count())
+
+	index = defaultdict(list)
+	rows = ArticleTerm.objects.filter(term__in=list(terms)) \
+							  .exclude(article_id=article_id) \
+							  .values_list('article_id', 'term', 'weight')
+	for other_id, term, weight in rows.iterator():
+		index[term].append((other_id, weight))
+	scores = similarities(article_id, terms, index)
+
+	categories = _categories([article_id]).get(article_id, set())
+	if categories:
+		for other_id in _categories(category_ids=categories):
+			if other_id != article_id:
+				scores.setdefault(other_id, 0.0)
+	add_category_scores(scores, categories, _categories(list(scores)))
+
+	changed = {article_id}
+	with transaction.atomic():
+		changed |= remove(article_id)
+		ArticleTerm.objects.bulk_create(
+			ArticleTerm(article_id=article_id, term=term, weight=weight)
+			for term, weight in terms.items()
+		)
+		RelatedArticle.objects.bulk_create(
+			RelatedArticle(article_id=article_id, related_id=other_id,
+						   score=score)
+			for score, other_id in top(scores)
+		)
+
+		candidates = {pk: score for pk, score in scores.items() if score > 0}
+		neighbours = defaultdict(list)
+		for row in RelatedArticle.objects.filter(article_id__in=candidates) \
+										 .values_list('id', 'article_id',
+													  'score'):
+			neighbours[row[1]].append(row)
+		added, dropped = [], []
+		for other_id, score in candidates.items():
+			rows = neighbours[other_id]
+			if len(rows) >= RELATED_COUNT:
+				lowest = min(rows, key=lambda row: row[2])
+				if score <= lowest[2]:
+					continue
+				dropped.append(lowest[0])
+			added.append(RelatedArticle(article_id=other_id,
+										related_id=article_id, score=score))
+			changed.add(other_id)
+		RelatedArticle.objects.filter(id__in=dropped).delete()
+		RelatedArticle.objects.bulk_create(added)
+	return changed
+
+
+def get_related_articles(article_id, fields):
+	"""return the related articles of an article with one indexed lookup."""
+	return [
+		row.related for row in
+		RelatedArticle.objects.filter(article_id=article_id,
+									  related__published_status='p')
+							  .select_related('related__author')
+							  .only(*('related__' + field for field in fields))
+							  .order_by('-score')
+	]
@@ -0,0 +1,95 @@
+from django.db import transaction
+from django.db.models.signals import (post_save, post_delete, pre_delete, 
+									  m2m_changed)
+from django.dispatch import receiver
+
+from . import category_index, related
+from .models import Article, Category
+from extensions import object_cache
+
+
+object_cache.register(
+	Article, lambda: Article.objects.select_related('author')
+									.prefetch_related('categories')
+)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_cached_article(sender, instance, **kwargs):
+	object_cache.invalidate(Article, instance.pk)
+
+
+@receiver(m2m_changed, sender=Article.categories.through)
+def invalidate_cached_article_categories(sender, instance, action, reverse, 
+										 pk_set, **kwargs):
+	if not action.startswith('post_'):
+		return
+	if not reverse:
+		object_cache.invalidate(Article, instance.pk)
+	elif pk_set:
+		for article_id in pk_set:
+			object_cache.invalidate(Article, article_id)
+	else:
+		object_cache.invalidate_all(Article)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_cached_articles(sender, instance, **kwargs):
+	object_cache.invalidate_all(Article)
+
+
+def update_related_articles(article_id):
+	"""Update related articles after the transaction commits."""
+	def update():
+		changed = related.update(article_id)
+		# Published pages of other articles show their related articles too.
+		from publisher.pages import article_path
+		from publisher.publish import schedule
+		schedule({article_path(pk) for pk in changed})
+
+	transaction.on_commit(update)
+
+
+@receiver(post_save, sender=Article)
+def update_related_articles_on_save(sender, instance, update_fields=None, 
+									**kwargs):
+	if update_fields and not \
+			{'title', 'description', 'published_status'} & set(update_fields):
+		return
+	update_related_articles(instance.pk)
+
+
+@receiver(m2m_changed, sender=Article.categories.through)
+def update_related_articles_on_categories(sender, instance, action, reverse, 
+										  **kwargs):
+	if action.startswith('post_') and not reverse:
+		update_related_articles(instance.pk)
+
+
+@receiver(post_save, sender=Article)
+def sync_category_index(sender, instance, update_fields=None, **kwargs):
+	if update_fields and not \
+			{'publish', 'published_status'} & set(update_fields):
+		return
+	category_index.sync(instance.pk)
+
+
+@receiver(pre_delete, sender=Article)
+def remove_from_category_index(sender, instance, **kwargs):
+	category_index.remove(instance.pk)
+
+
+@receiver(m2m_changed, sender=Article.categories.through)
+def sync_category_index_on_categories(sender, instance, action, reverse, 
+									  pk_set, **kwargs):
+	if not action.startswith('post_'):
+		return
+	if not reverse:
+		category_index.sync(instance.pk)
+	elif action == 'post_clear':
+		category_index.clear_category(instance.pk)
+	else:
+		for article_id in pk_set:
+			category_index.sync(article_id)
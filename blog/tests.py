@@ -1,3 +1,52 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from .content import parse
+
+
+class ParseTests(SimpleTestCase):
+	def test_allowed_tags_are_kept(self):
+		html, text = parse('<h2>Title</h2><p>A <strong>bold</strong> '
+						   '<em>word</em></p><ul><li>one</li></ul>')
+		self.assertEqual(html, '<h2>Title</h2><p>A <strong>bold</strong> '
+							   '<em>word</em></p><ul><li>one</li></ul>')
+		self.assertEqual(text, 'Title A bold word one')
+
+	def test_other_tags_are_removed_with_their_content_kept(self):
+		html, text = parse('<div><font color="red">text</font></div>')
+		self.assertEqual(html, 'text')
+		self.assertEqual(text, 'text')
+
+	def test_scripts_and_styles_are_removed_with_their_content(self):
+		html, text = parse('<p>a</p><script>alert(1)</script>'
+						   '<style>p {}</style><iframe src="x">b</iframe>')
+		self.assertEqual(html, '<p>a</p>')
+		self.assertEqual(text, 'a')
+
+	def test_attributes_not_allowed_are_removed(self):
+		html, _ = parse('<p onclick="x()" style="color: red">a</p>'
+						'<img src="/a.png" onerror="x()" alt="b">')
+		self.assertEqual(html, '<p>a</p><img src="/a.png" alt="b">')
+
+	def test_unsafe_urls_are_removed(self):
+		html, _ = parse('<a href="javascript:alert(1)">a</a>'
+						'<a href=" JavaScript:alert(1)">b</a>'
+						'<img src="data:image/png;base64,x">')
+		self.assertEqual(html, '<a rel="nofollow noopener">a</a>'
+							   '<a rel="nofollow noopener">b</a><img>')
+
+	def test_safe_urls_are_kept(self):
+		html, _ = parse('<a href="https://example.com/?a=1&b=2">a</a>'
+						'<a href="/blog/">b</a>')
+		self.assertEqual(html, '<a href="https://example.com/?a=1&amp;b=2" '
+							   'rel="nofollow noopener">a</a>'
+							   '<a href="/blog/" rel="nofollow noopener">b</a>')
+
+	def test_text_is_escaped(self):
+		html, text = parse('<p>&lt;script&gt; 1 < 2</p>')
+		self.assertEqual(html, '<p>&lt;script&gt; 1 &lt; 2</p>')
+		self.assertEqual(text, '<script> 1 < 2')
+
+	def test_unclosed_tags_are_closed(self):
+		html, _ = parse('<p><strong>a</p><blockquote>b')
+		self.assertEqual(html, '<p><strong>a</strong></p>'
+							   '<blockquote>b</blockquote>')
@@ -1,13 +1,23 @@
+import time
 
+from django.http import Http404
 from django.shortcuts import get_object_or_404, render
 from django.db.models import Q
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
+from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 
-from .models import Article, Category
+from .category_index import category_article_ids
+from .models import Article, Category, LIST_FIELDS
+from .related import get_related_articles
 from site_setting.models import SiteSetting
 from real_estate.models import Estate
 from account.models import User
+from counter.hits import record_hit
+from extensions import object_cache
+from extensions.cache import cache_page_swr
+from extensions.utils import normalize_persian
+from search.log import log_search
 
 
 class ArticleList(TemplateView):
@@ -17,13 +27,13 @@ class ArticleList(TemplateView):
 	search key.
 	"""
 	def get(self, request, category_id=None, author_id=None, *args, **kwargs):
-		articles = Article.published.select_related('author')
+		started = time.perf_counter()
+		articles = Article.published.select_related('author').only(*LIST_FIELDS)
 
 		search = request.GET.get('s', None)
 		if search:
 			articles = articles.filter(
-				Q(title__contains=search) | 
-				Q(description__contains=search) | 
+				Q(search_text__contains=normalize_persian(search)) | 
 				Q(author__first_name__contains=search)
 			).distinct()
 
@@ -39,16 +49,42 @@ class ArticleList(TemplateView):
 			author = get_object_or_404(User.active.all(), id=author_id)
 			articles = articles.filter(author=author)
 
-		paginator = Paginator(articles, 4)
+		# Sort articles by views if requested
+		sort = request.GET.get('sort')
+		if sort == 'views':
+			articles = articles.order_by('-views', '-publish')
+
+		# A plain category page is read from the category index instead of 
+		# joining and sorting the articles of category.
+		from_index = category and not search and not author and sort != 'views'
+		if from_index:
+			paginator = Paginator(category_article_ids(category), 4)
+			paginator.count = category.published_count
+		else:
+			paginator = Paginator(articles, 4)
 		page = request.GET.get('page', None)
 		try:
-			articles = paginator.page(page)
+			page_articles = paginator.page(page)
 		except PageNotAnInteger:
 			# if page is not an integer deliver the first page
-			articles = paginator.page(1)
+			page_articles = paginator.page(1)
 		except EmptyPage:
 			# if page is out of range deliver last page of results
-			articles = paginator.page(paginator.num_pages)		
+			page_articles = paginator.page(paginator.num_pages)		
+
+		if from_index:
+			# Fetch only the articles of current page
+			by_id = Article.published.select_related('author') \
+									 .only(*LIST_FIELDS) \
+									 .in_bulk(page_articles.object_list)
+			page_articles.object_list = [
+				by_id[article_id] for article_id in page_articles.object_list 
+				if article_id in by_id
+			]
+		articles = page_articles
+
+		log_search('article', request, paginator.count, 
+				   time.perf_counter() - started)
 
 		categories = Category.objects.all()
 
@@ -69,16 +105,26 @@ class ArticleList(TemplateView):
 					'categories': categories})
 
 
+def count_view(request, article_id):
+	record_hit(request, Article, article_id)
+
+
+@method_decorator(
+	cache_page_swr(60, 24 * 60 * 60, on_request=count_view), 
+	name='dispatch'
+)
 class ArticleDetail(TemplateView):
 	"""Retrieve an article by id and raise a 404 error if not found."""	
 	def get(self, request, article_id, *args, **kwargs):
-		article = get_object_or_404(
-			Article.published.select_related('author')
-			.prefetch_related('categories'), id=article_id
-		)
+		article = object_cache.get_object_or_404(Article, article_id)
+		if article.published_status != 'p':
+			raise Http404
 
 		categories = Category.objects.all()
 
+		# Most similar articles, computed when articles are saved
+		related_articles = get_related_articles(article.id, LIST_FIELDS)
+
 		# Last 3 published estates
 		latest_estates = Estate.published.all()[:3]
 
@@ -89,6 +135,7 @@ class ArticleDetail(TemplateView):
 
 		return render(request, 'blog/article_detail.html',
 					{'article': article,
+					'related_articles': related_articles,
 					'site_setting': site_setting,
 					'latest_estates': latest_estates,
 					'categories': categories})
@@ -1,11 +1,16 @@
 from django.contrib import admin
 
 from .models import ContactUs
+from extensions.admin import FastChangeListMixin, jalali_column
+from extensions.jalali_filters import JalaliYearFilter, JalaliMonthFilter
 
 
 @admin.register(ContactUs)
-class ContactUs(admin.ModelAdmin):
+class ContactUs(FastChangeListMixin, admin.ModelAdmin):
 	list_display = ['name', 'subject', 'message', 'email', 'phone', 
 					'jcreated', 'reviewed']
-	list_filter = ('created', 'reviewed')
-	search_fields = ('name', 'email', 'phone', 'subject',)
+	list_filter = (JalaliYearFilter, JalaliMonthFilter, 'reviewed')
+	# Prefix and exact lookups of indexed columns
+	search_fields = ('=id', '^email', '^phone')
+
+	jcreated = jalali_column('created', 'تاریخ ایجاد')
@@ -1,5 +1,6 @@
 from django.db import models
 
+from extensions.fields import JalaliYearMonthField
 from extensions.utils import jalali_converter
 
 
@@ -12,11 +13,20 @@ class ContactUs(models.Model):
 	reviewed = models.BooleanField(verbose_name='بررسی شده', default=False)
 	created = models.DateTimeField(auto_now_add=True, 
 								   verbose_name='تاریخ ایجاد')
+	jalali_year_month = JalaliYearMonthField(source='created', 
+											 verbose_name='ماه ایجاد')
 
 	class Meta:
 		verbose_name = 'پیام‌ دریافت شده'
 		verbose_name_plural = 'پیام‌‌های دریافت شده'
 		ordering = ['-created']
+		indexes = [
+			# Messages to review, newest first.
+			models.Index(fields=['reviewed', 'created']),
+			# Admin search
+			models.Index(fields=['email']),
+			models.Index(fields=['phone']),
+		]
 
 	def __str__(self):
 		return self.name
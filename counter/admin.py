@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from .models import Counter
+
+
+@admin.register(Counter)
+class CounterAdmin(admin.ModelAdmin):
+    list_display = ('name', 'shard', 'value')
+    search_fields = ('name',)
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class CounterConfig(AppConfig):
+    name = 'counter'
+
+    def ready(self):
+        from . import signals
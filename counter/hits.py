@@ -0,0 +1,87 @@
+import atexit
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, DatabaseError
+from django.db.models import Case, F, IntegerField, Value, When
+
+
+# Seconds between two flushes of the pending views to database. This is also
+# the most views that can be lost if the worker is killed.
+FLUSH_INTERVAL = getattr(settings, 'HIT_COUNT_FLUSH_INTERVAL', 5)
+
+# Seconds that repeated views of an object by one visitor are ignored.
+DEDUPE_WINDOW = getattr(settings, 'HIT_COUNT_DEDUPE_WINDOW', 30 * 60)
+
+_pending = defaultdict(int)
+_lock = threading.Lock()
+_timer = None
+
+
+def record_hit(request, model, pk):
+	"""
+	Count a view of the object of model (which has a views field) with pk.
+	The view is only added to an in-process buffer so the request never waits
+	for the database; the buffer is written by flush() every FLUSH_INTERVAL
+	seconds.
+	"""
+	if getattr(request, 'prerender', False):
+		return
+	# A view is counted only if neither the session nor the address of the
+	# visitor viewed the object recently, so dropping the cookie is not a 
+	# new visitor.
+	prefix = 'hit:{}:{}:'.format(model._meta.label_lower, pk)
+	visitors = [('ip', request.META.get('REMOTE_ADDR')), 
+				('session', request.session.session_key)]
+	added = [cache.add(prefix + kind + ':' + visitor, 1, DEDUPE_WINDOW) 
+			 for kind, visitor in visitors if visitor]
+	if not added or not all(added):
+		return
+	with _lock:
+		_pending[(model, int(pk))] += 1
+		_schedule_flush()
+
+
+def _schedule_flush():
+	"""Start the flush timer if it is not running. Call with _lock held."""
+	global _timer
+	if _timer is None:
+		_timer = threading.Timer(FLUSH_INTERVAL, flush)
+		_timer.daemon = True
+		_timer.start()
+
+
+def flush():
+	"""Write the pending views with one UPDATE statement per model."""
+	global _timer
+	with _lock:
+		pending = dict(_pending)
+		_pending.clear()
+		_timer = None
+
+	by_model = defaultdict(dict)
+	for (model, pk), count in pending.items():
+		by_model[model][pk] = count
+
+	for model, counts in by_model.items():
+		views = Case(
+			*[When(pk=pk, then=Value(count)) for pk, count in counts.items()],
+			default=Value(0), output_field=IntegerField()
+		)
+		try:
+			model.objects.filter(pk__in=counts) \
+						 .update(views=F('views') + views)
+		except DatabaseError:
+			# Keep the views of this model for the next flush.
+			with _lock:
+				for pk, count in counts.items():
+					_pending[(model, pk)] += count
+				_schedule_flush()
+
+	if threading.current_thread() is not threading.main_thread():
+		connection.close()
+
+
+atexit.register(flush)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from counter.utils import reconcile
+
+
+class Command(BaseCommand):
+	help = 'Recount all maintained counters from the source tables.'
+
+	def handle(self, *args, **options):
+		reconcile()
+		self.stdout.write(self.style.SUCCESS('Counters reconciled.'))
@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class Counter(models.Model):
+	"""
+	One shard of a named counter. The value of a counter is the sum of all of
+	its shards, so concurrent increments are spread over several rows instead
+	of locking a single hot row.
+	"""
+	name = models.CharField(max_length=100, verbose_name='نام شمارنده')
+	shard = models.PositiveSmallIntegerField(default=0, verbose_name='بخش')
+	value = models.IntegerField(default=0, verbose_name='مقدار')
+
+	class Meta:
+		unique_together = ('name', 'shard')
+		verbose_name = "شمارنده"
+		verbose_name_plural = "شمارنده‌ها"
+
+	def __str__(self):
+		return f"{self.name} - {self.shard}"
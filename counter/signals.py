@@ -0,0 +1,101 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from . import utils
+from account.models import User
+from blog.models import Article
+from real_estate.models import Estate
+
+
+def _loaded(instance, *fields):
+	"""
+	return the loaded values of fields or None if one of them is deferred.
+	Deferred fields are not touched so no extra query is made.
+	"""
+	if any(field not in instance.__dict__ for field in fields):
+		return None
+	return tuple(instance.__dict__[field] for field in fields)
+
+
+@receiver(post_init, sender=Estate)
+def remember_estate_state(sender, instance, **kwargs):
+	instance._counter_state = _loaded(instance, 'published_status', 'agent_id')
+
+
+@receiver(post_save, sender=Estate)
+def count_estate_save(sender, instance, created, **kwargs):
+	old_state = None if created else instance._counter_state
+	new_state = (instance.published_status, instance.agent_id)
+	instance._counter_state = new_state
+	if not created and old_state is None:
+		# The previous state is unknown, recount the affected counters.
+		utils.set_count(utils.ESTATES, Estate.published.count())
+		utils.set_count(
+			utils.agent_estates(instance.agent_id),
+			Estate.published.filter(agent_id=instance.agent_id).count()
+		)
+		return
+
+	if old_state and old_state[0] == 'p':
+		utils.increment(utils.ESTATES, -1)
+		utils.increment(utils.agent_estates(old_state[1]), -1, shards=1)
+	if new_state[0] == 'p':
+		utils.increment(utils.ESTATES)
+		utils.increment(utils.agent_estates(new_state[1]), shards=1)
+
+
+@receiver(post_delete, sender=Estate)
+def count_estate_delete(sender, instance, **kwargs):
+	if instance.published_status == 'p':
+		utils.increment(utils.ESTATES, -1)
+		utils.increment(utils.agent_estates(instance.agent_id), -1, shards=1)
+
+
+@receiver(post_init, sender=Article)
+def remember_article_state(sender, instance, **kwargs):
+	instance._counter_state = _loaded(instance, 'published_status')
+
+
+@receiver(post_save, sender=Article)
+def count_article_save(sender, instance, created, **kwargs):
+	old_state = (None,) if created else instance._counter_state
+	instance._counter_state = (instance.published_status,)
+	if old_state is None:
+		# The previous state is unknown, recount the articles.
+		utils.set_count(utils.ARTICLES, Article.published.count())
+		return
+	was_published = old_state[0] == 'p'
+	is_published = instance.published_status == 'p'
+	if was_published != is_published:
+		utils.increment(utils.ARTICLES, 1 if is_published else -1)
+
+
+@receiver(post_delete, sender=Article)
+def count_article_delete(sender, instance, **kwargs):
+	if instance.published_status == 'p':
+		utils.increment(utils.ARTICLES, -1)
+
+
+@receiver(post_init, sender=User)
+def remember_user_state(sender, instance, **kwargs):
+	instance._counter_state = _loaded(instance, 'is_active')
+
+
+@receiver(post_save, sender=User)
+def count_user_save(sender, instance, created, **kwargs):
+	old_state = (False,) if created else instance._counter_state
+	instance._counter_state = (instance.is_active,)
+	if old_state is None:
+		# The previous state is unknown, recount the agents.
+		utils.set_count(utils.AGENTS, User.active.count())
+		return
+	if old_state[0] != instance.is_active:
+		utils.increment(utils.AGENTS, 1 if instance.is_active else -1)
+
+
+@receiver(post_delete, sender=User)
+def count_user_delete(sender, instance, **kwargs):
+	if instance.is_active:
+		utils.increment(utils.AGENTS, -1)
+	utils.Counter.objects.filter(name=utils.agent_estates(instance.id)) \
+						 .delete()
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import HitView
+
+
+app_name = 'counter'
+urlpatterns = [
+    path('hit/<slug:kind>/<int:pk>/', HitView.as_view(), name='hit'),
+]
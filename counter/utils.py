@@ -0,0 +1,91 @@
+from random import randrange
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from .models import Counter
+
+
+# Number of rows that a site wide counter is spread over.
+SHARD_COUNT = 8
+
+# Names of site wide counters
+AGENTS = 'agents'
+ESTATES = 'estates'
+ARTICLES = 'articles'
+
+
+def agent_estates(agent_id):
+	"""return the counter name of published estates of an agent."""
+	return 'agent_estates:{}'.format(agent_id)
+
+
+def increment(name, amount=1, shards=SHARD_COUNT):
+	"""
+	Add amount to the counter with one atomic UPDATE on a random shard. The
+	shard row is created the first time it is used.
+	"""
+	if not amount:
+		return
+	shard = randrange(shards)
+	counter = Counter.objects.filter(name=name, shard=shard)
+	if counter.update(value=F('value') + amount):
+		return
+	try:
+		with transaction.atomic():
+			Counter.objects.create(name=name, shard=shard, value=amount)
+	except IntegrityError:
+		# Another process created the shard at the same time.
+		counter.update(value=F('value') + amount)
+
+
+def get_count(name):
+	"""return the value of a counter by summing its shards."""
+	total = Counter.objects.filter(name=name).aggregate(total=Sum('value'))
+	return total['total'] or 0
+
+
+def get_counts(names):
+	"""return a dictionary of counter name to value for given names."""
+	counts = dict.fromkeys(names, 0)
+	rows = Counter.objects.filter(name__in=counts).values('name') \
+						  .annotate(total=Sum('value'))
+	for row in rows:
+		counts[row['name']] = row['total']
+	return counts
+
+
+def set_count(name, value):
+	"""Overwrite the value of a counter with an exact value."""
+	with transaction.atomic():
+		Counter.objects.filter(name=name).exclude(shard=0).delete()
+		Counter.objects.update_or_create(
+			name=name, shard=0, defaults={'value': value}
+		)
+
+
+def reconcile():
+	"""
+	Recount all counters from the source tables and overwrite the maintained
+	values. Counters drift when rows are changed without signals (e.g. by
+	QuerySet.update), so this should run periodically.
+	"""
+	from account.models import User
+	from blog.models import Article
+	from real_estate.models import Estate
+	from django.db.models import Count
+
+	set_count(AGENTS, User.active.count())
+	set_count(ESTATES, Estate.published.count())
+	set_count(ARTICLES, Article.published.count())
+
+	agent_counts = {
+		agent_estates(row['agent']): row['count'] for row in
+		Estate.published.order_by().values('agent')
+						.annotate(count=Count('id'))
+	}
+	stale = Counter.objects.filter(name__startswith=agent_estates('')) \
+						   .exclude(name__in=agent_counts)
+	stale.delete()
+	for name, value in agent_counts.items():
+		set_count(name, value)
@@ -0,0 +1,31 @@
+from django.http import Http404, HttpResponse
+from django.views import View
+
+from .hits import record_hit
+from extensions import object_cache
+from blog.models import Article
+from real_estate.models import Estate
+
+
+# Kind of the url to the counted model.
+HIT_MODELS = {'estate': Estate, 'article': Article}
+
+
+class HitView(View):
+	"""
+	Count a view of an estate or article. Detail pages served from the 
+	published files are not passed to django, so they request this url, 
+	e.g. with <img src="/counter/hit/estate/5/"> or an nginx mirror.
+	"""
+	def get(self, request, kind, pk, *args, **kwargs):
+		if kind not in HIT_MODELS:
+			raise Http404
+		# Only published objects are counted. They are read through the 
+		# object cache that their detail pages fill.
+		obj = object_cache.get_object_or_404(HIT_MODELS[kind], pk)
+		if obj.published_status != 'p':
+			raise Http404
+		record_hit(request, HIT_MODELS[kind], pk)
+		response = HttpResponse(status=204)
+		response['Cache-Control'] = 'no-store'
+		return response
@@ -0,0 +1,266 @@
+import hashlib
+import os
+import tempfile
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# Generation of all cached pages. It is bumped when any content shown on
+# public pages changes.
+PAGES = 'pages'
+
+# Seconds a worker waits for another worker to fill a missing cache entry
+# before filling it itself.
+FILL_WAIT = getattr(settings, 'CACHE_FILL_WAIT', 2)
+
+# Seconds after which the lock of a crashed filler expires.
+FILL_LOCK_TIMEOUT = getattr(settings, 'CACHE_FILL_LOCK_TIMEOUT', 30)
+
+LOCK_DIR = getattr(settings, 'CACHE_FILL_LOCK_DIR', tempfile.gettempdir())
+
+# Number of lock files that the cache keys are spread over.
+LOCK_STRIPES = 256
+
+
+def _generation_key(name):
+    return 'generation:{}'.format(name)
+
+
+def get_generation(name):
+    """
+    return the current generation of a named group of cached data. Cache keys
+    that contain the generation are invalidated together by bump_generation.
+    """
+    key = _generation_key(name)
+    generation = cache.get(key)
+    if generation is None:
+        # Start from the current time so a lost generation never goes back
+        # to a value that old cache entries were stored with.
+        cache.add(key, int(time.time() * 1000), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(name):
+    """Invalidate all cache entries stored with the current generation."""
+    try:
+        return cache.incr(_generation_key(name))
+    except ValueError:
+        return get_generation(name)
+
+
+def bump_generation_on_commit(name):
+    """
+    Bump a generation now and again after the current transaction commits.
+    A reader may cache a row of before the commit under the first bump; the
+    second one drops it.
+    """
+    bump_generation(name)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: bump_generation(name))
+
+
+
+def get_generations(*names):
+    """return the generations of several names as a tuple."""
+    keys = [_generation_key(name) for name in names]
+    generations = cache.get_many(keys)
+    return tuple(
+        generations[key] if key in generations else get_generation(name)
+        for key, name in zip(keys, names)
+    )
+
+
+def _count(metric):
+    """Add one to a cache fill metric shared by all workers."""
+    key = 'cache_fill:{}'.format(metric)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def get_fill_metrics():
+    """
+    return how many times cached values were a fresh hit, a stale hit, a
+    miss filled by this worker or a miss coalesced into another worker's fill.
+    """
+    metrics = ('hit', 'stale', 'fill', 'coalesced')
+    values = cache.get_many(['cache_fill:' + metric for metric in metrics])
+    return {metric: values.get('cache_fill:' + metric, 0)
+            for metric in metrics}
+
+
+class _HostLock():
+    """
+    A non-blocking lock shared by all processes of this host, implemented
+    with flock on one of LOCK_STRIPES files chosen by the cache key, so the
+    number of files stays fixed. Keys that share a file only wait for each
+    other up to the fill wait.
+    """
+    def __init__(self, key):
+        stripe = int(hashlib.md5(key.encode()).hexdigest(), 16) % LOCK_STRIPES
+        name = 'homeo-fill-{}.lock'.format(stripe)
+        self.path = os.path.join(LOCK_DIR, name)
+        self.file = None
+
+    def acquire(self):
+        if fcntl is None:
+            return True
+        self.file = open(self.path, 'a')
+        try:
+            fcntl.flock(self.file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            self.file.close()
+            self.file = None
+            return False
+
+    def release(self):
+        if self.file is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+            self.file.close()
+            self.file = None
+
+
+def _wait_for_fill(key, generation, deadline):
+    """Poll the cache until a fresh entry appears or the deadline passes."""
+    while time.time() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None and entry[1] == generation:
+            return entry
+    return None
+
+
+def _fill(key, fill, generation, soft_ttl, hard_ttl):
+    value = fill()
+    cache.set(key, (time.time() + soft_ttl, generation, value), hard_ttl)
+    return value
+
+
+def get_or_fill(key, fill, soft_ttl, hard_ttl, generation=None,
+                wait=FILL_WAIT):
+    """
+    return the cached value of key or fill it by calling fill().
+
+    An entry is fresh for soft_ttl seconds and kept for hard_ttl seconds. A
+    stale entry, or one stored with an older generation, is served as is
+    while a single worker refills it. On a miss only one worker per host,
+    and then one worker across hosts, calls fill(); others wait up to wait
+    seconds for its result before filling it themselves.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        fresh_until, entry_generation, value = entry
+        if entry_generation == generation and time.time() < fresh_until:
+            _count('hit')
+            return value
+        lock_key = 'lock:' + key
+        if cache.add(lock_key, 1, FILL_LOCK_TIMEOUT):
+            try:
+                return _fill(key, fill, generation, soft_ttl, hard_ttl)
+            finally:
+                cache.delete(lock_key)
+        _count('stale')
+        return value
+
+    deadline = time.time() + wait
+    host_lock = _HostLock(key)
+    while not host_lock.acquire():
+        # Another process of this host is filling the entry.
+        entry = _wait_for_fill(
+            key, generation, min(deadline, time.time() + 0.2)
+        )
+        if entry is not None:
+            _count('coalesced')
+            return entry[2]
+        if time.time() >= deadline:
+            break
+
+    try:
+        entry = cache.get(key)
+        if entry is not None and entry[1] == generation:
+            _count('coalesced')
+            return entry[2]
+
+        lock_key = 'lock:' + key
+        if not cache.add(lock_key, 1, FILL_LOCK_TIMEOUT):
+            # Another host is filling the entry.
+            entry = _wait_for_fill(key, generation, deadline)
+            if entry is not None:
+                _count('coalesced')
+                return entry[2]
+            lock_key = None
+        try:
+            _count('fill')
+            return _fill(key, fill, generation, soft_ttl, hard_ttl)
+        finally:
+            if lock_key:
+                cache.delete(lock_key)
+    finally:
+        host_lock.release()
+
+
+class _Uncacheable(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+def cache_page_swr(soft_ttl, hard_ttl, generations=(PAGES,), on_request=None):
+    """
+    Cache the rendered page of a view for anonymous GET requests using
+    get_or_fill, so a cache miss or an expired page makes only one render.
+    Pages are refreshed when one of the given generations is bumped.
+
+    on_request(request, *args, **kwargs) is called for every successful
+    request, whether the page came from the cache or not.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or \
+                    request.user.is_authenticated or \
+                    'messages' in request.COOKIES:
+                response = view(request, *args, **kwargs)
+            else:
+                response = _cached_response(request, view, args, kwargs)
+            if on_request and response.status_code == 200:
+                on_request(request, *args, **kwargs)
+            return response
+
+        def _cached_response(request, view, args, kwargs):
+            def render():
+                response = view(request, *args, **kwargs)
+                # Pages with a CSRF token or cookies belong to one visitor.
+                if response.status_code != 200 or response.streaming or \
+                        response.cookies or \
+                        request.META.get('CSRF_COOKIE_USED'):
+                    raise _Uncacheable(response)
+                return (response.content, response['Content-Type'])
+
+            key = 'page:{}'.format(
+                hashlib.md5(request.get_full_path().encode()).hexdigest()
+            )
+            try:
+                content, content_type = get_or_fill(
+                    key, render, soft_ttl, hard_ttl,
+                    generation=get_generations(*generations)
+                )
+            except _Uncacheable as error:
+                return error.response
+            return HttpResponse(content, content_type=content_type)
+
+        return wrapper
+    return decorator
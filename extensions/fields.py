@@ -0,0 +1,30 @@
+from django.db import models
+
+from .jalali_calendar import year_month
+
+
+class JalaliYearMonthField(models.PositiveIntegerField):
+    """
+    The Jalali year and month of another datetime field of the model as
+    yyyymm, e.g. 140507, set on every save. It is indexed so filtering by a
+    Jalali month or year is an index range scan.
+    """
+    def __init__(self, source=None, *args, **kwargs):
+        self.source = source
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('null', True)
+        kwargs.setdefault('db_index', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        # Fields are saved in order, so an auto_now_add source declared
+        # before this field is already set.
+        time = getattr(model_instance, self.source)
+        value = year_month(time) if time else None
+        setattr(model_instance, self.attname, value)
+        return value
@@ -0,0 +1,210 @@
+import bisect
+import re
+import datetime
+from functools import lru_cache
+
+from django.utils import timezone
+
+from . import jalali
+
+
+MONTH_NAMES = ("فروردین", "اردیبهشت", "خرداد", "تیر", "مرداد", "شهریور",
+               "مهر", "آبان", "آذر", "دی", "بهمن", "اسفند")
+
+PERSIAN_DIGITS = str.maketrans('0123456789', '۰۱۲۳۴۵۶۷۸۹')
+
+# Persian and Arabic digits of typed periods to ASCII.
+PERIOD_DIGITS = str.maketrans('۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩', '01234567890123456789')
+
+# Gregorian years covered by the lookup table. Dates out of it are converted
+# by extensions.jalali
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+
+
+def _build_table():
+    """
+    return the first Jalali year of the table and the day numbers (ordinals)
+    of Nowruz of every Jalali year from before FIRST_YEAR to after LAST_YEAR. The
+    table is built with extensions.jalali so both always agree.
+    """
+    # Start from the year before so the first days of FIRST_YEAR are covered.
+    first_jalali_year = jalali.Gregorian(FIRST_YEAR - 1, 6, 1).persian_year
+    starts = []
+    for year in range(FIRST_YEAR - 1, LAST_YEAR + 2):
+        # Nowruz is always between 19 and 22 of March.
+        for day in range(19, 23):
+            if jalali.Gregorian(year, 3, day).persian_tuple()[1:] == (1, 1):
+                starts.append(datetime.date(year, 3, day).toordinal())
+                break
+    return first_jalali_year, starts
+
+
+FIRST_JALALI_YEAR, NOWRUZ_ORDINALS = _build_table()
+
+
+def to_persian_digits(text):
+    return str(text).translate(PERSIAN_DIGITS)
+
+
+@lru_cache(maxsize=8192)
+def _from_ordinal(ordinal):
+    index = bisect.bisect_right(NOWRUZ_ORDINALS, ordinal) - 1
+    if index < 0 or index >= len(NOWRUZ_ORDINALS) - 1:
+        return jalali.Gregorian(
+            datetime.date.fromordinal(ordinal)
+        ).persian_tuple()
+    day_of_year = ordinal - NOWRUZ_ORDINALS[index]
+    # The first six months have 31 days and the next five have 30 days.
+    if day_of_year < 186:
+        month, day = divmod(day_of_year, 31)
+    else:
+        month, day = divmod(day_of_year - 186, 30)
+        month += 6
+    return FIRST_JALALI_YEAR + index, month + 1, day + 1
+
+
+def to_jalali(date):
+    """return the (year, month, day) of a date in Jalali calendar."""
+    return _from_ordinal(date.toordinal())
+
+
+def _nowruz(year):
+    """return the day number of the first day of a Jalali year."""
+    index = year - FIRST_JALALI_YEAR
+    if 0 <= index < len(NOWRUZ_ORDINALS):
+        return NOWRUZ_ORDINALS[index]
+    return jalali.Persian(year, 1, 1).gregorian_datetime().toordinal()
+
+
+def month_days(year, month):
+    """return the number of days of a Jalali month."""
+    if month <= 6:
+        return 31
+    if month <= 11:
+        return 30
+    return _nowruz(year + 1) - _nowruz(year) - 336
+
+
+def to_gregorian(year, month, day):
+    """
+    return the datetime.date of a Jalali date. Raise ValueError if the date
+    does not exist.
+    """
+    if not 1 <= month <= 12 or not 1 <= day <= month_days(year, month):
+        raise ValueError('Invalid Jalali date {}/{}/{}'.format(year, month, 
+                                                              day))
+    if month <= 6:
+        day_of_year = (month - 1) * 31 + day - 1
+    else:
+        day_of_year = 186 + (month - 7) * 30 + day - 1
+    return datetime.date.fromordinal(_nowruz(year) + day_of_year)
+
+
+@lru_cache(maxsize=8192)
+def _format_day(ordinal):
+    year, month, day = _from_ordinal(ordinal)
+    return "{} {} {}".format(day, MONTH_NAMES[month - 1], year) \
+                     .translate(PERSIAN_DIGITS)
+
+
+def _format(time, detail):
+    output = _format_day(time.toordinal())
+    if detail:
+        output += ", ساعت {}:{}".format(time.hour, time.minute) \
+                                .translate(PERSIAN_DIGITS)
+    return output
+
+
+def format_date(time, detail=None):
+    """
+    return a datetime as a Jalali date with Persian digits, e.g. ۱۱ فروردین
+    ۱۳۹۳, and the time of day if detail is True.
+    """
+    return _format(timezone.localtime(time), detail)
+
+
+def format_dates(times, detail=None):
+    """
+    return the Jalali dates of a column of datetimes, e.g. the values_list of
+    a page of objects. The current time zone is looked up once for all of
+    them and every distinct day is converted once.
+    """
+    zone = timezone.get_current_timezone()
+    return [_format(time.astimezone(zone), detail) if time is not None 
+            else None for time in times]
+
+
+def year_month(time):
+    """return the Jalali year and month of a datetime as yyyymm, e.g. 140507"""
+    year, month, _ = to_jalali(timezone.localtime(time).date())
+    return year * 100 + month
+
+
+def month_label(value):
+    """return the name of a yyyymm Jalali month, e.g. مهر ۱۴۰۵"""
+    year, month = divmod(value, 100)
+    return "{} {}".format(MONTH_NAMES[month - 1], year) \
+                  .translate(PERSIAN_DIGITS)
+
+
+def period_bounds(year, month=None):
+    """
+    return the start and the end of a Jalali year, or a month of it, as
+    aware datetimes in UTC. The end is the start of the next period, so a
+    datetime field is in the period if start <= value < end.
+    """
+    if month is None:
+        first, last = to_gregorian(year, 1, 1), to_gregorian(year + 1, 1, 1)
+    else:
+        first = to_gregorian(year, month, 1)
+        last = to_gregorian(year + month // 12, month % 12 + 1, 1)
+    zone = timezone.get_current_timezone()
+    # Midnight does not exist on days that daylight saving started at 00:00,
+    # is_dst=False gives the same instant as the first moment of those days.
+    return tuple(
+        timezone.make_aware(datetime.datetime.combine(day, datetime.time()),
+                            zone, is_dst=False).astimezone(timezone.utc)
+        for day in (first, last)
+    )
+
+
+def parse_period(text):
+    """
+    return (year, month) of a Jalali period written as 1405, 1405/7 or
+    مهر ۱۴۰۵. month is None for a whole year. Raise ValueError if text is
+    not a valid period.
+    """
+    text = text.translate(PERIOD_DIGITS).strip()
+    match = re.match(r'^(\d{4})(?:\D+(\d{1,2}))?$', text)
+    if match:
+        year, month = int(match.group(1)), match.group(2)
+        month = int(month) if month else None
+    else:
+        parts = text.split()
+        if len(parts) != 2 or parts[0] not in MONTH_NAMES or \
+                not parts[1].isdigit():
+            raise ValueError('Invalid Jalali period {}'.format(text))
+        year, month = int(parts[1]), MONTH_NAMES.index(parts[0]) + 1
+    if month is not None and not 1 <= month <= 12:
+        raise ValueError('Invalid Jalali month {}'.format(month))
+    return year, month
+
+
+def period_lookup(field, year, month=None):
+    """
+    return filter arguments of a datetime field for a Jalali period, e.g.
+    Estate.objects.filter(**period_lookup('created', 1405, 7))
+    """
+    start, end = period_bounds(year, month)
+    return {field + '__gte': start, field + '__lt': end}
+
+
+def year_month_lookup(field, year, month=None):
+    """
+    return filter arguments of a JalaliYearMonthField for a Jalali period,
+    e.g. Estate.objects.filter(**year_month_lookup('jalali_year_month', 1405))
+    """
+    if month is not None:
+        return {field: year * 100 + month}
+    return {field + '__gte': year * 100 + 1, field + '__lte': year * 100 + 12}
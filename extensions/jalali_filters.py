@@ -0,0 +1,48 @@
+from django.contrib import admin
+
+from .jalali_calendar import (month_label, to_persian_digits, 
+                              year_month_lookup)
+
+
+class JalaliMonthFilter(admin.SimpleListFilter):
+    """Filter a changelist by a Jalali month of its jalali_year_month field."""
+    title = 'ماه شمسی'
+    parameter_name = 'jalali_month'
+    field_name = 'jalali_year_month'
+
+    def values(self, request, model_admin):
+        """return the distinct stored months, newest first."""
+        return model_admin.get_queryset(request) \
+                          .exclude(**{self.field_name: None}) \
+                          .order_by('-' + self.field_name) \
+                          .values_list(self.field_name, flat=True) \
+                          .distinct()
+
+    def lookups(self, request, model_admin):
+        return [(value, month_label(value)) 
+                for value in self.values(request, model_admin)]
+
+    def queryset(self, request, queryset):
+        try:
+            value = int(self.value())
+        except (TypeError, ValueError):
+            return queryset
+        return queryset.filter(**{self.field_name: value})
+
+
+class JalaliYearFilter(JalaliMonthFilter):
+    """Filter a changelist by a Jalali year of its jalali_year_month field."""
+    title = 'سال شمسی'
+    parameter_name = 'jalali_year'
+
+    def lookups(self, request, model_admin):
+        years = sorted({value // 100 for value in 
+                        self.values(request, model_admin)}, reverse=True)
+        return [(year, to_persian_digits(year)) for year in years]
+
+    def queryset(self, request, queryset):
+        try:
+            year = int(self.value())
+        except (TypeError, ValueError):
+            return queryset
+        return queryset.filter(**year_month_lookup(self.field_name, year))
@@ -0,0 +1,107 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from .cache import get_generations, bump_generation_on_commit
+
+
+# Change this when cached models change so old pickles are never read.
+CACHE_VERSION = 1
+
+TIMEOUT = getattr(settings, 'OBJECT_CACHE_TIMEOUT', 60 * 60)
+
+# Model to a function that returns the queryset used to load its objects.
+_querysets = {}
+
+_identity_map = threading.local()
+
+
+def register(model, queryset):
+    """
+    Cache objects of model. queryset is a function returning the queryset
+    used to load an object, so related objects can be cached with it.
+    """
+    _querysets[model] = queryset
+
+
+def _version_names(model, pk):
+    label = model._meta.label_lower
+    return ('object:{}'.format(label), 'object:{}:{}'.format(label, pk))
+
+
+def _objects():
+    """return the identity map of current request."""
+    if not hasattr(_identity_map, 'objects'):
+        _identity_map.objects = {}
+    return _identity_map.objects
+
+
+def clear_identity_map():
+    _identity_map.objects = {}
+
+
+def get_object(model, pk, shared=True):
+    """
+    return the object of model with pk or raise model.DoesNotExist.
+
+    An object is loaded once per request. If shared is True it is also read
+    through the shared cache; pass False when the object is going to be
+    saved, so a cached copy never overwrites newer data.
+    """
+    objects = _objects()
+    identity = (model, int(pk), shared)
+    if identity in objects:
+        return objects[identity]
+
+    if shared:
+        # Both the model and the object have a version that is bumped to
+        # invalidate them, so old entries are never read again.
+        names = _version_names(model, pk)
+        key = '{}:{}:{}:{}'.format(
+            names[1], CACHE_VERSION, *get_generations(*names)
+        )
+        obj = cache.get(key)
+        if obj is None:
+            obj = _querysets[model]().get(pk=pk)
+            cache.set(key, obj, TIMEOUT)
+    else:
+        obj = _querysets[model]().get(pk=pk)
+
+    objects[identity] = obj
+    return obj
+
+
+def get_object_or_404(model, pk, shared=True):
+    try:
+        return get_object(model, pk, shared)
+    except model.DoesNotExist:
+        raise Http404
+
+
+def invalidate(model, pk):
+    """Drop the cached object of model with pk."""
+    bump_generation_on_commit(_version_names(model, pk)[1])
+    _objects().pop((model, int(pk), True), None)
+
+
+def invalidate_all(model):
+    """Drop all cached objects of model."""
+    bump_generation_on_commit(_version_names(model, 0)[0])
+    for identity in list(_objects()):
+        if identity[0] is model:
+            del _objects()[identity]
+
+
+class IdentityMapMiddleware():
+    """Start every request with an empty identity map."""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        clear_identity_map()
+        try:
+            return self.get_response(request)
+        finally:
+            clear_identity_map()
@@ -0,0 +1,87 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class CursorPage():
+    """
+    A page of a cursor paginated queryset. next_cursor and previous_cursor
+    are None on the last and the first page.
+    """
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+def encode_cursor(obj, field, direction):
+    value = getattr(obj, field)
+    data = [direction, value.isoformat(), obj.pk]
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """return (direction, value, pk) of a cursor or None if it is invalid."""
+    try:
+        direction, value, pk = json.loads(base64.urlsafe_b64decode(
+            cursor.encode()
+        ))
+        value = parse_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if direction not in ('n', 'p') or value is None or \
+            not isinstance(pk, int):
+        return None
+    return direction, value, pk
+
+
+def cursor_paginate(queryset, cursor, per_page, field='created'):
+    """
+    return a CursorPage of queryset ordered by field and pk descending.
+    A page is found by comparing with the last row of the previous page
+    instead of an OFFSET, so every page costs the same with an index on the
+    filtered columns and field. An invalid cursor gives the first page.
+    """
+    position = decode_cursor(cursor) if cursor else None
+    queryset = queryset.order_by('-' + field, '-pk')
+    if position is None:
+        direction = 'n'
+    else:
+        direction, value, pk = position
+        if direction == 'n':
+            queryset = queryset.filter(
+                Q(**{field + '__lt': value}) | Q(**{field: value, 'pk__lt': pk})
+            )
+        else:
+            queryset = queryset.filter(
+                Q(**{field + '__gt': value}) | Q(**{field: value, 'pk__gt': pk})
+            ).reverse()
+
+    # One more row tells if there is a page after this one.
+    rows = list(queryset[:per_page + 1])
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == 'p':
+        rows.reverse()
+
+    has_next = more if direction == 'n' else True
+    has_previous = position is not None and (more or direction == 'n')
+    return CursorPage(
+        rows,
+        encode_cursor(rows[-1], field, 'n') if rows and has_next else None,
+        encode_cursor(rows[0], field, 'p') if rows and has_previous else None,
+    )
@@ -1,37 +1,34 @@
-from . import jalali
-from django.utils import timezone
+from .jalali_calendar import format_date, to_persian_digits
 
 def persian_number_converter(mystr):
-    numbers = { "0" : "۰", "1" : "۱", "2" : "۲", "3" : "۳", "4" : "۴", "5" : "۵", "6" : "۶", "7" : "۷", "8" : "۸", "9" : "۹"}
-
-    for e, p in numbers.items():
-        mystr = mystr.replace(e, p)
-
-    return mystr
+    """return mystr with English digits replaced with Persian digits."""
+    return to_persian_digits(mystr)
 
 
 def jalali_converter(time, detail=None):
-    jmonth = ["فروردین", "اردیبهشت", "خرداد", "تیر", "مرداد", "شهریور", "مهر", "آبان", "آذر", "دی", "بهمن", "اسفند"]
-
-    time = timezone.localtime(time)
-    time_to_str = "{},{},{}".format(time.year, time.month, time.day)
-    time_to_list = list(jalali.Gregorian(time_to_str).persian_tuple())
-
-    time_to_list[1] = jmonth[time_to_list[1] - 1]
-
-    if detail:
-        output = "{} {} {}, ساعت {}:{}".format(
-            time_to_list[2],
-            time_to_list[1],
-            time_to_list[0],
-            time.hour,
-            time.minute
-        )
-        return persian_number_converter(output)
-        
-    output = "{} {} {}".format(
-        time_to_list[2],
-        time_to_list[1],
-        time_to_list[0],
-    )
-    return persian_number_converter(output)
+    """
+    return time as a Jalali date with Persian digits, and the hour and minute
+    if detail is given. See extensions.jalali_calendar
+    """
+    return format_date(time, detail)
+
+
+def normalize_persian(text):
+    """
+    return a canonical form of a Persian text for searching. Arabic letters
+    are replaced with their Persian forms, digits are converted to English and
+    white spaces are collapsed.
+    """
+    text = text.translate(PERSIAN_NORMALIZE_TABLE)
+    return ' '.join(text.split()).lower()
+
+
+PERSIAN_NORMALIZE_TABLE = str.maketrans({
+    "ي": "ی", "ى": "ی", "ك": "ک", "ة": "ه", "ؤ": "و", "إ": "ا", "أ": "ا",
+    "۰": "0", "۱": "1", "۲": "2", "۳": "3", "۴": "4",
+    "۵": "5", "۶": "6", "۷": "7", "۸": "8", "۹": "9",
+    "٠": "0", "١": "1", "٢": "2", "٣": "3", "٤": "4",
+    "٥": "5", "٦": "6", "٧": "7", "٨": "8", "٩": "9",
+    "ً": None, "ٌ": None, "ٍ": None, "َ": None,
+    "ُ": None, "ِ": None, "ّ": None, "ْ": None,
+})
@@ -34,6 +34,14 @@ INSTALLED_APPS = [
 	'blog.apps.BlogConfig',
 	'contact_us.apps.ContactUsConfig',
 	'subscription.apps.SubscriptionConfig',
+	'counter.apps.CounterConfig',
+	'search.apps.SearchConfig',
+	'publisher.apps.PublisherConfig',
+	'sitemap.apps.SitemapConfig',
+	'reports.apps.ReportsConfig',
+	'outbox.apps.OutboxConfig',
+	'moderation.apps.ModerationConfig',
+	'autocomplete.apps.AutocompleteConfig',
 
 	# third party
 	'crispy_forms',
@@ -45,6 +53,7 @@ MIDDLEWARE = [
 	'django.middleware.common.CommonMiddleware',
 	'django.middleware.csrf.CsrfViewMiddleware',
 	'django.contrib.auth.middleware.AuthenticationMiddleware',
+	'extensions.object_cache.IdentityMapMiddleware',
 	'django.contrib.messages.middleware.MessageMiddleware',
 	'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -128,6 +137,29 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 AUTH_USER_MODEL = 'account.User'
 
+# The cache is shared by all workers and hosts, so an entry dropped by one
+# of them, e.g. the session of a logged out user, is dropped for all. Set
+# cache_location in local_settings to the memcached servers, e.g.
+# '127.0.0.1:11211'. Without it every process has its own cache.
+CACHE_LOCATION = getattr(local_settings, 'cache_location', None)
+
+if CACHE_LOCATION:
+	CACHES = {
+		'default': {
+			'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+			'LOCATION': CACHE_LOCATION,
+			'KEY_PREFIX': 'homeo',
+		}
+	}
+
+	# request.user is read from a cached copy of the user, see 
+	# account.backends. Sessions and users are only cached in a shared 
+	# cache, a process cache would keep them after logout or deactivation
+	# in the other workers.
+	AUTHENTICATION_BACKENDS = ['account.backends.CachedUserBackend']
+
+	SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 LANGUAGE_CODE = 'fa'
 
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
@@ -138,7 +170,11 @@ LOGIN_REDIRECT_URL = "site_setting:home"
 LOGOUT_REDIRECT_URL = "account:login"
 
 
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Emails are queued in the outbox and delivered in batches through
+# OUTBOX_EMAIL_BACKEND, e.g. 'django.core.mail.backends.console.EmailBackend'
+# in development.
+EMAIL_BACKEND = 'outbox.backends.OutboxBackend'
+OUTBOX_EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = local_settings.EMAIL_HOST
 EMAIL_HOST_USER = local_settings.EMAIL_HOST_USER
 EMAIL_HOST_PASSWORD = local_settings.EMAIL_HOST_PASSWORD
@@ -9,6 +9,11 @@ urlpatterns = [
     path('blog/', include('blog.urls')),
     path('contact-us/', include('contact_us.urls')),
     path('subscription/', include('subscription.urls')),
+    path('reports/', include('reports.urls')),
+    path('moderation/', include('moderation.urls')),
+    path('autocomplete/', include('autocomplete.urls')),
+    path('counter/', include('counter.urls')),
+    path('', include('sitemap.urls')),
 
     path('', include('site_setting.urls')),
 ]
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import ModerationLog
+
+
+@admin.register(ModerationLog)
+class ModerationLogAdmin(admin.ModelAdmin):
+    list_display = ('moderator', 'kind', 'action', 'count', 'created')
+    list_filter = ('kind', 'action')
+    list_select_related = ('moderator',)
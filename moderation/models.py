@@ -0,0 +1,34 @@
+from django.db import models
+
+from account.models import User
+
+
+class ModerationLog(models.Model):
+	"""One moderation action of a moderator on a batch of objects."""
+	KIND_CHOICES = (
+		('estate', 'ملک'),
+		('article', 'مقاله'),
+	)
+	ACTION_CHOICES = (
+		('approve', 'تایید'),
+		('return', 'برگشت'),
+		('reject', 'رد'),
+	)
+	moderator = models.ForeignKey(User, null=True, on_delete=models.SET_NULL, 
+								  related_name='moderation_logs', 
+								  verbose_name='بررسی کننده')
+	kind = models.CharField(max_length=10, choices=KIND_CHOICES, 
+							verbose_name='نوع')
+	action = models.CharField(max_length=10, choices=ACTION_CHOICES, 
+							  verbose_name='عملیات')
+	count = models.PositiveIntegerField(verbose_name='تعداد')
+	created = models.DateTimeField(auto_now_add=True, verbose_name='زمان')
+
+	class Meta:
+		ordering = ('-created',)
+		indexes = [models.Index(fields=['created', 'moderator'])]
+		verbose_name = "گزارش بررسی"
+		verbose_name_plural = "گزارش‌های بررسی"
+
+	def __str__(self):
+		return f"{self.moderator} - {self.action} - {self.count}"
@@ -0,0 +1,130 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.utils import timezone
+
+from .models import ModerationLog
+from blog import bulk as article_bulk
+from blog.models import Article
+from real_estate import bulk as estate_bulk
+from real_estate.models import Estate
+
+
+# Objects claimed by a moderator at once.
+CLAIM_SIZE = getattr(settings, 'MODERATION_CLAIM_SIZE', 20)
+
+# Seconds a claim is kept. Objects that are not moderated in time return to
+# the queue for other moderators.
+CLAIM_TIMEOUT = getattr(settings, 'MODERATION_CLAIM_TIMEOUT', 30 * 60)
+
+# Kind of objects to (model, bulk module of the model)
+KINDS = {
+	'estate': (Estate, estate_bulk),
+	'article': (Article, article_bulk),
+}
+
+# Action to the published status it sets.
+ACTIONS = {
+	'approve': 'p',
+	'return': 'b',
+	'reject': 'd',
+}
+
+
+def _unclaimed(model, now):
+	"""Filter objects waiting for review that nobody is reviewing."""
+	return model.objects.filter(
+		Q(claimed_until__isnull=True) | Q(claimed_until__lte=now), 
+		published_status='c'
+	)
+
+
+def claim(kind, moderator_id, size=CLAIM_SIZE):
+	"""
+	Claim a batch of the oldest objects waiting for review for a moderator
+	and return the number of claimed objects. Where the database supports
+	it, the batch is locked with SELECT ... FOR UPDATE SKIP LOCKED, so
+	moderators claiming at the same time get different objects without
+	waiting for each other. Elsewhere, e.g. SQLite in tests, a conditional
+	UPDATE only claims objects that are still unclaimed.
+	"""
+	model = KINDS[kind][0]
+	now = timezone.now()
+	candidates = _unclaimed(model, now).order_by('updated', 'id')
+	with transaction.atomic():
+		if connection.features.has_select_for_update_skip_locked:
+			candidates = candidates.select_for_update(skip_locked=True)
+		ids = list(candidates.values_list('id', flat=True)[:size])
+		return _unclaimed(model, now).filter(id__in=ids).update(
+			claimed_by_id=moderator_id, 
+			claimed_until=now + timezone.timedelta(seconds=CLAIM_TIMEOUT)
+		)
+
+
+def claimed(kind, moderator_id):
+	"""return the objects claimed by a moderator, oldest first."""
+	model = KINDS[kind][0]
+	return model.objects.filter(published_status='c', 
+								claimed_by_id=moderator_id, 
+								claimed_until__gt=timezone.now()) \
+						.order_by('updated', 'id')
+
+
+def release(kind, moderator_id, ids=None):
+	"""Return claimed objects of a moderator to the queue."""
+	model = KINDS[kind][0]
+	objects = model.objects.filter(claimed_by_id=moderator_id)
+	if ids is not None:
+		objects = objects.filter(id__in=ids)
+	return objects.update(claimed_by=None, claimed_until=None)
+
+
+def moderate(kind, moderator_id, ids, action, update_guide=None):
+	"""
+	Approve, return with update_guide or reject the claimed objects of a
+	moderator with one UPDATE. Models are not saved, so their images are
+	never touched. return the number of moderated objects.
+	"""
+	model, bulk = KINDS[kind]
+	with transaction.atomic():
+		# A claim that expired and was taken by another moderator is not
+		# this moderator's anymore.
+		queryset = model.objects.filter(id__in=ids, published_status='c', 
+										claimed_by_id=moderator_id)
+		rows = bulk.get_rows(queryset.select_for_update())
+		if not rows:
+			return 0
+		model.objects.filter(id__in=[row[0] for row in rows]).update(
+			published_status=ACTIONS[action], 
+			update_guide=update_guide if action == 'return' else None, 
+			claimed_by=None, claimed_until=None, updated=timezone.now()
+		)
+		bulk.invalidate(rows, publish=action == 'approve')
+		ModerationLog.objects.create(moderator_id=moderator_id, kind=kind, 
+									 action=action, count=len(rows))
+	return len(rows)
+
+
+def moderator_stats(since):
+	"""
+	return the moderated counts of every moderator since a datetime, by
+	action, and the objects moderated per hour between their first and last
+	action, with one grouped query.
+	"""
+	rows = ModerationLog.objects.filter(created__gte=since) \
+		.values('moderator_id', 'moderator__first_name') \
+		.annotate(
+			total=Sum('count'), batches=Count('id'), 
+			first=Min('created'), last=Max('created'), 
+			**{action: Sum('count', filter=Q(action=action)) 
+			   for action in ACTIONS}
+		) \
+		.order_by('-total')
+	stats = []
+	for row in rows:
+		for action in ACTIONS:
+			row[action] = row[action] or 0
+		hours = max((row['last'] - row['first']).total_seconds() / 3600, 1)
+		row['per_hour'] = round(row['total'] / hours, 1)
+		stats.append(row)
+	return stats
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import ModerationQueueView
+
+
+app_name = 'moderation'
+urlpatterns = [
+    path('<slug:kind>/', ModerationQueueView.as_view(), name='queue'),
+]
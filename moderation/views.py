@@ -0,0 +1,58 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404
+from django.shortcuts import redirect, render
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.generic import TemplateView
+
+from . import queue
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class ModerationQueueView(TemplateView):
+	"""
+	Show the estates or articles claimed by the moderator and the moderation
+	stats of the last days. Post claims a new batch, releases it, or
+	approves, returns or rejects the chosen objects of it.
+	"""
+	STATS_DAYS = 7
+
+	def dispatch(self, request, kind, *args, **kwargs):
+		if kind not in queue.KINDS:
+			raise Http404
+		self.kind = kind
+		return super().dispatch(request, *args, **kwargs)
+
+	def get(self, request, *args, **kwargs):
+		since = timezone.now() - timezone.timedelta(days=self.STATS_DAYS)
+		model = queue.KINDS[self.kind][0]
+		return render(request, 'moderation/queue.html',
+					{'kind': self.kind,
+					'objects': queue.claimed(self.kind, request.user.id),
+					'waiting': model.objects.filter(published_status='c')
+											.count(),
+					'stats': queue.moderator_stats(since),
+					'error': request.GET.get('error')})
+
+	def post(self, request, *args, **kwargs):
+		action = request.POST.get('action')
+		url = reverse('moderation:queue', kwargs={'kind': self.kind})
+		try:
+			ids = [int(pk) for pk in request.POST.getlist('objects')]
+		except ValueError:
+			raise Http404
+
+		if action == 'claim':
+			queue.claim(self.kind, request.user.id)
+		elif action == 'release':
+			queue.release(self.kind, request.user.id, ids or None)
+		elif action in queue.ACTIONS:
+			update_guide = request.POST.get('update_guide', '').strip()
+			if action == 'return' and not update_guide:
+				return redirect(url + '?error=update_guide')
+			queue.moderate(self.kind, request.user.id, ids, action, 
+						   update_guide)
+		else:
+			raise Http404
+		return redirect(url)
@@ -0,0 +1,21 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import OutboxMessage
+from .delivery import schedule_delivery
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipients', 'status', 'attempts', 
+                    'next_attempt', 'created', 'sent')
+    list_filter = ('status',)
+    search_fields = ('recipients',)
+    readonly_fields = ('attempts', 'claim', 'last_error', 'created', 'sent')
+    actions = ('retry',)
+
+    def retry(self, request, queryset):
+        queryset.exclude(status='s').update(status='q', attempts=0, claim='', 
+                                            next_attempt=timezone.now())
+        schedule_delivery()
+    retry.short_description = 'ارسال دوباره'
@@ -0,0 +1,22 @@
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+
+from .delivery import schedule_delivery
+from .models import OutboxMessage
+
+
+class OutboxBackend(BaseEmailBackend):
+	"""
+	Email backend that stores messages in the outbox instead of sending
+	them. The rows are written in the current transaction, and delivery is
+	scheduled after it commits, so a request never waits for the mail
+	server and a rolled back request sends nothing.
+	"""
+	def send_messages(self, email_messages):
+		rows = [OutboxMessage.from_email_message(message) 
+				for message in email_messages if message.recipients()]
+		if not rows:
+			return 0
+		OutboxMessage.objects.bulk_create(rows)
+		transaction.on_commit(schedule_delivery)
+		return len(rows)
@@ -0,0 +1,186 @@
+import logging
+import smtplib
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.db import connection
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+
+# Backend that really delivers the queued messages. The file based or
+# console backend may be used in development and tests.
+OUTBOX_EMAIL_BACKEND = getattr(settings, 'OUTBOX_EMAIL_BACKEND', 
+							   'django.core.mail.backends.smtp.EmailBackend')
+
+# Messages claimed and sent at once over the same connection.
+BATCH_SIZE = getattr(settings, 'OUTBOX_BATCH_SIZE', 50)
+
+# A message that failed this many times is not retried anymore.
+MAX_ATTEMPTS = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 6)
+
+# Seconds before the first retry, doubled after every failure.
+RETRY_DELAY = getattr(settings, 'OUTBOX_RETRY_DELAY', 60)
+
+# Seconds a claimed message is kept from other workers. A message of a
+# worker that died while sending is retried after it.
+CLAIM_TIMEOUT = getattr(settings, 'OUTBOX_CLAIM_TIMEOUT', 300)
+
+# Seconds that messages are collected before an in-process delivery.
+OUTBOX_DELAY = getattr(settings, 'OUTBOX_DELAY', 2)
+
+# Seconds an unused connection is kept open. Mail servers drop idle
+# connections, so older ones are closed and opened again.
+IDLE_TIMEOUT = getattr(settings, 'OUTBOX_IDLE_TIMEOUT', 30)
+
+# Errors that retrying the same message can not fix.
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, ValueError)
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+	"""
+	Keep one open connection of the delivery backend per process, reused
+	by every batch until it is idle for IDLE_TIMEOUT seconds or fails.
+	"""
+	def __init__(self):
+		self.lock = threading.RLock()
+		self.connection = None
+		self.last_used = 0
+
+	def get(self):
+		if self.connection is not None and \
+				time.monotonic() - self.last_used > IDLE_TIMEOUT:
+			self.close()
+		if self.connection is None:
+			self.connection = get_connection(OUTBOX_EMAIL_BACKEND, 
+											 fail_silently=False)
+			self.connection.open()
+		self.last_used = time.monotonic()
+		return self.connection
+
+	def close(self):
+		if self.connection is not None:
+			try:
+				self.connection.close()
+			except Exception:
+				pass
+			self.connection = None
+
+
+pool = ConnectionPool()
+
+
+def claim(batch_size=BATCH_SIZE):
+	"""
+	Claim the due messages of a batch with one conditional UPDATE and return
+	them. A message is claimed by one worker only, even if several claim
+	the same rows at once.
+	"""
+	now = timezone.now()
+	due = OutboxMessage.objects.filter(status='q', next_attempt__lte=now)
+	ids = list(due.order_by('next_attempt')
+				  .values_list('id', flat=True)[:batch_size])
+	if not ids:
+		return []
+	token = uuid.uuid4().hex
+	due.filter(id__in=ids).update(
+		claim=token, next_attempt=now + timezone.timedelta(seconds=CLAIM_TIMEOUT)
+	)
+	return list(OutboxMessage.objects.filter(claim=token, status='q'))
+
+
+def _failed(message, error):
+	message.attempts += 1
+	message.last_error = repr(error)
+	if isinstance(error, PERMANENT_ERRORS) or message.attempts >= MAX_ATTEMPTS:
+		# Dead letter, kept for the admin to inspect and retry.
+		message.status = 'd'
+		logger.error('Email %s was not delivered: %r', message.id, error)
+	else:
+		message.next_attempt = timezone.now() + timezone.timedelta(
+			seconds=RETRY_DELAY * 2 ** (message.attempts - 1)
+		)
+	message.claim = ''
+	message.save(update_fields=['attempts', 'last_error', 'status', 
+								'next_attempt', 'claim'])
+
+
+def send_batch(messages):
+	"""Send claimed messages over the pooled connection. return sent count."""
+	sent_ids = []
+	with pool.lock:
+		for message in messages:
+			try:
+				email = message.to_email_message()
+				if not pool.get().send_messages([email]):
+					raise smtplib.SMTPException('Message was not sent.')
+			except Exception as error:
+				if not isinstance(error, PERMANENT_ERRORS):
+					# The connection may be broken, open a new one.
+					pool.close()
+				_failed(message, error)
+			else:
+				sent_ids.append(message.id)
+	OutboxMessage.objects.filter(id__in=sent_ids) \
+						 .update(status='s', sent=timezone.now(), claim='')
+	return len(sent_ids)
+
+
+def deliver(batch_size=BATCH_SIZE):
+	"""Send all due messages batch by batch. return the number sent."""
+	sent = 0
+	while True:
+		messages = claim(batch_size)
+		if not messages:
+			return sent
+		sent += send_batch(messages)
+
+
+def next_delay():
+	"""return seconds until the next queued message is due, or None."""
+	next_attempt = OutboxMessage.objects.filter(status='q') \
+										.order_by('next_attempt') \
+										.values_list('next_attempt', flat=True) \
+										.first()
+	if next_attempt is None:
+		return None
+	return max((next_attempt - timezone.now()).total_seconds(), 0)
+
+
+def _delayed_delivery():
+	delay = None
+	try:
+		deliver()
+	except Exception:
+		logger.exception('Delivering emails failed')
+	finally:
+		# Messages queued from now on schedule their own delivery, and the
+		# ones queued while sending are found by next_delay().
+		cache.delete('outbox:delivering')
+		try:
+			delay = next_delay()
+		finally:
+			connection.close()
+	# Come back for the messages waiting to be retried.
+	if delay is not None:
+		schedule_delivery(max(delay, OUTBOX_DELAY))
+
+
+def schedule_delivery(delay=OUTBOX_DELAY):
+	"""
+	Deliver the queued messages in a background thread after delay seconds.
+	Only one delivery is scheduled at a time across all workers, and the
+	messages queued meanwhile are sent in the same batches.
+	"""
+	if not cache.add('outbox:delivering', 1, delay + CLAIM_TIMEOUT):
+		return
+	timer = threading.Timer(delay, _delayed_delivery)
+	timer.daemon = True
+	timer.start()
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from outbox.delivery import BATCH_SIZE, deliver
+
+
+class Command(BaseCommand):
+	help = 'Deliver the queued emails of the outbox.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+		parser.add_argument('--loop', action='store_true', 
+							help='Keep delivering until stopped.')
+		parser.add_argument('--interval', type=float, default=5, 
+							help='Seconds between two runs with --loop.')
+
+	def handle(self, *args, **options):
+		while True:
+			sent = deliver(options['batch_size'])
+			if not options['loop']:
+				break
+			if sent:
+				self.stdout.write('{} emails sent.'.format(sent))
+			connection.close()
+			time.sleep(options['interval'])
+		self.stdout.write(self.style.SUCCESS('{} emails sent.'.format(sent)))
@@ -0,0 +1,89 @@
+import base64
+import json
+
+from django.core.mail import EmailMultiAlternatives
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+	"""
+	An email waiting to be delivered by outbox.delivery. The message itself
+	is stored as JSON in data.
+	"""
+	STATUS_CHOICES = (
+		('q', 'در صف ارسال'),
+		('s', 'ارسال شده'),
+		('d', 'ناموفق'),
+	)
+	status = models.CharField(max_length=1, choices=STATUS_CHOICES, 
+							  default='q', verbose_name='وضعیت')
+	subject = models.CharField(max_length=255, verbose_name='موضوع')
+	recipients = models.TextField(verbose_name='گیرندگان')
+	data = models.TextField(verbose_name='پیام')
+	attempts = models.PositiveSmallIntegerField(default=0, 
+												verbose_name='تعداد تلاش')
+	next_attempt = models.DateTimeField(default=timezone.now, 
+										verbose_name='تلاش بعدی')
+	# Set by the worker that claimed the message for its next attempt.
+	claim = models.CharField(max_length=32, blank=True, default='', 
+							 verbose_name='شناسه ارسال')
+	last_error = models.TextField(blank=True, verbose_name='آخرین خطا')
+	created = models.DateTimeField(auto_now_add=True, 
+								   verbose_name='تاریخ ایجاد')
+	sent = models.DateTimeField(null=True, blank=True, 
+								verbose_name='تاریخ ارسال')
+
+	class Meta:
+		ordering = ('-created',)
+		indexes = [models.Index(fields=['status', 'next_attempt'])]
+		verbose_name = "ایمیل"
+		verbose_name_plural = "صف ایمیل‌ها"
+
+	def __str__(self):
+		return f"{self.subject} - {self.recipients}"
+
+	@classmethod
+	def from_email_message(cls, message):
+		"""return an unsaved OutboxMessage of an EmailMessage."""
+		attachments = []
+		for attachment in message.attachments:
+			if not isinstance(attachment, tuple):
+				raise ValueError('Only (filename, content, mimetype) '
+								 'attachments can be queued.')
+			filename, content, mimetype = attachment
+			if isinstance(content, str):
+				content = content.encode()
+			attachments.append((filename, 
+								base64.b64encode(content).decode('ascii'), 
+								mimetype))
+		data = {
+			'subject': message.subject,
+			'body': message.body,
+			'from_email': message.from_email,
+			'to': message.to,
+			'cc': message.cc,
+			'bcc': message.bcc,
+			'reply_to': message.reply_to,
+			'headers': message.extra_headers,
+			'alternatives': getattr(message, 'alternatives', []),
+			'attachments': attachments,
+			'content_subtype': message.content_subtype,
+		}
+		return cls(subject=str(message.subject)[:255], 
+				   recipients=', '.join(message.recipients()), 
+				   data=json.dumps(data))
+
+	def to_email_message(self):
+		"""return the stored message as an EmailMultiAlternatives."""
+		data = json.loads(self.data)
+		message = EmailMultiAlternatives(
+			data['subject'], data['body'], data['from_email'], data['to'], 
+			data['bcc'], headers=data['headers'], cc=data['cc'], 
+			reply_to=data['reply_to'], 
+			alternatives=[tuple(item) for item in data['alternatives']],
+		)
+		for filename, content, mimetype in data['attachments']:
+			message.attach(filename, base64.b64decode(content), mimetype)
+		message.content_subtype = data['content_subtype']
+		return message
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class PublisherConfig(AppConfig):
+    name = 'publisher'
+
+    def ready(self):
+        from . import signals
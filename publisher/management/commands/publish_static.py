@@ -0,0 +1,45 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from publisher.pages import all_paths
+from publisher.publish import publish_pages, PUBLISH_ROOT
+
+
+def _init_worker():
+	django.setup()
+	# Forked workers must not share the database connection of the parent.
+	connections.close_all()
+
+
+class Command(BaseCommand):
+	help = 'Render all public pages to STATIC_PUBLISH_ROOT.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--processes', type=int, default=os.cpu_count())
+		parser.add_argument('--chunk-size', type=int, default=200)
+		parser.add_argument('paths', nargs='*', 
+							help='Publish only these paths.')
+
+	def handle(self, *args, **options):
+		if not PUBLISH_ROOT:
+			raise CommandError('STATIC_PUBLISH_ROOT is not set.')
+
+		paths = sorted(options['paths'] or all_paths())
+		size = options['chunk_size']
+		chunks = [paths[i:i + size] for i in range(0, len(paths), size)]
+
+		if options['processes'] > 1 and len(chunks) > 1:
+			connections.close_all()
+			with ProcessPoolExecutor(options['processes'], 
+									 initializer=_init_worker) as pool:
+				written = sum(pool.map(publish_pages, chunks))
+		else:
+			written = publish_pages(paths)
+
+		self.stdout.write(self.style.SUCCESS(
+			'{} of {} pages published.'.format(written, len(paths))
+		))
@@ -0,0 +1,114 @@
+from django.urls import reverse
+
+from account.models import User
+from blog.models import Article, Category
+from real_estate.models import Estate, EstateImage, City
+from site_setting.models import SiteSetting, Faq
+
+
+def estate_path(estate_id):
+	return reverse('real_estate:estate_detail', kwargs={'estate_id': estate_id})
+
+
+def article_path(article_id):
+	return reverse('blog:article_detail', kwargs={'article_id': article_id})
+
+
+def user_path(user_id):
+	return reverse('account:user_detail', kwargs={'id': user_id})
+
+
+def site_paths():
+	return {reverse('site_setting:home'), reverse('site_setting:about_us'),
+			reverse('site_setting:faq')}
+
+
+def all_paths():
+	"""return paths of all public pages that are published to disk."""
+	paths = site_paths()
+	paths.update(estate_path(pk) for pk in
+				 Estate.published.values_list('id', flat=True).iterator())
+	paths.update(article_path(pk) for pk in
+				 Article.published.values_list('id', flat=True).iterator())
+	paths.update(user_path(pk) for pk in
+				 User.active.values_list('id', flat=True).iterator())
+	return paths
+
+
+def affected_paths(instance):
+	"""return paths of the pages that show the changed instance."""
+	home = reverse('site_setting:home')
+	about_us = reverse('site_setting:about_us')
+
+	if isinstance(instance, SiteSetting):
+		# Every page shows the site setting in its header and footer.
+		return all_paths()
+
+	if isinstance(instance, Faq):
+		return {reverse('site_setting:faq')}
+
+	if isinstance(instance, Estate):
+		if not (instance.published_status == 'p' or 
+				getattr(instance, '_published_before', True)):
+			# An estate that was and is not published is on no public page.
+			return {estate_path(instance.pk)}
+		# Latest estates are also shown in the sidebar of all detail pages,
+		# which are not republished for one estate. publish_static refreshes
+		# them, e.g. from cron.
+		return {estate_path(instance.pk), user_path(instance.agent_id),
+				home, about_us}
+
+	if isinstance(instance, EstateImage):
+		return {estate_path(instance.estate_id)}
+
+	if isinstance(instance, City):
+		return {estate_path(pk) for pk in
+				instance.estates.values_list('id', flat=True)}
+
+	if isinstance(instance, Article):
+		paths = {article_path(instance.pk), home, about_us}
+		if instance.author_id:
+			paths.add(user_path(instance.author_id))
+		return paths
+
+	if isinstance(instance, Category):
+		return {article_path(pk) for pk in
+				Article.published.values_list('id', flat=True)}
+
+	if isinstance(instance, User):
+		paths = {user_path(instance.pk), home, about_us}
+		paths.update(estate_path(pk) for pk in
+					 instance.estates.values_list('id', flat=True))
+		paths.update(article_path(pk) for pk in
+					 instance.articles.values_list('id', flat=True))
+		return paths
+
+	return set()
+
+
+def affected_estates_paths(estates):
+	"""
+	return paths of the pages that show changed estates, given as
+	(id, agent id) rows, like affected_paths of each one.
+	"""
+	if not estates:
+		return set()
+	paths = {reverse('site_setting:home'), reverse('site_setting:about_us')}
+	for pk, agent_id in estates:
+		paths.update((estate_path(pk), user_path(agent_id)))
+	return paths
+
+
+def affected_articles_paths(articles):
+	"""
+	return paths of the pages that show changed articles, given as
+	(id, author id) rows, like affected_paths of each one.
+	"""
+	if not articles:
+		return set()
+	paths = {reverse('site_setting:home'), reverse('site_setting:about_us')}
+	for pk, author_id in articles:
+		paths.add(article_path(pk))
+		if author_id:
+			paths.add(user_path(author_id))
+	return paths
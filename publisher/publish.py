@@ -0,0 +1,134 @@
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.cache import SessionStore
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import resolve
+
+from extensions import object_cache
+
+
+# Directory that pages are published to. The front-end web server serves
+# anonymous requests from it and falls back to django for missing files, e.g.
+# for nginx: try_files /published$uri/index.html @django;
+# Requests with a session cookie should always be passed to django.
+# Views of pages served from the files are not counted by their views; the
+# pages request counter:hit for that instead. Publishing is disabled if it
+# is not set.
+PUBLISH_ROOT = getattr(settings, 'STATIC_PUBLISH_ROOT', None)
+
+# Host name used when rendering the pages.
+PUBLISH_HOST = getattr(settings, 'STATIC_PUBLISH_HOST', 'localhost')
+
+# Seconds that changes are collected before their pages are published.
+PUBLISH_DELAY = getattr(settings, 'STATIC_PUBLISH_DELAY', 2)
+
+logger = logging.getLogger(__name__)
+
+
+def page_file(path, root=None):
+	"""return the file of a page, e.g. /estate/5/ -> estate/5/index.html"""
+	return os.path.join(root or PUBLISH_ROOT, path.strip('/'), 'index.html')
+
+
+def write_atomic(file_path, content):
+	"""
+	Write content to a temporary file next to file_path and rename it, so the
+	web server never serves a partly written page.
+	"""
+	directory = os.path.dirname(file_path)
+	os.makedirs(directory, exist_ok=True)
+	descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+	try:
+		with os.fdopen(descriptor, 'wb') as temp_file:
+			temp_file.write(content)
+		os.chmod(temp_path, 0o644)
+		os.replace(temp_path, file_path)
+	except BaseException:
+		os.unlink(temp_path)
+		raise
+
+
+def render_page(path):
+	"""Render a page as an anonymous visitor and return the response."""
+	request = RequestFactory().get(path, HTTP_HOST=PUBLISH_HOST)
+	request.user = AnonymousUser()
+	request.session = SessionStore()
+	# Rendering for the disk is not a visit.
+	request.prerender = True
+	match = resolve(path)
+	object_cache.clear_identity_map()
+	try:
+		return match.func(request, *match.args, **match.kwargs)
+	finally:
+		object_cache.clear_identity_map()
+
+
+def publish_page(path, root=None):
+	"""
+	Publish the page of path to the root directory. A page that is no longer
+	public is removed so the web server passes the request to django.
+	return True if the page was written.
+	"""
+	file_path = page_file(path, root)
+	try:
+		response = render_page(path)
+	except Http404:
+		# The object of page is removed or not published anymore.
+		response = None
+	except Exception:
+		logger.exception('Can not render %s', path)
+		response = None
+
+	if response is not None and response.status_code == 200:
+		write_atomic(file_path, response.content)
+		return True
+	if os.path.exists(file_path):
+		os.unlink(file_path)
+	return False
+
+
+def publish_pages(paths, root=None):
+	"""Publish a list of pages and return the number of written pages."""
+	try:
+		return sum(publish_page(path, root) for path in paths)
+	finally:
+		connection.close()
+
+
+_changes = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _publish_changes():
+	"""Publish changed pages, grouping changes that come close together."""
+	while True:
+		paths = set(_changes.get())
+		time.sleep(PUBLISH_DELAY)
+		while not _changes.empty():
+			paths.update(_changes.get())
+		try:
+			publish_pages(sorted(paths))
+		except Exception:
+			logger.exception('Publishing pages failed')
+
+
+def schedule(paths):
+	"""Publish paths in the background publisher thread of this process."""
+	global _worker
+	if not PUBLISH_ROOT or not paths:
+		return
+	_changes.put(paths)
+	with _worker_lock:
+		if _worker is None:
+			_worker = threading.Thread(target=_publish_changes, daemon=True)
+			_worker.start()
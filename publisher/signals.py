@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+
+from .pages import affected_paths
+from .publish import schedule, PUBLISH_ROOT
+from account.models import User
+from blog.models import Article, Category
+from real_estate.models import Estate, EstateImage, City
+from site_setting.models import SiteSetting, Faq
+
+
+def remember_published(sender, instance, **kwargs):
+	# Read from __dict__ so a deferred field is not loaded.
+	instance._published_before = \
+		instance.__dict__.get('published_status', 'p') == 'p'
+
+
+def publish_affected_pages(sender, instance, update_fields=None, **kwargs):
+	"""Publish the pages of a changed object after its transaction commits."""
+	if not PUBLISH_ROOT:
+		return
+	# Logging in only updates last_login which is not shown on any page.
+	if update_fields and set(update_fields) == {'last_login'}:
+		return
+	paths = affected_paths(instance)
+	if isinstance(instance, Estate):
+		instance._published_before = instance.published_status == 'p'
+	transaction.on_commit(lambda: schedule(paths))
+
+
+post_init.connect(remember_published, sender=Estate)
+
+
+for model in (SiteSetting, Faq, User, Article, Category, Estate, EstateImage, 
+			  City):
+	post_save.connect(publish_affected_pages, sender=model)
+	post_delete.connect(publish_affected_pages, sender=model)
@@ -1,6 +1,9 @@
 from django.contrib import admin
+from django.utils.html import format_html
 
 from .models import City, Estate, EstateImage
+from extensions.admin import FastChangeListMixin, jalali_column, url_format
+from extensions.jalali_filters import JalaliYearFilter, JalaliMonthFilter
 
 
 @admin.register(City)
@@ -13,14 +16,27 @@ class EstateImageInline(admin.StackedInline):
 
 
 @admin.register(Estate)
-class EstateAdmin(admin.ModelAdmin):
+class EstateAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = ('title', 'agent', 'status', 'city', 'published_status', 
                     'size', 'price', 'monthly_rent', 'room', 'year', 'floor', 
-                    'elevator', 'parking', 'warehouse', 'jcreated', 'jupdated',
-                    'link_tag')
-    list_filter = ('created', 'published_status')
+                    'elevator', 'parking', 'warehouse', 'views', 'jcreated', 
+                    'jupdated', 'link_tag')
+    list_filter = (JalaliYearFilter, JalaliMonthFilter, 'published_status')
     list_editable = ('published_status',)
-    search_fields = ('title', 'description', 'city__name', 
-                     'agent__first_name',)
+    list_select_related = ('agent', 'city')
+    # Prefix and exact lookups of indexed columns
+    search_fields = ('=id', '^title', '=city__name', '^agent__first_name', 
+                     '=agent__email')
     raw_id_fields = ('agent',)
     inlines = [EstateImageInline]
+
+    jcreated = jalali_column('created', 'تاریخ ایجاد')
+    jupdated = jalali_column('updated', 'تاریخ ویرایش')
+
+    def link_tag(self, obj):
+        if obj.published_status == 'p':
+            url = url_format('real_estate:estate_detail', 'estate_id')
+            return format_html('<a href="{}">نمایش</a>', url.format(obj.pk))
+        url = url_format('account:estate_preview', 'estate_id')
+        return format_html('<a href="{}">پیش‌نمایش</a>', url.format(obj.pk))
+    link_tag.short_description = "مشاهده ملک"
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class RealEstateConfig(AppConfig):
     name = 'real_estate'
+
+    def ready(self):
+        from . import signals
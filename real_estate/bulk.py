@@ -0,0 +1,132 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from .models import Estate
+from .search import CATALOG, MAX_VALUE
+from counter import utils as counters
+from extensions import object_cache
+from extensions.cache import bump_generation_on_commit, PAGES
+from publisher.pages import affected_estates_paths
+from publisher.publish import schedule, PUBLISH_ROOT
+
+
+# Operations of the agent dashboard on many estates. Every one of them is
+# one UPDATE or DELETE of all chosen estates, and caches are invalidated
+# once per operation instead of by the signals of every estate.
+
+# Estates in review can not be changed by their agent, like EstateUpdate.
+EDITABLE_STATUSES = ('p', 'd', 'b')
+
+
+def _editable(agent_id, ids):
+	return Estate.objects.filter(agent_id=agent_id, id__in=ids, 
+								 published_status__in=EDITABLE_STATUSES)
+
+
+def get_rows(queryset):
+	"""return (id, agent id, published status) of estates."""
+	return list(queryset.values_list('id', 'agent_id', 'published_status'))
+
+
+def invalidate(rows, publish=False):
+	"""
+	Update the counters and caches after the estates of rows changed. rows
+	have the status from before the change. With publish all of them have
+	just been published, otherwise the published ones have been unpublished.
+	"""
+	if not rows:
+		return
+	object_cache.invalidate_all(Estate)
+	bump_generation_on_commit(PAGES)
+	published = [(pk, agent_id) for pk, agent_id, status in rows 
+				 if publish or status == 'p']
+	if not published:
+		return
+
+	sign = 1 if publish else -1
+	counters.increment(counters.ESTATES, sign * len(published))
+	for agent_id, count in Counter(row[1] for row in published).items():
+		counters.increment(counters.agent_estates(agent_id), sign * count, 
+						   shards=1)
+	bump_generation_on_commit(CATALOG)
+
+	from search.warm import schedule_estate_warming
+	from sitemap.builder import schedule_build
+	transaction.on_commit(schedule_estate_warming)
+	transaction.on_commit(schedule_build)
+	if PUBLISH_ROOT:
+		paths = affected_estates_paths(published)
+		transaction.on_commit(lambda: schedule(paths))
+
+
+def submit_for_review(agent_id, ids):
+	"""Send draft and returned estates to review. return the changed count."""
+	with transaction.atomic():
+		queryset = _editable(agent_id, ids).exclude(published_status='p')
+		rows = get_rows(queryset.select_for_update())
+		queryset.filter(id__in=[row[0] for row in rows]).update(
+			published_status='c', update_guide=None, updated=timezone.now()
+		)
+		invalidate(rows)
+	return len(rows)
+
+
+def mark_as_draft(agent_id, ids):
+	"""Make estates draft. return the changed count."""
+	with transaction.atomic():
+		queryset = _editable(agent_id, ids)
+		rows = get_rows(queryset.select_for_update())
+		queryset.filter(id__in=[row[0] for row in rows]).update(
+			published_status='d', update_guide=None, updated=timezone.now()
+		)
+		invalidate(rows)
+	return len(rows)
+
+
+def change_price(agent_id, ids, percent, field='price'):
+	"""
+	Change the price or monthly_rent of estates by percent. Like editing an
+	estate, published and returned estates go to review again and drafts
+	stay draft. return the changed count. Raise ValueError if a new price
+	would be larger than the field allows; then no estate is changed.
+	"""
+	if field not in ('price', 'monthly_rent'):
+		raise ValueError('Invalid price field {}'.format(field))
+	if percent <= -100:
+		raise ValueError('Price can not become zero or negative.')
+	with transaction.atomic():
+		queryset = _editable(agent_id, ids)
+		if field == 'monthly_rent':
+			queryset = queryset.filter(status='r')
+		rows = get_rows(queryset.select_for_update())
+		factor = 1 + percent / 100
+		if queryset.filter(**{field + '__gt': MAX_VALUE / factor}).exists():
+			raise ValueError('Price can not be larger than {}.'.format(
+				MAX_VALUE
+			))
+		queryset.filter(id__in=[row[0] for row in rows]).update(**{
+			field: Round(F(field) * Value(factor), 
+						 output_field=PositiveIntegerField()),
+			'published_status': Case(When(published_status='d', 
+										  then=Value('d')), 
+									 default=Value('c')),
+			'update_guide': None,
+			'updated': timezone.now(),
+		})
+		invalidate(rows)
+	return len(rows)
+
+
+def delete(agent_id, ids):
+	"""
+	Delete estates and their images. The post_delete receivers update the
+	counters and caches of each estate. return the deleted count.
+	"""
+	with transaction.atomic():
+		queryset = Estate.objects.filter(agent_id=agent_id, id__in=ids)
+		deleted = queryset.delete()[1]
+	return deleted.get(Estate._meta.label, 0)
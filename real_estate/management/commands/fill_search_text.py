@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from real_estate.models import Estate
+from real_estate.search import CATALOG
+from extensions.cache import bump_generation
+
+
+class Command(BaseCommand):
+	help = 'Fill the normalized search text of estates.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--chunk-size', type=int, default=500)
+		parser.add_argument('--missing', action='store_true', 
+							help='Only fill estates without a search text.')
+
+	def handle(self, *args, **options):
+		estates = Estate.objects.only('id', 'title', 'description') \
+								.order_by('id')
+		if options['missing']:
+			estates = estates.filter(search_text='')
+
+		size = options['chunk_size']
+		filled = 0
+		last_id = 0
+		while True:
+			# Walk by id so a chunk never loads all estates.
+			chunk = list(estates.filter(id__gt=last_id)[:size])
+			if not chunk:
+				break
+			for estate in chunk:
+				estate.search_text = estate.render_search_text()
+			Estate.objects.bulk_update(chunk, ['search_text'])
+			filled += len(chunk)
+			last_id = chunk[-1].id
+
+		# Cached search results were matched against the old text.
+		bump_generation(CATALOG)
+		self.stdout.write(self.style.SUCCESS(
+			'{} estates filled.'.format(filled)
+		))
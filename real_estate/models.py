@@ -2,10 +2,17 @@ from django.db import models
 from django.urls import reverse
 
 from account.models import User
-from extensions.utils import jalali_converter
+from extensions.fields import JalaliYearMonthField
+from extensions.utils import jalali_converter, normalize_persian
 from django.utils.html import format_html
 
 
+# Fields loaded for the rows of the estate table of the agent dashboard.
+DASHBOARD_FIELDS = ('id', 'title', 'main_image', 'status', 'price', 
+					'monthly_rent', 'published_status', 'created', 'views', 
+					'update_guide', 'agent_id', 'city__id', 'city__name')
+
+
 class PublishedManager(models.Manager):
 	"""A manager that return all active objects."""
 	def get_queryset(self):
@@ -63,14 +70,49 @@ class Estate(models.Model):
 	created = models.DateTimeField(auto_now_add=True, 
 								   verbose_name='تاریخ ایجاد')
 	updated = models.DateTimeField(auto_now=True, verbose_name='تاریخ ویرایش')
+	jalali_year_month = JalaliYearMonthField(source='created', 
+											 verbose_name='ماه ایجاد')
 	update_guide = models.TextField(verbose_name='راهنمای به‌روزرسانی', 
 									null=True, blank=True)
+	views = models.PositiveIntegerField(default=0, editable=False, 
+										verbose_name='تعداد بازدید')
+	# Moderator reviewing the estate, see moderation.queue
+	claimed_by = models.ForeignKey(to=User, null=True, blank=True, 
+								   editable=False, on_delete=models.SET_NULL, 
+								   related_name='+', 
+								   verbose_name='بررسی کننده')
+	claimed_until = models.DateTimeField(null=True, blank=True, 
+										 editable=False, 
+										 verbose_name='مهلت بررسی')
+	# Normalized title and description matched by the estate search.
+	search_text = models.TextField(default='', editable=False, 
+								   verbose_name='متن جستجو')
 
 	objects = models.Manager()
 	published = PublishedManager()
 
 	class Meta:
 		ordering = ('-created',)
+		indexes = [
+			# Published lists and feeds, newest first, of all or one city.
+			models.Index(fields=['published_status', 'created']),
+			models.Index(fields=['published_status', 'city', 'created']),
+			# Most viewed published estates.
+			models.Index(fields=['published_status', 'views']),
+			# Search by type and a price or size range, of all or one city.
+			# Ranges of room and year are filtered on the rows of these.
+			models.Index(fields=['published_status', 'status', 'price']),
+			models.Index(fields=['published_status', 'city', 'status', 
+								 'price']),
+			models.Index(fields=['published_status', 'status', 'size']),
+			# Dashboard lists of an agent, all and by status.
+			models.Index(fields=['agent', 'published_status', 'created']),
+			models.Index(fields=['agent', 'created']),
+			# Moderation queue
+			models.Index(fields=['published_status', 'claimed_until']),
+			# Admin search
+			models.Index(fields=['title']),
+		]
 		verbose_name = "ملک"
 		verbose_name_plural = "املاک"
 
@@ -90,6 +132,14 @@ class Estate(models.Model):
 		if self.published_status != 'b':
 			self.update_guide = None
 
+		# Deferred title and description are not changed, so their search 
+		# text is not either.
+		if 'title' in self.__dict__ or 'description' in self.__dict__:
+			self.search_text = self.render_search_text()
+			update_fields = kwargs.get('update_fields')
+			if update_fields is not None:
+				kwargs['update_fields'] = set(update_fields) | {'search_text'}
+
 		super(Estate, self).save(*args, **kwargs)
 
 		# Resize article image
@@ -98,6 +148,10 @@ class Estate(models.Model):
 		main_image = main_image.resize((850, 550))
 		main_image.save(self.main_image.path)
 
+	def render_search_text(self):
+		"""return the normalized text of the estate matched by searches."""
+		return normalize_persian('{} {}'.format(self.title, self.description))
+
 	def jcreated(self):
 		"""return the created in jalali date."""	
 		return jalali_converter(self.created)
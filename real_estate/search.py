@@ -0,0 +1,184 @@
+import hashlib
+
+from django.conf import settings
+from django.db.models import Max
+
+from .models import Estate, City
+from extensions.cache import get_generation, get_generations, get_or_fill
+from extensions.utils import normalize_persian
+
+
+# Name of the cache generation of published estates. It is bumped whenever a
+# published estate changes so all cached search results are dropped.
+CATALOG = 'estate_catalog'
+
+# Name of the cache generation of cities.
+CITIES = 'cities'
+
+# Seconds that cached search results are fresh. Stale results are kept for a
+# day and served while one worker refreshes them.
+RESULT_CACHE_TIMEOUT = getattr(settings, 'ESTATE_SEARCH_CACHE_TIMEOUT',
+							   60 * 60)
+STALE_TIMEOUT = 24 * 60 * 60
+
+# Number of ids of a search that are cached. A cache entry must stay far below
+# the 1 MB item limit of memcached, whatever the number of matched estates.
+CACHED_RESULTS = getattr(settings, 'ESTATE_SEARCH_CACHED_RESULTS', 600)
+
+# Largest value of a PositiveIntegerField
+MAX_VALUE = 2147483647
+
+
+def _to_int(value):
+	"""return value as a non-negative integer or None if it is not valid."""
+	try:
+		return min(max(int(value), 0), MAX_VALUE)
+	except (TypeError, ValueError):
+		return None
+
+
+class EstateSearchQuery():
+	"""
+	A validated and canonical form of the estate search form. Two searches
+	that return the same estates have the same key, whatever the order or
+	formatting of their parameters.
+	"""
+	RANGES = ('year', 'size', 'price', 'room')
+	FLAGS = ('elevator', 'parking', 'warehouse')
+	STATUSES = ('s', 'r')
+	SORTS = ('views',)
+
+	def __init__(self, ranges=None, text='', status='', cities=(),
+				 agent=None, flags=(), sort=''):
+		self.ranges = tuple(sorted((ranges or {}).items()))
+		self.text = normalize_persian(text)
+		self.status = status if status in self.STATUSES else ''
+		self.cities = tuple(sorted(set(cities)))
+		self.agent = agent
+		self.flags = tuple(sorted(set(flags) & set(self.FLAGS)))
+		self.sort = sort if sort in self.SORTS else ''
+
+	@classmethod
+	def from_request(cls, request, agent_id=None, city_id=None):
+		"""
+		Build the query from the request parameters and the city or agent of
+		the url. Missing or invalid parameters are ignored.
+		"""
+		keys = request.GET
+		cities = [city_id] if city_id else []
+		query = {'agent': agent_id, 'sort': keys.get('sort', '')}
+		if keys.get('search'):
+			ranges = {}
+			for field in cls.RANGES:
+				low = _to_int(keys.get(field + '_from'))
+				high = _to_int(keys.get(field + '_to'))
+				if low is not None and high is not None and low > high:
+					low, high = high, low
+				if low is not None or high is not None:
+					ranges[field] = (low, high)
+			city = _to_int(keys.get('city'))
+			if city:
+				cities.append(city)
+			query.update({
+				'ranges': ranges,
+				'text': keys.get('text', ''),
+				'status': keys.get('status', ''),
+				'flags': [flag for flag in cls.FLAGS if keys.get(flag)],
+			})
+		return cls(cities=cities, **query)
+
+	def canonical(self):
+		return (self.ranges, self.text, self.status, self.cities, self.agent,
+				self.flags, self.sort)
+
+	def key(self):
+		"""return a short cache key of the canonical form."""
+		return hashlib.md5(repr(self.canonical()).encode()).hexdigest()
+
+	def filter(self, estates):
+		"""Apply the query to a queryset of estates."""
+		for field, (low, high) in self.ranges:
+			if low is not None:
+				estates = estates.filter(**{field + '__gte': low})
+			if high is not None:
+				estates = estates.filter(**{field + '__lte': high})
+		if self.text:
+			# Matched against the normalized copy of title and description.
+			estates = estates.filter(search_text__contains=self.text)
+		if self.status:
+			estates = estates.filter(status=self.status)
+		if len(self.cities) > 1:
+			# An estate can not be in two different cities.
+			return estates.none()
+		if self.cities:
+			estates = estates.filter(city_id=self.cities[0])
+		if self.agent:
+			estates = estates.filter(agent_id=self.agent)
+		for flag in self.flags:
+			estates = estates.filter(**{flag: True})
+		if self.sort == 'views':
+			estates = estates.order_by('-views', '-created')
+		return estates
+
+
+class EstateIds():
+	"""
+	The ordered ids of published estates matching a query, sliced like a
+	list so it can be paginated. Ids of the first pages and the total count
+	are cached until a published estate changes. Deeper pages, which are
+	rarely read, are fetched from the database.
+	"""
+	def __init__(self, query):
+		self.query = query
+		self.window = get_or_fill(
+			'estate_ids:' + query.key(), self.fill, RESULT_CACHE_TIMEOUT, 
+			STALE_TIMEOUT, generation=get_generation(CATALOG)
+		)
+
+	def estates(self):
+		return self.query.filter(Estate.published.all())
+
+	def fill(self):
+		ids = list(self.estates().values_list('id', flat=True)
+								 [:CACHED_RESULTS + 1])
+		count = len(ids)
+		if count > CACHED_RESULTS:
+			count = self.estates().count()
+		return {'ids': ids[:CACHED_RESULTS], 'count': count}
+
+	def __len__(self):
+		return self.window['count']
+
+	def __getitem__(self, index):
+		stop = index.stop if isinstance(index, slice) else index + 1
+		if stop is None or stop > CACHED_RESULTS:
+			ids = self.estates().values_list('id', flat=True)[index]
+			return list(ids) if isinstance(index, slice) else ids
+		return self.window['ids'][index]
+
+
+def get_estate_ids(query):
+	"""return the ids of published estates matching the query."""
+	return EstateIds(query)
+
+
+def get_search_form_context():
+	"""
+	return the maximum price, size and room of published estates and the
+	list of cities to render the estate search form.
+	"""
+	def fill():
+		bounds = Estate.published.aggregate(
+			max_price=Max('price'), max_size=Max('size'), max_room=Max('room')
+		)
+		return {
+			'max_price': bounds['max_price'] or 1000000,
+			'max_size': bounds['max_size'] or 1000,
+			'max_room': bounds['max_room'] or 10,
+			'cities': list(City.objects.all()),
+		}
+
+	return get_or_fill(
+		'fragment:estate_search_form', fill, RESULT_CACHE_TIMEOUT, 
+		STALE_TIMEOUT, generation=get_generations(CATALOG, CITIES)
+	)
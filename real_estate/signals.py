@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Estate, EstateImage, City
+from .search import CATALOG, CITIES
+from extensions.cache import bump_generation_on_commit
+from extensions import object_cache
+
+
+object_cache.register(
+	Estate, lambda: Estate.objects.select_related('agent', 'city')
+								   .prefetch_related('images')
+)
+
+
+@receiver(post_init, sender=Estate)
+def remember_published_status(sender, instance, **kwargs):
+	# Read from __dict__ so a deferred field is not loaded.
+	instance._was_published = \
+		instance.__dict__.get('published_status', 'p') == 'p'
+
+
+@receiver(post_save, sender=Estate)
+@receiver(post_delete, sender=Estate)
+def invalidate_search_results(sender, instance, **kwargs):
+	"""Drop cached search results when a published estate changes."""
+	if instance._was_published or instance.published_status == 'p':
+		bump_generation_on_commit(CATALOG)
+		from search.warm import schedule_estate_warming
+		transaction.on_commit(schedule_estate_warming)
+	instance._was_published = instance.published_status == 'p'
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+def invalidate_cities(sender, instance, **kwargs):
+	bump_generation_on_commit(CITIES)
+
+
+@receiver(post_save, sender=Estate)
+@receiver(post_delete, sender=Estate)
+def invalidate_cached_estate(sender, instance, **kwargs):
+	object_cache.invalidate(Estate, instance.pk)
+
+
+@receiver(post_save, sender=EstateImage)
+@receiver(post_delete, sender=EstateImage)
+def invalidate_cached_estate_images(sender, instance, **kwargs):
+	object_cache.invalidate(Estate, instance.estate_id)
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+def invalidate_cached_estates(sender, instance, **kwargs):
+	object_cache.invalidate_all(Estate)
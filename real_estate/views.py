@@ -1,11 +1,21 @@
+import time
+
+from django.http import Http404
 from django.shortcuts import render, get_object_or_404
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Q
+from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 
 from .models import Estate, City
+from .search import (
+	EstateSearchQuery, get_estate_ids, get_search_form_context
+)
 from site_setting.models import SiteSetting
 from account.models import User
+from counter.hits import record_hit
+from extensions import object_cache
+from extensions.cache import cache_page_swr
+from search.log import log_search
 
 
 class EstateList(TemplateView):
@@ -14,46 +24,24 @@ class EstateList(TemplateView):
 	This view also handle the search and filters objects by given search keys.
 	"""
 	def get(self, request, agent_id=None, city_id=None, *args, **kwargs):
-		estates = Estate.published.select_related('agent', 'city')
-
+		started = time.perf_counter()
 		search = request.GET.get('search', None)
-		if search:
-			keys = request.GET
-			estates = estates.filter(
-				year__gte=keys['year_from'], year__lte=keys['year_to'], 
-				size__gte=keys['size_from'], size__lte=keys['size_to'],
-				price__gte=keys['price_from'], price__lte=keys['price_to'],
-				room__gte=keys['room_from'], room__lte=keys['room_to']
-			)
-			if keys['text']:
-				estates = estates.filter(
-					Q(title__contains=keys['text']) | 
-					Q(description__contains=keys['text'])
-				)
-			if keys['status']:
-				estates = estates.filter(status=keys['status'])
-			if keys['city']:
-				estates = estates.filter(city=keys['city'])
-			if keys['elevator']:
-				estates = estates.filter(elevator=True)
-			if keys['parking']:
-				estates = estates.filter(parking=True)
-			if keys['warehouse']:
-				estates = estates.filter(warehouse=True)
-
-		# Filter estates by requested agent
+
+		# Check the requested agent
 		agent = None
 		if agent_id:
 			agent = get_object_or_404(User.active.all(), id=agent_id)
-			estates = estates.filter(agent=agent)
 
-		# Filter estates by requested city
-		city = None
+		# Check the requested city
 		if city_id:
-			city = get_object_or_404(City.objects.all(), id=city_id)
-			estates = estates.filter(city=city)	
+			get_object_or_404(City.objects.all(), id=city_id)
 
-		paginator = Paginator(estates, 6)
+		# Ids of the first pages of matched estates are cached by the canonical
+		# form of search.
+		query = EstateSearchQuery.from_request(request, agent_id, city_id)
+		estate_ids = get_estate_ids(query)
+
+		paginator = Paginator(estate_ids, 6)
 		page = request.GET.get('page', None)
 		try:
 			estates = paginator.page(page)
@@ -64,44 +52,45 @@ class EstateList(TemplateView):
 			# if page is out of range deliver last page of results
 			estates = paginator.page(paginator.num_pages)	
 
+		# Fetch only the estates of current page
+		page_estates = Estate.published.select_related('agent', 'city') \
+									   .in_bulk(estates.object_list)
+		estates.object_list = [page_estates[estate_id] for estate_id in 
+							   estates.object_list if estate_id in page_estates]
+
+		log_search('estate', request, paginator.count, 
+				   time.perf_counter() - started)
+
 		# Some settings of site such as footer context and ...
 		site_setting = SiteSetting.objects.filter(is_active=True)
 		if site_setting:
 			site_setting = site_setting[0] 
 
-		# Get maximum amount of price, size and room to render search form in 
-		# template.
-		obj = Estate.published.all()
-		if obj:
-			max_price = obj.order_by('-price')[0].price
-			max_size = obj.order_by('-size')[0].size
-			max_room = obj.order_by('-room')[0].room
-		else:
-			max_price = 1000000
-			max_size = 1000
-			max_room = 10
-
-		cities = City.objects.all()
+		# Maximum price, size and room and the cities of search form
+		search_form = get_search_form_context()
 
 		return render(request, 'real_estate/estate_list.html',
 					{'estates': estates, 
 					'site_setting': site_setting,
 					'agent': agent,
 					'search': search,
-					'max_price':max_price, 
-					'max_size': max_size, 
-					'max_room': max_room,
-					'cities': cities})
+					**search_form})
+
+
+def count_view(request, estate_id):
+	record_hit(request, Estate, estate_id)
 
 
+@method_decorator(
+	cache_page_swr(60, 24 * 60 * 60, on_request=count_view), 
+	name='dispatch'
+)
 class EstateDetail(TemplateView):
 	"""Retrieve an estate by id and raise a 404 error if not found."""	
 	def get(self, request, estate_id, *args, **kwargs):
-		estate = get_object_or_404(
-			Estate.published.select_related('agent', 'city')
-							.prefetch_related('images'), 
-							id=estate_id
-		)
+		estate = object_cache.get_object_or_404(Estate, estate_id)
+		if estate.published_status != 'p':
+			raise Http404
 
 		# Last 3 published estates except current estate.
 		latest_estates = Estate.published.all().exclude(id=estate.id)[:3]
@@ -111,25 +100,11 @@ class EstateDetail(TemplateView):
 		if site_setting:
 			site_setting = site_setting[0] 
 
-		# Get maximum amount of price, size and room to render search form in 
-		# template.
-		obj = Estate.published.all()
-		if obj:
-			max_price = obj.order_by('-price')[0].price
-			max_size = obj.order_by('-size')[0].size
-			max_room = obj.order_by('-room')[0].room
-		else:
-			max_price = 1000000
-			max_size = 1000
-			max_room = 10
-			
-		cities = City.objects.all()
+		# Maximum price, size and room and the cities of search form
+		search_form = get_search_form_context()
 
 		return render(request, 'real_estate/estate_detail.html',
 					{'estate': estate, 
 					'latest_estates': latest_estates,
 					'site_setting': site_setting,
-					'max_price': max_price, 
-					'max_size': max_size, 
-					'max_room': max_room,
-					'cities': cities})
+					**search_form})
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import Rollup
+
+
+@admin.register(Rollup)
+class RollupAdmin(admin.ModelAdmin):
+    list_display = ('period', 'key', 'metric', 'city_key', 'status', 'count', 
+                    'amount')
+    list_filter = ('period', 'metric')
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from reports.rollups import rebuild
+
+
+class Command(BaseCommand):
+	help = 'Compute the daily, monthly and yearly report rollups again.'
+
+	def handle(self, *args, **options):
+		count = rebuild()
+		self.stdout.write(self.style.SUCCESS(
+			'{} rollup rows written.'.format(count)
+		))
@@ -0,0 +1,34 @@
+from django.db import models
+
+
+class Rollup(models.Model):
+	"""
+	Total of a metric in one Jalali day, month or year, optionally split by
+	city and status of estates. Rows are updated when the counted objects
+	are created, so reports never scan the source tables.
+	"""
+	PERIOD_CHOICES = (
+		('d', 'روز'),
+		('m', 'ماه'),
+		('y', 'سال'),
+	)
+	period = models.CharField(max_length=1, choices=PERIOD_CHOICES, 
+							  verbose_name='دوره')
+	# yyyymmdd, yyyymm or yyyy of the Jalali period
+	key = models.PositiveIntegerField(verbose_name='کلید دوره')
+	metric = models.CharField(max_length=30, verbose_name='شاخص')
+	# 0 and '' for rows that are not split by city and status
+	city_key = models.PositiveIntegerField(default=0, verbose_name='شهر')
+	status = models.CharField(max_length=1, blank=True, default='', 
+							  verbose_name='نوع')
+	count = models.IntegerField(default=0, verbose_name='تعداد')
+	amount = models.BigIntegerField(default=0, verbose_name='مبلغ')
+
+	class Meta:
+		unique_together = ('period', 'key', 'metric', 'city_key', 'status')
+		ordering = ('period', 'key', 'metric')
+		verbose_name = "آمار دوره‌ای"
+		verbose_name_plural = "آمار دوره‌ای"
+
+	def __str__(self):
+		return f"{self.metric} - {self.key}"
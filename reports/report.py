@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+from .models import Rollup
+from .rollups import ESTATES, AGENTS, SUBSCRIPTIONS
+from extensions.jalali_calendar import (MONTH_NAMES, month_label, 
+										to_persian_digits)
+from real_estate.models import City, Estate
+
+
+def key_range(level, start, end):
+	"""
+	return the first and last rollup keys of a level from the (year, month)
+	periods start and end. month may be None for a whole year.
+	"""
+	(start_year, start_month), (end_year, end_month) = start, end
+	if level == 'y':
+		return start_year, end_year
+	first = start_year * 100 + (start_month or 1)
+	last = end_year * 100 + (end_month or 12)
+	if level == 'm':
+		return first, last
+	return first * 100 + 1, last * 100 + 31
+
+
+def key_label(level, key):
+	if level == 'y':
+		return to_persian_digits(key)
+	if level == 'm':
+		return month_label(key)
+	year_month, day = divmod(key, 100)
+	year, month = divmod(year_month, 100)
+	return to_persian_digits('{} {} {}'.format(day, MONTH_NAMES[month - 1], 
+											   year))
+
+
+def build_report(level, start, end):
+	"""
+	return the columns and rows of the report of periods of a level from
+	start to end. Only the rollup rows of the periods are read.
+	"""
+	first, last = key_range(level, start, end)
+	rollups = Rollup.objects.filter(period=level, key__gte=first, 
+									key__lte=last)
+	statuses = OrderedDict(Estate.STATUS_CHOICES)
+	rows = OrderedDict()
+	city_keys = set()
+	for rollup in rollups.order_by('key').iterator():
+		row = rows.setdefault(rollup.key, {'cities': {}})
+		if rollup.metric == ESTATES and rollup.city_key:
+			row['cities'][rollup.city_key] = \
+				row['cities'].get(rollup.city_key, 0) + rollup.count
+			row[rollup.status] = row.get(rollup.status, 0) + rollup.count
+			city_keys.add(rollup.city_key)
+		elif not rollup.city_key and not rollup.status:
+			row[rollup.metric] = rollup.count
+			if rollup.metric == SUBSCRIPTIONS:
+				row['revenue'] = rollup.amount
+
+	cities = list(City.objects.filter(id__in=city_keys).order_by('name'))
+	columns = ['دوره', 'املاک جدید'] + list(statuses.values()) + \
+			  ['نمایندگان جدید', 'اشتراک‌های فروخته شده', 'درآمد'] + \
+			  [city.name for city in cities]
+	table = [
+		[key_label(level, key), row.get(ESTATES, 0)] + 
+		[row.get(status, 0) for status in statuses] + 
+		[row.get(AGENTS, 0), row.get(SUBSCRIPTIONS, 0), row.get('revenue', 0)] +
+		[row['cities'].get(city.id, 0) for city in cities]
+		for key, row in rows.items()
+	]
+	return columns, table
@@ -0,0 +1,96 @@
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Rollup
+from account.models import User
+from extensions.jalali_calendar import to_jalali
+from real_estate.models import Estate
+from subscription.models import Subscription
+
+
+# Names of metrics
+ESTATES = 'estates'
+AGENTS = 'agents'
+SUBSCRIPTIONS = 'subscriptions'
+
+
+def period_keys(time):
+	"""return the (period, key) of the Jalali day, month and year of time."""
+	year, month, day = to_jalali(timezone.localtime(time).date())
+	return (('d', (year * 100 + month) * 100 + day), 
+			('m', year * 100 + month), 
+			('y', year))
+
+
+def _add(period, key, metric, city_key, status, count, amount):
+	rows = Rollup.objects.filter(period=period, key=key, metric=metric, 
+								 city_key=city_key, status=status)
+	if rows.update(count=F('count') + count, amount=F('amount') + amount):
+		return
+	try:
+		with transaction.atomic():
+			Rollup.objects.create(period=period, key=key, metric=metric, 
+								  city_key=city_key, status=status, 
+								  count=count, amount=amount)
+	except IntegrityError:
+		# Another process created the row at the same time.
+		rows.update(count=F('count') + count, amount=F('amount') + amount)
+
+
+def record(metric, time, count=1, amount=0, city_key=0, status=''):
+	"""
+	Add count and amount to the day, month and year of time. Split rows are
+	also added to the total of metric, so totals are read from one row.
+	"""
+	for period, key in period_keys(time):
+		_add(period, key, metric, 0, '', count, amount)
+		if city_key or status:
+			_add(period, key, metric, city_key, status, count, amount)
+
+
+def _rows(metric, items):
+	"""
+	return Rollup objects of all periods from (time, city_key, status,
+	amount) items.
+	"""
+	totals = defaultdict(lambda: [0, 0])
+	for time, city_key, status, amount in items:
+		for period, key in period_keys(time):
+			dimensions = {(0, '')}
+			if city_key or status:
+				dimensions.add((city_key, status))
+			for dimension in dimensions:
+				total = totals[(period, key) + dimension]
+				total[0] += 1
+				total[1] += amount
+	return [
+		Rollup(period=period, key=key, metric=metric, city_key=city_key, 
+			   status=status, count=count, amount=amount)
+		for (period, key, city_key, status), (count, amount) in totals.items()
+	]
+
+
+def rebuild():
+	"""
+	Compute all rollups again from the source tables. return the number of
+	rows.
+	"""
+	rows = _rows(ESTATES, (
+		(created, city_id, status, 0) for created, city_id, status in
+		Estate.objects.values_list('created', 'city_id', 'status').iterator()
+	))
+	rows += _rows(AGENTS, (
+		(joined, 0, '', 0) for joined in
+		User.objects.values_list('date_joined', flat=True).iterator()
+	))
+	rows += _rows(SUBSCRIPTIONS, (
+		(created, 0, '', price) for created, price in
+		Subscription.objects.values_list('created', 'price').iterator()
+	))
+	with transaction.atomic():
+		Rollup.objects.all().delete()
+		Rollup.objects.bulk_create(rows, batch_size=1000)
+	return len(rows)
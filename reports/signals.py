@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from . import rollups
+from account.models import User
+from real_estate.models import Estate
+from subscription.models import Subscription
+
+
+@receiver(post_save, sender=Estate)
+def count_new_estate(sender, instance, created, **kwargs):
+	if created:
+		rollups.record(rollups.ESTATES, instance.created, 
+					   city_key=instance.city_id, status=instance.status)
+
+
+@receiver(post_save, sender=User)
+def count_new_agent(sender, instance, created, **kwargs):
+	if created:
+		rollups.record(rollups.AGENTS, instance.date_joined)
+
+
+@receiver(post_save, sender=Subscription)
+def count_new_subscription(sender, instance, created, **kwargs):
+	if created:
+		rollups.record(rollups.SUBSCRIPTIONS, instance.created, 
+					   amount=instance.price)
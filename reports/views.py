@@ -0,0 +1,56 @@
+import csv
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.generic import TemplateView
+
+from .report import build_report
+from extensions.jalali_calendar import parse_period, to_jalali
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class ReportView(TemplateView):
+	"""
+	Show the Jalali daily, monthly or yearly report of new estates, agents 
+	and subscriptions between two periods, or export it as CSV.
+	"""
+	def get(self, request, *args, **kwargs):
+		level = request.GET.get('period', 'm')
+		if level not in ('d', 'm', 'y'):
+			level = 'm'
+
+		# The current Jalali year by default
+		this_year = to_jalali(timezone.localtime().date())[0]
+		periods = []
+		errors = []
+		for name, default in (('from', (this_year, None)), 
+							  ('to', (this_year, None))):
+			try:
+				periods.append(parse_period(request.GET[name]))
+			except KeyError:
+				periods.append(default)
+			except ValueError:
+				errors.append(name)
+				periods.append(default)
+
+		columns, rows = build_report(level, *periods)
+
+		if request.GET.get('format') == 'csv':
+			response = HttpResponse(content_type='text/csv; charset=utf-8')
+			response['Content-Disposition'] = \
+				'attachment; filename="report.csv"'
+			# Byte order mark, so spreadsheet programs read it as UTF-8
+			response.write('\ufeff')
+			writer = csv.writer(response)
+			writer.writerow(columns)
+			writer.writerows(rows)
+			return response
+
+		return render(request, 'reports/report.html',
+					{'columns': columns,
+					'rows': rows,
+					'period': level,
+					'errors': errors})
@@ -0,0 +1,127 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from django.conf import settings
+from django.utils import timezone
+
+
+LOG_FILE = getattr(settings, 'SEARCH_LOG_FILE',
+				   os.path.join(settings.BASE_DIR, 'logs', 'search.log'))
+MAX_BYTES = getattr(settings, 'SEARCH_LOG_MAX_BYTES', 10 * 1024 * 1024)
+BACKUP_COUNT = getattr(settings, 'SEARCH_LOG_BACKUP_COUNT', 5)
+
+# Query string keys that only change presentation and are not part of a search.
+IGNORED_KEYS = ('page', 'sort')
+
+_logger = None
+_lock = threading.Lock()
+
+
+def _get_logger():
+	"""
+	Create the search logger on first use. Records are put on a queue by the
+	request and written to a rotated file by a background listener thread.
+	"""
+	global _logger
+	with _lock:
+		if _logger is None:
+			os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+			file_handler = RotatingFileHandler(
+				LOG_FILE, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT,
+				encoding='utf-8'
+			)
+			records = queue.SimpleQueue()
+			listener = QueueListener(records, file_handler)
+			listener.start()
+			atexit.register(listener.stop)
+
+			logger = logging.getLogger('homeo.search')
+			logger.setLevel(logging.INFO)
+			logger.propagate = False
+			logger.addHandler(QueueHandler(records))
+			_logger = logger
+	return _logger
+
+
+def normalize_filters(query_dict):
+	"""
+	return the search filters of a query string as a sorted tuple of
+	(key, value) pairs. Empty values and presentation keys are dropped.
+	"""
+	filters = []
+	for key in query_dict:
+		if key in IGNORED_KEYS:
+			continue
+		value = ' '.join(query_dict.get(key, '').split()).lower()
+		if value:
+			filters.append((key, value))
+	return tuple(sorted(filters))
+
+
+def log_search(kind, request, result_count, latency):
+	"""
+	Log a search of the kind ('estate' or 'article') with its normalized
+	filters, number of results and latency in seconds. Searches replayed by
+	search.warm are not logged, so they do not count as popular again.
+	"""
+	if getattr(request, 'warming', False):
+		return
+	filters = normalize_filters(request.GET)
+	if not filters:
+		return
+	record = {
+		'time': timezone.now().isoformat(),
+		'kind': kind,
+		'path': request.path,
+		'filters': filters,
+		'results': result_count,
+		'latency': round(latency * 1000, 2),
+	}
+	_get_logger().info(json.dumps(record, ensure_ascii=False))
+
+
+def read_log():
+	"""Yield the records of the search log and its rotated files."""
+	for path in sorted(glob.glob(LOG_FILE + '*')):
+		with open(path, encoding='utf-8') as log_file:
+			for line in log_file:
+				try:
+					record = json.loads(line)
+				except ValueError:
+					continue
+				record['filters'] = tuple(map(tuple, record['filters']))
+				yield record
+
+
+def popular_searches(limit=20, kind=None, shapes=False):
+	"""
+	Aggregate the search log and return the top searches as a list of
+	dictionaries sorted by number of hits. If shapes is True searches are
+	grouped by the set of filter keys instead of the exact filters.
+	"""
+	stats = {}
+	for record in read_log():
+		if kind and record['kind'] != kind:
+			continue
+		if shapes:
+			filters = tuple((key, '*') for key, value in record['filters'])
+		else:
+			filters = record['filters']
+		group = (record['kind'], record['path'], filters)
+		hits, results, latency = stats.get(group, (0, 0, 0))
+		stats[group] = (hits + 1, results + record['results'], 
+						latency + record['latency'])
+
+	top = sorted(stats.items(), key=lambda item: item[1][0], reverse=True)
+	return [
+		{'kind': group[0], 'path': group[1], 'filters': group[2], 
+		 'hits': hits, 'avg_results': results / hits, 
+		 'avg_latency': latency / hits}
+		for group, (hits, results, latency) in top[:limit]
+	]
@@ -0,0 +1,36 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from search.log import popular_searches
+
+
+class Command(BaseCommand):
+	help = 'Aggregate the search log and print the most common searches.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--limit', type=int, default=20)
+		parser.add_argument('--kind', choices=['estate', 'article'])
+		parser.add_argument(
+			'--shapes', action='store_true',
+			help='Group searches by filter keys instead of exact values.'
+		)
+		parser.add_argument(
+			'--output', help='Write the result as JSON to this file.'
+		)
+
+	def handle(self, *args, **options):
+		searches = popular_searches(
+			options['limit'], options['kind'], options['shapes']
+		)
+		if options['output']:
+			with open(options['output'], 'w', encoding='utf-8') as output:
+				json.dump(searches, output, ensure_ascii=False, indent=2)
+
+		for search in searches:
+			filters = '&'.join('{}={}'.format(*pair) 
+							   for pair in search['filters'])
+			self.stdout.write('{:>7} {:>9.1f}ms {:>8.1f} {}?{}'.format(
+				search['hits'], search['avg_latency'], search['avg_results'],
+				search['path'], filters
+			))
@@ -0,0 +1,29 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from search.log import popular_searches
+from search.warm import warm_searches
+
+
+class Command(BaseCommand):
+	help = 'Fill the caches with results of the most common searches.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--limit', type=int, default=50)
+		parser.add_argument(
+			'--input', 
+			help='Read the searches from a file written by top_searches.'
+		)
+
+	def handle(self, *args, **options):
+		if options['input']:
+			with open(options['input'], encoding='utf-8') as searches_file:
+				searches = json.load(searches_file)[:options['limit']]
+		else:
+			searches = popular_searches(options['limit'])
+
+		warmed = warm_searches(searches)
+		self.stdout.write(
+			self.style.SUCCESS('{} searches warmed.'.format(warmed))
+		)
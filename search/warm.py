@@ -0,0 +1,86 @@
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import resolve, Resolver404
+
+from .log import popular_searches
+
+
+# Seconds to wait after a change of estates before warming the search results,
+# so a burst of changes is followed by only one warming.
+WARM_DELAY = getattr(settings, 'SEARCH_WARM_DELAY', 10)
+
+
+def warm_searches(searches):
+	"""
+	Replay searches through their list views as an anonymous visitor so every
+	cache on the way is filled. return the number of replayed searches.
+	"""
+	factory = RequestFactory()
+	warmed = 0
+	for search in searches:
+		try:
+			match = resolve(search['path'])
+		except Resolver404:
+			continue
+		request = factory.get(search['path'], dict(search['filters']))
+		request.user = AnonymousUser()
+		request.session = SessionStore()
+		request.warming = True
+		match.func(request, *match.args, **match.kwargs)
+		warmed += 1
+	return warmed
+
+
+def warm_popular_searches(limit=50):
+	"""Replay the most common searches of the search log."""
+	return warm_searches(popular_searches(limit))
+
+
+def warm_estate_results(limit=50):
+	"""
+	Fill the result cache of the most common estate searches without
+	rendering their pages. return the number of warmed searches.
+	"""
+	from real_estate.search import EstateSearchQuery, get_estate_ids
+	# Reading the whole log on every change is slow, so keep the list.
+	searches = cache.get('search:popular_estates')
+	if searches is None:
+		searches = popular_searches(limit, kind='estate')
+		cache.set('search:popular_estates', searches, 60 * 60)
+
+	factory = RequestFactory()
+	warmed = 0
+	for search in searches:
+		try:
+			match = resolve(search['path'])
+		except Resolver404:
+			continue
+		request = factory.get(search['path'], dict(search['filters']))
+		get_estate_ids(EstateSearchQuery.from_request(request, **match.kwargs))
+		warmed += 1
+	return warmed
+
+
+def _delayed_warm():
+	try:
+		warm_estate_results()
+	finally:
+		connection.close()
+
+
+def schedule_estate_warming():
+	"""
+	Warm the estate search results in a background thread after WARM_DELAY
+	seconds. Only one warming is scheduled per delay across all workers.
+	"""
+	if not cache.add('search:estate_warming', 1, WARM_DELAY):
+		return
+	timer = threading.Timer(WARM_DELAY, _delayed_warm)
+	timer.daemon = True
+	timer.start()
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from .models import SiteSetting, Faq
+from extensions.admin import FastChangeListMixin, jalali_column
 
 
 @admin.register(SiteSetting)
@@ -11,6 +12,10 @@ class SiteSettingAdmin(admin.ModelAdmin):
 
 
 @admin.register(Faq)
-class FaqAdmin(admin.ModelAdmin):
+class FaqAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = ['title', 'description', 'jcreated', 'jupdated']
-    search_fields = ('title', 'description')
+    # Prefix lookups of an indexed column
+    search_fields = ('^title',)
+
+    jcreated = jalali_column('created', 'تاریخ ایجاد')
+    jupdated = jalali_column('updated', 'تاریخ ویرایش')
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class SiteSettingConfig(AppConfig):
     name = 'site_setting'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,140 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from extensions import jalali
+from extensions.jalali_calendar import (format_date, format_dates, 
+                                        _format_day, _from_ordinal, 
+                                        to_jalali, to_gregorian, month_days, 
+                                        FIRST_YEAR, LAST_YEAR)
+
+
+def reference_converter(time, detail=None):
+    """The previous implementation of extensions.utils.jalali_converter"""
+    jmonth = ["فروردین", "اردیبهشت", "خرداد", "تیر", "مرداد", "شهریور", 
+              "مهر", "آبان", "آذر", "دی", "بهمن", "اسفند"]
+    numbers = {"0": "۰", "1": "۱", "2": "۲", "3": "۳", "4": "۴", "5": "۵", 
+               "6": "۶", "7": "۷", "8": "۸", "9": "۹"}
+
+    time = timezone.localtime(time)
+    time_to_str = "{},{},{}".format(time.year, time.month, time.day)
+    time_to_list = list(jalali.Gregorian(time_to_str).persian_tuple())
+    time_to_list[1] = jmonth[time_to_list[1] - 1]
+    if detail:
+        output = "{} {} {}, ساعت {}:{}".format(
+            time_to_list[2], time_to_list[1], time_to_list[0], time.hour, 
+            time.minute
+        )
+    else:
+        output = "{} {} {}".format(
+            time_to_list[2], time_to_list[1], time_to_list[0]
+        )
+    for e, p in numbers.items():
+        output = output.replace(e, p)
+    return output
+
+
+def next_day(date):
+    """return the Jalali (year, month, day) after date."""
+    year, month, day = date
+    if day < month_days(year, month):
+        return year, month, day + 1
+    if month < 12:
+        return year, month + 1, 1
+    return year + 1, 1, 1
+
+
+class Command(BaseCommand):
+    help = ('Benchmark the Jalali formatting of datetimes like the ones of a '
+            'page: created times of the last days, in random order. With '
+            '--check compare every day of the lookup table with the '
+            'previous converter instead.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=730, 
+                            help='Days back that the datetimes are from.')
+        parser.add_argument('--count', type=int, default=100000, 
+                            help='Number of formatted datetimes.')
+        parser.add_argument('--rounds', type=int, default=3, 
+                            help='Rounds of the benchmark.')
+        parser.add_argument('--check', action='store_true', 
+                            help='Compare every day from FIRST_YEAR to '
+                                 'LAST_YEAR with the previous converter.')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            return self.check_days()
+
+        now = timezone.now()
+        rand = random.Random(0)
+        seconds = options['days'] * 24 * 60 * 60
+        times = [now - datetime.timedelta(seconds=rand.randrange(seconds))
+                 for _ in range(options['count'])]
+        if options['days'] > _format_day.cache_info().maxsize:
+            self.stderr.write('The days do not fit in the cache of '
+                              '_format_day, the warm cache case will miss.')
+
+        def clear():
+            _from_ordinal.cache_clear()
+            _format_day.cache_clear()
+
+        benchmarks = (
+            ('previous converter', None, 
+             lambda: [reference_converter(value) for value in times]),
+            ('jalali_converter, cold cache', clear, 
+             lambda: [format_date(value) for value in times]),
+            ('jalali_converter, warm cache', None, 
+             lambda: [format_date(value) for value in times]),
+            ('format_dates, warm cache', None, lambda: format_dates(times)),
+        )
+        for name, prepare, run in benchmarks:
+            best = None
+            for _ in range(options['rounds']):
+                if prepare:
+                    prepare()
+                started = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            self.stdout.write('{:<30} {:>10.2f} us per date'.format(
+                name, best / len(times) * 1e6
+            ))
+        info = _format_day.cache_info()
+        self.stdout.write('Day cache since the last clear: {} hits, {} '
+                          'misses'.format(info.hits, info.misses))
+
+    def check_days(self):
+        """
+        Compare every day of the lookup table with the previous converter.
+        It skips or repeats days in a few Jalali years, where differences
+        are reported but accepted. site_setting.tests checks a sample.
+        """
+        day = datetime.date(FIRST_YEAR, 1, 1)
+        last = datetime.date(LAST_YEAR, 12, 31)
+        previous_date = None
+        differences = {}
+        while day <= last:
+            new = to_jalali(day)
+            if to_gregorian(*new) != day:
+                raise CommandError('{} is converted to {}.'.format(day, new))
+            if previous_date and new != next_day(previous_date):
+                raise CommandError('{} does not follow {}.'.format(
+                    new, previous_date
+                ))
+            previous_date = new
+            value = timezone.make_aware(
+                datetime.datetime.combine(day, datetime.time(12, 5))
+            )
+            if format_date(value, True) != reference_converter(value, True):
+                differences[new[0]] = differences.get(new[0], 0) + 1
+            day += datetime.timedelta(days=1)
+        for year, count in sorted(differences.items()):
+            self.stdout.write('{}: {} days differ from the previous '
+                              'converter'.format(year, count))
+        self.stdout.write(self.style.SUCCESS(
+            'Every day from {} to {} is converted.'.format(FIRST_YEAR, 
+                                                          LAST_YEAR)
+        ))
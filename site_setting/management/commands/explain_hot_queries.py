@@ -0,0 +1,279 @@
+import datetime
+import itertools
+import random
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from account.models import User
+from blog.category_index import category_article_ids
+from blog.models import Article, Category, CategoryArticle
+from contact_us.models import ContactUs
+from real_estate.models import Estate, City
+from real_estate.search import EstateSearchQuery
+from site_setting.models import SiteSetting
+from subscription.models import Subscription
+
+
+def _first(model):
+    """return the id of an object of model to filter the queries by."""
+    return model.objects.order_by('pk').values_list('pk', flat=True) \
+                        .first() or 0
+
+
+def _search(**query):
+    return EstateSearchQuery(**query).filter(Estate.published.all())
+
+
+# Name to a function returning the queryset of a query that views, mixins or
+# background jobs run on every request or on large tables. Add a query here
+# when a view starts filtering or sorting by other fields.
+HOT_QUERIES = {
+    'estate list': lambda: Estate.published.all()[:12],
+    'estate list of a city':
+        lambda: Estate.published.filter(city_id=_first(City))[:12],
+    'most viewed estates':
+        lambda: _search(sort='views')[:12],
+    'estate search by price':
+        lambda: _search(status='s', ranges={'price': (1000, 5000)}),
+    'estate search by city and price':
+        lambda: _search(status='r', cities=[_first(City)],
+                        ranges={'price': (1000, 5000), 'room': (2, None)}),
+    'estate search by size':
+        lambda: _search(status='s', ranges={'size': (80, 120),
+                                            'year': (1390, None)}),
+    'estates of an agent':
+        lambda: Estate.objects.filter(agent_id=_first(User))[:20],
+    'estates of an agent by status':
+        lambda: Estate.objects.filter(agent_id=_first(User),
+                                      published_status='d')[:20],
+    'estate moderation queue':
+        lambda: Estate.objects.filter(published_status='c',
+                                      claimed_until__isnull=True)[:20],
+    'article list': lambda: Article.published.all()[:4],
+    'most viewed articles':
+        lambda: Article.published.order_by('-views', '-publish')[:4],
+    'articles of a category':
+        lambda: category_article_ids(_first(Category))[:4],
+    'articles of an author':
+        lambda: Article.objects.filter(author_id=_first(User),
+                                       published_status='p')[:20],
+    'active agents': lambda: User.active.all()[:20],
+    'subscription of an agent':
+        lambda: Subscription.objects.filter(agent_id=_first(User),
+                                            active=True)
+                                    .order_by('created', 'id')[:1],
+    'expired subscriptions':
+        lambda: Subscription.objects.filter(
+            active=True, expiration_date__lte=timezone.now()
+        ).order_by('expiration_date')[:500],
+    'active site setting':
+        lambda: SiteSetting.objects.filter(is_active=True)[:1],
+    'messages to review':
+        lambda: ContactUs.objects.filter(reviewed=False)[:100],
+}
+
+
+def plan(queryset):
+    """return the rows of the query plan of queryset as dicts."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('{} {}'.format(connection.ops.explain_query_prefix(),
+                                      sql), params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def full_scans(rows):
+    """
+    return the tables that a plan reads row by row from the first to the
+    last, on MySQL, SQLite and PostgreSQL.
+    """
+    if connection.vendor == 'mysql':
+        return [row['table'] for row in rows if row['type'] == 'ALL']
+    if connection.vendor == 'sqlite':
+        # e.g. SCAN real_estate_estate, or SCAN TABLE real_estate_estate on
+        # older versions. A scan USING INDEX reads the rows in index order.
+        return [
+            row['detail'].split()[-1] for row in rows
+            if re.match(r'SCAN (TABLE )?\w+$', row['detail'])
+        ]
+    return [match.group(1) for row in rows
+            for match in [re.search(r'Seq Scan on (\w+)', row['QUERY PLAN'])]
+            if match]
+
+
+def sorts(rows):
+    """
+    return True if a plan sorts the rows instead of reading them in the
+    order of an index.
+    """
+    if connection.vendor == 'mysql':
+        return any('Using filesort' in (row['Extra'] or '') for row in rows)
+    if connection.vendor == 'sqlite':
+        return any('TEMP B-TREE FOR ORDER BY' in row['detail'] 
+                   for row in rows)
+    return any(re.match(r'\s*(->\s*)?Sort\b', row['QUERY PLAN']) 
+               for row in rows)
+
+
+def _create(model, objects):
+    """
+    Insert objects in chunks so they are not all in memory at once. The
+    database backend splits a chunk further if it allows fewer rows in one
+    insert.
+    """
+    objects = iter(objects)
+    while True:
+        chunk = list(itertools.islice(objects, 1000))
+        if not chunk:
+            return
+        model.objects.bulk_create(chunk)
+
+
+def seed(size):
+    """
+    Fill the tables of the hot queries with size estates and articles, and
+    some of other objects, in the shape of the real data.
+    """
+    rand = random.Random(0)
+    now = timezone.now()
+    ago = lambda: now - datetime.timedelta(minutes=rand.randrange(525600))
+
+    # bulk_create does not set the ids on MySQL, so they are read back.
+    City.objects.bulk_create(
+        City(name='شهر {}'.format(number)) for number in range(50)
+    )
+    cities = list(City.objects.values_list('id', flat=True))
+    User.objects.bulk_create(
+        User(email='agent{}@example.com'.format(number),
+             first_name='نماینده {}'.format(number), phone='09120000000',
+             image='image.png', is_active=rand.random() < 0.9,
+             date_joined=ago())
+        for number in range(max(size // 20, 10))
+    )
+    users = list(User.objects.values_list('id', flat=True))
+    Category.objects.bulk_create(
+        Category(title='دسته {}'.format(number)) for number in range(20)
+    )
+    categories = list(Category.objects.values_list('id', flat=True))
+    statuses = 'p' * 16 + 'dcb'
+    _create(Estate, (
+        Estate(main_image='image.png', agent_id=rand.choice(users),
+               city_id=rand.choice(cities), title='ملک {}'.format(number),
+               description='', status=rand.choice('sr'),
+               size=rand.randrange(30, 500),
+               price=rand.randrange(100, 100000) * 1000,
+               room=rand.randrange(0, 6), year=rand.randrange(1350, 1405),
+               floor=rand.randrange(0, 20), elevator=rand.random() < 0.5,
+               parking=rand.random() < 0.5, warehouse=rand.random() < 0.5,
+               published_status=rand.choice(statuses),
+               views=rand.randrange(1000))
+        for number in range(size)
+    ))
+    _create(Article, (
+        Article(author_id=rand.choice(users), title='مقاله {}'.format(number),
+                description='', image='image.png',
+                published_status=rand.choice(statuses), publish=ago(),
+                views=rand.randrange(1000))
+        for number in range(size)
+    ))
+    _create(CategoryArticle, (
+        CategoryArticle(category_id=rand.choice(categories),
+                        article_id=article_id, publish=publish)
+        for article_id, publish in Article.published.values_list('id',
+                                                                 'publish')
+    ))
+    _create(Subscription, (
+        Subscription(agent_id=rand.choice(users), name='طرح', price=1000,
+                     day_count=30, estate_count=10,
+                     active=rand.random() < 0.2,
+                     expiration_date=ago() + datetime.timedelta(days=365))
+        for _ in range(size // 2)
+    ))
+    _create(ContactUs, (
+        ContactUs(name='پیام دهنده', email='user@example.com', phone='0',
+                  subject='موضوع', message='', reviewed=rand.random() < 0.9)
+        for _ in range(size // 2)
+    ))
+    SiteSetting.objects.bulk_create((
+        SiteSetting(name='سایت', main_logo='image.png',
+                    second_logo='image.png', background_image='image.png',
+                    not_found_image='image.png', about_us_image='image.png',
+                    home_page_text='', home_page_second_text='', about_us='',
+                    short_about_us='', address='', email='site@example.com',
+                    phone='0', is_active=number == 0)
+        for number in range(100)
+    ))
+
+    # Let the query planner know the sizes of the seeded tables.
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            tables = [model._meta.db_table for model in
+                      (Estate, Article, CategoryArticle, User, Subscription,
+                       ContactUs, SiteSetting)]
+            cursor.execute('ANALYZE TABLE ' + ', '.join(tables))
+            cursor.fetchall()
+        else:
+            cursor.execute('ANALYZE')
+
+
+class Command(BaseCommand):
+    help = ('Explain the registered hot queries and fail if one of them '
+            'scans a whole table.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0, metavar='SIZE',
+            help='Create a test database with SIZE estates and articles '
+                 'and explain the queries on it instead of the database '
+                 'of the site. The test database is destroyed at the end.'
+        )
+        parser.add_argument('--query', action='append',
+                            choices=sorted(HOT_QUERIES),
+                            help='Explain only this query.')
+
+    def handle(self, *args, **options):
+        names = options['query'] or list(HOT_QUERIES)
+        if not options['seed']:
+            return self.explain(names, options['verbosity'])
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True,
+                                           serialize=False)
+        try:
+            seed(options['seed'])
+            self.explain(names, options['verbosity'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def explain(self, names, verbosity):
+        failed = []
+        for name in names:
+            queryset = HOT_QUERIES[name]()
+            rows = plan(queryset)
+            tables = full_scans(rows)
+            if tables:
+                failed.append(name)
+                self.stderr.write('{}: full scan of {}'.format(
+                    name, ', '.join(tables)
+                ))
+            elif sorts(rows):
+                # Not an error, a filter can leave few rows to sort.
+                self.stdout.write(self.style.WARNING(
+                    '{}: sorted without an index'.format(name)
+                ))
+            else:
+                self.stdout.write('{}: ok'.format(name))
+            if verbosity > 1:
+                self.stdout.write('  ' + queryset.explain()
+                                                 .replace('\n', '\n  '))
+        if failed:
+            raise CommandError('{} of {} queries scan a whole table.'.format(
+                len(failed), len(names)
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            'None of {} queries scan a whole table.'.format(len(names))
+        ))
@@ -0,0 +1,42 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from extensions.fields import JalaliYearMonthField
+from extensions.jalali_calendar import year_month
+
+
+class Command(BaseCommand):
+    help = 'Set the Jalali month columns of all rows from their dates.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        size = options['chunk_size']
+        for model in apps.get_models():
+            for field in model._meta.fields:
+                if not isinstance(field, JalaliYearMonthField):
+                    continue
+                count = self.fill(model, field, size)
+                self.stdout.write('{}.{}: {} rows'.format(
+                    model._meta.label, field.name, count
+                ))
+        self.stdout.write(self.style.SUCCESS('Jalali months are filled.'))
+
+    def fill(self, model, field, size):
+        rows = model._default_manager.order_by('pk') \
+                                     .only('pk', field.source)
+        count = 0
+        last_pk = None
+        while True:
+            chunk = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+            chunk = list(chunk[:size])
+            if not chunk:
+                return count
+            for obj in chunk:
+                time = getattr(obj, field.source)
+                setattr(obj, field.attname, 
+                        year_month(time) if time else None)
+            model._default_manager.bulk_update(chunk, [field.name])
+            count += len(chunk)
+            last_pk = chunk[-1].pk
@@ -48,6 +48,7 @@ class SiteSetting(models.Model):
 
 	class Meta:
 		ordering = ('-created',)
+		indexes = [models.Index(fields=['is_active', 'created'])]
 		verbose_name = "تنظیمات سایت"
 		verbose_name_plural = "تنظیمات سایت"
 
@@ -112,6 +113,8 @@ class Faq(models.Model):
 
 	class Meta:
 		ordering = ('-created',)
+		# Admin search
+		indexes = [models.Index(fields=['title'])]
 		verbose_name = "سوال"
 		verbose_name_plural = "سوالات متداول"
 
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_save, post_delete
+
+from .models import SiteSetting, Faq
+from account.models import User
+from blog.models import Article, Category
+from real_estate.models import Estate, EstateImage, City
+from extensions.cache import bump_generation_on_commit, PAGES
+
+
+def invalidate_pages(sender, instance, update_fields=None, **kwargs):
+	"""Refresh the cached pages when content shown on them changes."""
+	# Logging in only updates last_login which is not shown on any page.
+	if update_fields and set(update_fields) == {'last_login'}:
+		return
+	bump_generation_on_commit(PAGES)
+
+
+for model in (SiteSetting, Faq, User, Article, Category, Estate, EstateImage, 
+			  City):
+	post_save.connect(invalidate_pages, sender=model)
+	post_delete.connect(invalidate_pages, sender=model)
@@ -1,3 +1,82 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from extensions import jalali
+from extensions.jalali_calendar import (format_date, to_jalali, to_gregorian, 
+										period_bounds, parse_period)
+from site_setting.management.commands.benchmark_jalali import (
+	next_day, reference_converter
+)
+
+
+class JalaliCalendarTests(SimpleTestCase):
+	# Jalali years where the previous converter skips or repeats days, as it
+	# counts 1900 and 2100 as leap years and repeats a day in 2095.
+	BROKEN_YEARS = {1278, 1473, 1474, 1478}
+
+	def sample_dates(self):
+		"""
+		return the first and last days of every Gregorian and Jalali year
+		from 1900 to 2100 and every day of the broken years.
+		benchmark_jalali --check compares every day.
+		"""
+		dates = set()
+		for year in range(1900, 2101):
+			dates.update((datetime.date(year, 1, 1), 
+						  datetime.date(year, 12, 31)))
+		for year in range(1279, 1480):
+			nowruz = to_gregorian(year, 1, 1)
+			dates.update((nowruz, nowruz - datetime.timedelta(days=1)))
+		for year in self.BROKEN_YEARS:
+			first = to_gregorian(year, 1, 1) if year > 1278 else \
+				datetime.date(1900, 1, 1)
+			dates.update(first + datetime.timedelta(days=days) 
+						 for days in range(366))
+		return sorted(date for date in dates 
+					  if datetime.date(1900, 1, 1) <= date <= 
+					  datetime.date(2100, 12, 31))
+
+	def test_sampled_days(self):
+		"""Compare the sampled days with the previous converter."""
+		for date in self.sample_dates():
+			new = to_jalali(date)
+			self.assertEqual(to_gregorian(*new), date)
+			self.assertEqual(
+				to_jalali(date + datetime.timedelta(days=1)), next_day(new)
+			)
+			if new[0] in self.BROKEN_YEARS:
+				continue
+			value = timezone.make_aware(
+				datetime.datetime.combine(date, datetime.time(12, 5))
+			)
+			self.assertEqual(format_date(value), reference_converter(value))
+			self.assertEqual(format_date(value, True), 
+							 reference_converter(value, True))
+
+	def test_broken_years(self):
+		"""The previous converter skips or repeats days in the broken years."""
+		broken = set()
+		for date in self.sample_dates():
+			before = date - datetime.timedelta(days=1)
+			previous = jalali.Gregorian(date).persian_tuple()
+			if previous != next_day(jalali.Gregorian(before).persian_tuple()):
+				broken.add(previous[0])
+		self.assertEqual(broken, self.BROKEN_YEARS)
+
+	def test_invalid_dates(self):
+		with self.assertRaises(ValueError):
+			to_gregorian(1405, 7, 31)
+		with self.assertRaises(ValueError):
+			to_gregorian(1405, 13, 1)
+
+	def test_periods(self):
+		self.assertEqual(parse_period('1405/7'), (1405, 7))
+		self.assertEqual(parse_period('مهر ۱۴۰۵'), (1405, 7))
+		self.assertEqual(parse_period('۱۴۰۵'), (1405, None))
+		with self.assertRaises(ValueError):
+			parse_period('1405/13')
+		start, end = period_bounds(1405, 12)
+		self.assertEqual(end, period_bounds(1406, 1)[0])
+		self.assertLess(start, end)
@@ -1,14 +1,24 @@
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 
 from .models import SiteSetting, Faq
 from account.models import User
-from blog.models import Article
-from real_estate.models import Estate, City
+from blog.models import Article, LIST_FIELDS
+from real_estate.models import Estate
+from real_estate.search import get_search_form_context
+from extensions.cache import cache_page_swr
+from counter.utils import get_counts, AGENTS, ESTATES, ARTICLES
 
 
+@method_decorator(
+	cache_page_swr(60, 24 * 60 * 60), name='dispatch'
+)
 class Home(TemplateView):
-	"""Retrieve some objects to show in home page."""
+	"""
+	Retrieve some objects to show in home page. The page is cached and 
+	refreshed by one worker when it gets stale.
+	"""
 	def get(self, request, *args, **kwargs):
 		# Some settings of site such as footer context and ...
 		site_setting = SiteSetting.objects.filter(is_active=True)
@@ -22,31 +32,18 @@ class Home(TemplateView):
 		agents = User.active.all()[:7]
 
 		# Last 3 published articles
-		latest_articles = Article.published.select_related('author')[:3]
+		latest_articles = Article.published.select_related('author') \
+										 .only(*LIST_FIELDS)[:3]
 
-		# Get maximum amount of price, size and room to render search form in 
-		# template.
-		obj = Estate.published.all()
-		if obj:
-			max_price = obj.order_by('-price')[0].price
-			max_size = obj.order_by('-size')[0].size
-			max_room = obj.order_by('-room')[0].room
-		else:
-			max_price = 1000000
-			max_size = 1000
-			max_room = 10
-			
-		cities = City.objects.all()
+		# Maximum price, size and room and the cities of search form
+		search_form = get_search_form_context()
 
 		return render(request, 'site_setting/home.html',
 					{'site_setting': site_setting, 
 					'estates': estates, 
 					'agents': agents,
 					'latest_articles': latest_articles,
-					'max_price':max_price, 
-					'max_size': max_size, 
-					'max_room': max_room,
-					'cities': cities})
+					**search_form})
 	
 
 class AboutUs(TemplateView):
@@ -57,9 +54,10 @@ class AboutUs(TemplateView):
 			site_setting = site_setting[0]
 		
 		# Count of active users, published articles and estates
-		agents_count = User.active.count()
-		estates_count = Estate.published.count()
-		article_count = Article.published.count()
+		counts = get_counts([AGENTS, ESTATES, ARTICLES])
+		agents_count = counts[AGENTS]
+		estates_count = counts[ESTATES]
+		article_count = counts[ARTICLES]
 
 		return render(request, 'site_setting/about_us.html', 
 					{'site_setting': site_setting, 
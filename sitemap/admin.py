@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import SitemapShard
+
+
+@admin.register(SitemapShard)
+class SitemapShardAdmin(admin.ModelAdmin):
+    list_display = ('section', 'number', 'url_count', 'last_updated', 
+                    'generated')
+    list_filter = ('section',)
@@ -0,0 +1,153 @@
+import gzip
+import os
+import threading
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, F, Max
+from django.db.models.functions import Floor
+
+from .models import SitemapShard
+from blog.models import Article
+from publisher.pages import estate_path, article_path
+from publisher.publish import write_atomic
+from real_estate.models import Estate
+
+
+# Most urls of one sitemap file, as allowed by the sitemap protocol.
+SHARD_SIZE = 50000
+
+# Directory of the generated files. The front-end web server may serve them
+# directly, e.g. for nginx: location /sitemaps/ { gzip_static always; }
+SITEMAP_ROOT = getattr(settings, 'SITEMAP_ROOT',
+					   os.path.join(settings.BASE_DIR, 'sitemaps'))
+
+# Scheme and host name of the urls in sitemaps.
+SITEMAP_BASE_URL = getattr(settings, 'SITEMAP_BASE_URL', 'http://localhost')
+
+# Seconds that changes are collected before the sitemaps are rebuilt.
+SITEMAP_DELAY = getattr(settings, 'SITEMAP_DELAY', 60)
+
+INDEX_FILE = 'sitemap.xml.gz'
+
+# Section name to its published queryset and the function building the path.
+SECTIONS = {
+	'estates': (lambda: Estate.published.all(), estate_path),
+	'articles': (lambda: Article.published.all(), article_path),
+}
+
+
+def shard_file(section, number):
+	return os.path.join(SITEMAP_ROOT, '{}-{}.xml.gz'.format(section, number))
+
+
+def shard_states(section):
+	"""
+	return {shard number: (url count, last updated)} of a section with one
+	grouped query. Shards are ranges of SHARD_SIZE ids, so a change of an
+	object only changes the state of its own shard.
+	"""
+	queryset = SECTIONS[section][0]()
+	rows = queryset.order_by().annotate(shard=Floor(F('id') / SHARD_SIZE)) \
+				   .values('shard') \
+				   .annotate(url_count=Count('id'), last_updated=Max('updated'))
+	return {int(row['shard']): (row['url_count'], row['last_updated'])
+			for row in rows}
+
+
+def _write_gzip(file_path, lines):
+	content = '\n'.join(lines).encode()
+	# mtime=0 gives the same file for the same content.
+	write_atomic(file_path, gzip.compress(content, mtime=0))
+
+
+def write_shard(section, number):
+	"""Write the sitemap file of one shard."""
+	queryset, path = SECTIONS[section]
+	rows = queryset().filter(id__gte=number * SHARD_SIZE,
+							 id__lt=(number + 1) * SHARD_SIZE) \
+					 .order_by('id').values_list('id', 'updated')
+	lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+			 '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+	for pk, updated in rows.iterator():
+		lines.append('<url><loc>{}</loc><lastmod>{}</lastmod></url>'.format(
+			escape(SITEMAP_BASE_URL + path(pk)), updated.date().isoformat()
+		))
+	lines.append('</urlset>')
+	_write_gzip(shard_file(section, number), lines)
+
+
+def write_index():
+	"""Write the sitemap index of all shards."""
+	lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+			 '<sitemapindex '
+			 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+	for shard in SitemapShard.objects.all():
+		lines.append(
+			'<sitemap><loc>{}/sitemaps/{}-{}.xml</loc>'
+			'<lastmod>{}</lastmod></sitemap>'.format(
+				escape(SITEMAP_BASE_URL), shard.section, shard.number,
+				shard.last_updated.isoformat()
+			)
+		)
+	lines.append('</sitemapindex>')
+	_write_gzip(os.path.join(SITEMAP_ROOT, INDEX_FILE), lines)
+
+
+def build(force=False):
+	"""
+	Write the sitemap files of shards whose objects changed since they were
+	written, remove files of empty shards and write the index if anything
+	changed. return the number of written shards.
+	"""
+	written = 0
+	changed = force
+	for section in SECTIONS:
+		stored = {shard.number: shard for shard in
+				  SitemapShard.objects.filter(section=section)}
+		for number, (url_count, last_updated) in shard_states(section).items():
+			shard = stored.pop(number, None)
+			if (not force and shard is not None and
+					shard.url_count == url_count and
+					shard.last_updated == last_updated and
+					os.path.exists(shard_file(section, number))):
+				continue
+			write_shard(section, number)
+			SitemapShard.objects.update_or_create(
+				section=section, number=number,
+				defaults={'url_count': url_count,
+						  'last_updated': last_updated}
+			)
+			written += 1
+			changed = True
+		# Shards that have no published object anymore.
+		for number, shard in stored.items():
+			if os.path.exists(shard_file(section, number)):
+				os.unlink(shard_file(section, number))
+			shard.delete()
+			changed = True
+
+	if changed or not os.path.exists(os.path.join(SITEMAP_ROOT, INDEX_FILE)):
+		write_index()
+	return written
+
+
+def _delayed_build():
+	try:
+		build()
+	finally:
+		connection.close()
+
+
+def schedule_build():
+	"""
+	Rebuild the changed shards in a background thread after SITEMAP_DELAY
+	seconds. Only one build is scheduled per delay across all workers.
+	"""
+	if not cache.add('sitemap:building', 1, SITEMAP_DELAY):
+		return
+	timer = threading.Timer(SITEMAP_DELAY, _delayed_build)
+	timer.daemon = True
+	timer.start()
@@ -0,0 +1,122 @@
+import hashlib
+
+from django.contrib.syndication.views import Feed
+from django.db.models import Max
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from blog.models import Article
+from extensions.cache import get_or_fill
+from publisher.pages import estate_path, article_path
+from real_estate.models import Estate
+
+
+FEED_ITEMS = 20
+
+# A cached feed is dropped as soon as a newer object is saved, so it can be
+# kept fresh for long.
+FEED_CACHE_TIMEOUT = 60 * 60
+FEED_STALE_TIMEOUT = 24 * 60 * 60
+
+
+class LatestEstatesFeed(Feed):
+	title = 'آخرین املاک'
+	description = 'آخرین املاک منتشر شده'
+
+	def link(self):
+		return reverse('real_estate:estate_list')
+
+	def items(self):
+		return Estate.published.select_related('city') \
+							   .order_by('-created')[:FEED_ITEMS]
+
+	def item_title(self, item):
+		return item.title
+
+	def item_description(self, item):
+		return Truncator(item.description).chars(300)
+
+	def item_link(self, item):
+		return estate_path(item.pk)
+
+	def item_pubdate(self, item):
+		return item.created
+
+	def item_updateddate(self, item):
+		return item.updated
+
+	def latest(self):
+		"""return the value the cached feed is valid for."""
+		return Estate.published.aggregate(latest=Max('updated'))['latest']
+
+
+class LatestEstatesAtomFeed(LatestEstatesFeed):
+	feed_type = Atom1Feed
+	subtitle = LatestEstatesFeed.description
+
+
+class LatestArticlesFeed(Feed):
+	title = 'آخرین مقالات'
+	description = 'آخرین مقالات منتشر شده'
+
+	def link(self):
+		return reverse('blog:article_list')
+
+	def items(self):
+		return Article.published.select_related('author') \
+								.order_by('-publish')[:FEED_ITEMS]
+
+	def item_title(self, item):
+		return item.title
+
+	def item_description(self, item):
+		return Truncator(strip_tags(item.description)).chars(300)
+
+	def item_link(self, item):
+		return article_path(item.pk)
+
+	def item_author_name(self, item):
+		return item.author.get_full_name() if item.author else None
+
+	def item_pubdate(self, item):
+		return item.publish
+
+	def item_updateddate(self, item):
+		return item.updated
+
+	def latest(self):
+		return tuple(Article.published.aggregate(
+			publish=Max('publish'), updated=Max('updated')
+		).values())
+
+
+class LatestArticlesAtomFeed(LatestArticlesFeed):
+	feed_type = Atom1Feed
+	subtitle = LatestArticlesFeed.description
+
+
+def cached_feed(feed_class):
+	"""
+	return a view serving the feed from cache. The cached feed is keyed by
+	the latest updated or publish value of its objects, so it is rendered
+	again only after one of them changes.
+	"""
+	feed = feed_class()
+
+	def view(request):
+		def fill():
+			response = feed(request)
+			return response.content, response['Content-Type']
+
+		latest = hashlib.md5(repr(feed.latest()).encode()).hexdigest()
+		key = 'feed:{}:{}:{}'.format(feed_class.__name__, request.get_host(),
+									 latest)
+		content, content_type = get_or_fill(
+			key, fill, FEED_CACHE_TIMEOUT, FEED_STALE_TIMEOUT
+		)
+		return HttpResponse(content, content_type=content_type)
+
+	return view
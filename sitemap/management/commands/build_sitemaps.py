@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from sitemap.builder import build, SITEMAP_ROOT
+
+
+class Command(BaseCommand):
+	help = 'Write the sitemap files of changed shards to SITEMAP_ROOT.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--force', action='store_true', 
+							help='Write all shards even if not changed.')
+
+	def handle(self, *args, **options):
+		written = build(force=options['force'])
+		self.stdout.write(self.style.SUCCESS(
+			'{} sitemap shards written to {}'.format(written, SITEMAP_ROOT)
+		))
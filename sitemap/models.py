@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class SitemapShard(models.Model):
+	"""State of a generated sitemap file, used to find the changed shards."""
+	section = models.CharField(max_length=20, verbose_name='بخش')
+	number = models.PositiveIntegerField(verbose_name='شماره')
+	url_count = models.PositiveIntegerField(verbose_name='تعداد آدرس‌ها')
+	last_updated = models.DateTimeField(verbose_name='آخرین ویرایش')
+	generated = models.DateTimeField(auto_now=True, 
+									 verbose_name='تاریخ ساخت')
+
+	class Meta:
+		unique_together = ('section', 'number')
+		ordering = ('section', 'number')
+		verbose_name = "بخش نقشه سایت"
+		verbose_name_plural = "بخش‌های نقشه سایت"
+
+	def __str__(self):
+		return f"{self.section} - {self.number}"
+
+	@property
+	def file_name(self):
+		return '{}-{}.xml.gz'.format(self.section, self.number)
@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .builder import schedule_build
+from blog.models import Article
+from real_estate.models import Estate
+
+
+def rebuild_sitemaps(sender, instance, **kwargs):
+	"""Rebuild the changed sitemap shards after the transaction commits."""
+	transaction.on_commit(schedule_build)
+
+
+for model in (Estate, Article):
+	post_save.connect(rebuild_sitemaps, sender=model)
+	post_delete.connect(rebuild_sitemaps, sender=model)
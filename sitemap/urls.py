@@ -0,0 +1,21 @@
+from django.urls import path
+
+from .feeds import (LatestEstatesFeed, LatestEstatesAtomFeed, 
+                    LatestArticlesFeed, LatestArticlesAtomFeed, cached_feed)
+from .views import SitemapView
+
+
+app_name = 'sitemap'
+urlpatterns = [
+    path('sitemap.xml', SitemapView.as_view(), name='index'),
+    path('sitemaps/<slug:section>-<int:number>.xml', SitemapView.as_view(), 
+         name='shard'),
+    path('feeds/estates/', cached_feed(LatestEstatesFeed), 
+         name='estates_feed'),
+    path('feeds/estates/atom/', cached_feed(LatestEstatesAtomFeed), 
+         name='estates_atom_feed'),
+    path('feeds/articles/', cached_feed(LatestArticlesFeed), 
+         name='articles_feed'),
+    path('feeds/articles/atom/', cached_feed(LatestArticlesAtomFeed), 
+         name='articles_atom_feed'),
+]
@@ -0,0 +1,35 @@
+import gzip
+import os
+
+from django.http import Http404, HttpResponse
+from django.views.generic import View
+
+from .builder import SECTIONS, SITEMAP_ROOT, INDEX_FILE, shard_file
+
+
+class SitemapView(View):
+	"""
+	Serve a precompressed sitemap file. Nothing is rendered per request;
+	the files are written by the builder when objects change.
+	"""
+	def get(self, request, section=None, number=None, *args, **kwargs):
+		if section is None:
+			file_path = os.path.join(SITEMAP_ROOT, INDEX_FILE)
+		elif section in SECTIONS:
+			file_path = shard_file(section, number)
+		else:
+			raise Http404
+		try:
+			with open(file_path, 'rb') as sitemap_file:
+				content = sitemap_file.read()
+		except FileNotFoundError:
+			raise Http404
+
+		if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+			response = HttpResponse(content, content_type='application/xml')
+			response['Content-Encoding'] = 'gzip'
+		else:
+			response = HttpResponse(gzip.decompress(content), 
+									content_type='application/xml')
+		response['Vary'] = 'Accept-Encoding'
+		return response
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
 from .models import Plan, Subscription
+from extensions.admin import FastChangeListMixin, jalali_column
+from extensions.jalali_filters import JalaliYearFilter, JalaliMonthFilter
 
 
 @admin.register(Plan)
@@ -10,10 +12,16 @@ class PlanAdmin(admin.ModelAdmin):
 
 
 @admin.register(Subscription)
-class SubscriptionAdmin(admin.ModelAdmin):
+class SubscriptionAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = ('agent', 'name', 'price', 'jcreated', 'day_count', 
                     'estate_count', 'created_estates', 'jexpiration_date', 
                     'active')
-    search_fields = ('agent', 'name', 'price', 'day_count', 'estate_count', 
-                     'created_estates', 'created')
+    list_filter = (JalaliYearFilter, JalaliMonthFilter, 'active')
+    list_select_related = ('agent',)
+    # Prefix and exact lookups of indexed columns
+    search_fields = ('=id', '=agent__email', '^agent__first_name')
     raw_id_fields = ('agent',)
+
+    jcreated = jalali_column('created', 'تاریخ خرید', detail=True)
+    jexpiration_date = jalali_column('expiration_date', 'تاریخ انقضا', 
+                                     detail=True)
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Subscription
+
+
+# Seconds that the quota state of an agent is cached. An entry never outlives
+# the expiration of its subscription.
+ENTITLEMENT_TIMEOUT = getattr(settings, 'ENTITLEMENT_CACHE_TIMEOUT', 5 * 60)
+
+
+def _key(agent_id):
+	return 'entitlement:{}'.format(agent_id)
+
+
+def _valid(queryset, now):
+	"""Filter subscriptions that can still be used to create an estate."""
+	return queryset.filter(active=True, expiration_date__gt=now, 
+						   created_estates__lt=F('estate_count'))
+
+
+def get_entitlement(agent_id):
+	"""
+	return the cached state of the usable subscription of an agent as a dict
+	of id, remaining estates and expiration date, or None if the agent has
+	no usable subscription.
+	"""
+	now = timezone.now()
+	state = cache.get(_key(agent_id))
+	if state is None:
+		subscription = _valid(Subscription.objects.filter(agent_id=agent_id), 
+							  now) \
+			.order_by('created', 'id') \
+			.values('id', 'estate_count', 'created_estates', 
+					'expiration_date') \
+			.first()
+		if subscription:
+			state = {
+				'id': subscription['id'],
+				'remaining': subscription['estate_count'] - 
+							 subscription['created_estates'],
+				'expiration_date': subscription['expiration_date'],
+			}
+			timeout = min(ENTITLEMENT_TIMEOUT, 
+						  (state['expiration_date'] - now).total_seconds())
+		else:
+			state = {'id': None}
+			timeout = ENTITLEMENT_TIMEOUT
+		cache.set(_key(agent_id), state, max(int(timeout), 1))
+
+	if state['id'] is None or state['remaining'] <= 0 or \
+			state['expiration_date'] <= now:
+		return None
+	return state
+
+
+def has_quota(agent_id):
+	"""return True if the agent can create an estate."""
+	return get_entitlement(agent_id) is not None
+
+
+def invalidate(agent_id):
+	"""
+	Drop the cached state of an agent now and again after the current
+	transaction commits, so a state read before the commit is not kept.
+	"""
+	cache.delete(_key(agent_id))
+	transaction.on_commit(lambda: cache.delete(_key(agent_id)))
+
+
+def reserve(agent_id):
+	"""
+	Use one estate of the subscription of agent with one conditional UPDATE,
+	so concurrent requests can never use more than the quota. Call it in the
+	transaction that creates the estate, so the reservation is rolled back
+	with it. return the id of the used subscription or None.
+	"""
+	for _ in range(2):
+		state = get_entitlement(agent_id)
+		if state is None:
+			return None
+		reserved = _valid(Subscription.objects.filter(pk=state['id']), 
+						  timezone.now()) \
+			.update(created_estates=F('created_estates') + 1)
+		invalidate(agent_id)
+		if reserved:
+			return state['id']
+		# The cached state was out of date, try again with a fresh one.
+	return None
@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Subscription
+from .entitlements import invalidate
+from extensions.utils import jalali_converter
+from outbox.backends import OutboxBackend
+
+
+# Agents are reminded this many days before their subscription expires.
+REMINDER_DAYS = getattr(settings, 'SUBSCRIPTION_REMINDER_DAYS', 3)
+
+# Rows handled by one statement, so no statement locks many rows for long.
+CHUNK_SIZE = getattr(settings, 'SUBSCRIPTION_EXPIRY_CHUNK_SIZE', 500)
+
+
+def _unusable(now):
+	return Q(expiration_date__lte=now) | \
+		   Q(created_estates__gte=F('estate_count'))
+
+
+def deactivate_expired(chunk_size=CHUNK_SIZE):
+	"""
+	Deactivate active subscriptions that are expired or have no estates
+	left, with one UPDATE per chunk. return the number of deactivated rows.
+	"""
+	now = timezone.now()
+	expired = Subscription.objects.filter(_unusable(now), active=True)
+	deactivated = 0
+	while True:
+		rows = list(expired.order_by('expiration_date')
+						   .values_list('id', 'agent_id')[:chunk_size])
+		if not rows:
+			return deactivated
+		deactivated += Subscription.objects.filter(
+			_unusable(now), id__in=[pk for pk, _ in rows], active=True
+		).update(active=False)
+		for agent_id in {agent_id for _, agent_id in rows if agent_id}:
+			invalidate(agent_id)
+
+
+def reminder_message(subscription):
+	return EmailMessage(
+		'یادآوری پایان اشتراک',
+		'اشتراک {} شما در تاریخ {} به پایان می‌رسد.'.format(
+			subscription.name, 
+			jalali_converter(subscription.expiration_date, detail=True)
+		),
+		settings.EMAIL_HOST_USER,
+		[subscription.agent.email],
+	)
+
+
+def send_reminders(days=REMINDER_DAYS, chunk_size=CHUNK_SIZE):
+	"""
+	Email the agents whose active subscription expires in the next days, a
+	chunk at a time. The reminders are queued in the outbox in the
+	transaction that marks them reminded, so a failing mail server delays
+	them instead of losing them. return the number of queued reminders.
+	"""
+	now = timezone.now()
+	expiring = Subscription.objects.filter(
+		active=True, reminded=False, expiration_date__gt=now, 
+		expiration_date__lte=now + timezone.timedelta(days=days)
+	)
+	queued = 0
+	while True:
+		with transaction.atomic():
+			# Locked rows are claimed before the lock is released, so another
+			# run never sends the same reminders.
+			ids = list(expiring.select_for_update()
+							   .order_by('expiration_date')
+							   .values_list('id', flat=True)[:chunk_size])
+			if not ids:
+				return queued
+			Subscription.objects.filter(id__in=ids).update(reminded=True)
+			subscriptions = Subscription.objects.filter(id__in=ids, 
+														agent__isnull=False) \
+												.select_related('agent') \
+												.only('id', 'name', 
+													  'expiration_date', 
+													  'agent__id', 
+													  'agent__email')
+			queued += OutboxBackend().send_messages(
+				[reminder_message(subscription) 
+				 for subscription in subscriptions]
+			)
+
+
+def run(days=REMINDER_DAYS, chunk_size=CHUNK_SIZE):
+	"""Deactivate expired subscriptions and send reminders."""
+	return deactivate_expired(chunk_size), send_reminders(days, chunk_size)
+
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from subscription.expiry import CHUNK_SIZE, REMINDER_DAYS, run
+
+
+# Run it from cron, e.g. every ten minutes:
+# */10 * * * * python manage.py expire_subscriptions
+class Command(BaseCommand):
+	help = 'Deactivate expired subscriptions and remind agents before expiry.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--days', type=int, default=REMINDER_DAYS, 
+							help='Remind subscriptions expiring in this many '
+								 'days.')
+		parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+	def handle(self, *args, **options):
+		deactivated, reminded = run(options['days'], options['chunk_size'])
+		self.stdout.write(self.style.SUCCESS(
+			'{} subscriptions deactivated, {} reminders queued.'.format(
+				deactivated, reminded
+			)
+		))
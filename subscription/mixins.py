@@ -1,17 +1,13 @@
 from django.http.response import HttpResponseRedirect
 from django.urls.base import reverse
 
-from .models import Subscription
+from .entitlements import has_quota
 
 
 class ActiveSubscriptionRedirectMixin():
 	"""Redirect agent if he has an active subscription."""
 	def dispatch(self, request, *args, **kwargs):
-		agent = request.user
-		subscription = Subscription.objects.filter(
-			active=True, agent=agent
-		).last()
-		if subscription and subscription.is_active():
+		if has_quota(request.user.id):
 			return HttpResponseRedirect(reverse('site_setting:home'))
 		return super().dispatch(request, *args, **kwargs)
 
@@ -19,11 +15,7 @@ class ActiveSubscriptionRedirectMixin():
 class NotActiveSubscriptionRedirectMixin():
 	"""Redirect agent if he does not have an active subscription."""
 	def dispatch(self, request, *args, **kwargs):
-		agent = request.user
-		subscription = Subscription.objects.filter(
-			active=True, agent=agent
-		).last()
-		if not subscription or not subscription.is_active():
+		if not has_quota(request.user.id):
 			return HttpResponseRedirect(reverse('site_setting:home'))
 		return super().dispatch(request, *args, **kwargs)
 
@@ -31,11 +23,7 @@ class NotActiveSubscriptionRedirectMixin():
 class BuySubscriptionMixin():
 	"""Redirect agent if he has an active subscription."""
 	def dispatch(self, request, *args, **kwargs):
-		agent = request.user
-		subscription = Subscription.objects.filter(
-			active=True, agent=agent
-		).last()
-		if subscription and subscription.is_active():
+		if has_quota(request.user.id):
 			return HttpResponseRedirect(
 				reverse('subscription:active_subscription_alert')
 			)
@@ -1,6 +1,8 @@
 from django.db import models
+from django.utils import timezone
 
 from account.models import User
+from extensions.fields import JalaliYearMonthField
 from extensions.utils import jalali_converter
 
 
@@ -33,10 +35,20 @@ class Subscription(models.Model):
 		default=0, verbose_name='تعداد ملک ثبت شده'
 	)
 	expiration_date = models.DateTimeField(verbose_name='تاریخ انقضا')
+	jalali_year_month = JalaliYearMonthField(source='created', 
+											 verbose_name='ماه خرید')
+	reminded = models.BooleanField(default=False, editable=False, 
+								   verbose_name='یادآوری انقضا ارسال شده')
 	
 
 	class Meta:
 		ordering = ('-created',)
+		indexes = [
+			# Expiry scheduler
+			models.Index(fields=['active', 'expiration_date']),
+			# Usable subscriptions of an agent, oldest first.
+			models.Index(fields=['agent', 'active', 'created']),
+		]
 		verbose_name = "اشتراک"
 		verbose_name_plural = "اشتراک‌ها"
 		
@@ -55,14 +67,9 @@ class Subscription(models.Model):
 
 	def is_active(self):
 		"""
-		Check the subscription and return True if it is active else return 
-		False and deactivate the subscription.
+		return True if the subscription is active, not expired and has estates
+		left. Nothing is saved here.
 		"""
-		from datetime import datetime
-		if not self.active or self.created_estates == self.estate_count \
-			or datetime.now() > self.expiration_date.replace(tzinfo=None):
-			self.active = False
-			self.save()
-			return False
-		return True
+		return self.active and self.created_estates < self.estate_count \
+			and timezone.now() < self.expiration_date
 		
\ No newline at end of file
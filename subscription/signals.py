@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import entitlements
+from .models import Subscription
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def invalidate_entitlement(sender, instance, **kwargs):
+	"""Drop the cached quota of agent when a subscription is bought or changed."""
+	if instance.agent_id:
+		entitlements.invalidate(instance.agent_id)
@@ -1,3 +1,57 @@
+import datetime
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+
+from . import entitlements
+from .models import Subscription
+from account.models import User
+
+
+class ReserveTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.agent = User.objects.create_user(
+			'agent@example.com', 'password', first_name='agent', 
+			phone='09120000000', image='image.png'
+		)
+
+	def subscribe(self, estate_count, days=30):
+		return Subscription.objects.create(
+			agent=self.agent, name='plan', price=1000, day_count=days, 
+			estate_count=estate_count, 
+			expiration_date=timezone.now() + datetime.timedelta(days=days)
+		)
+
+	def test_reserve_up_to_the_quota(self):
+		subscription = self.subscribe(2)
+		self.assertEqual(entitlements.reserve(self.agent.id), subscription.id)
+		self.assertEqual(entitlements.reserve(self.agent.id), subscription.id)
+		self.assertIsNone(entitlements.reserve(self.agent.id))
+		subscription.refresh_from_db()
+		self.assertEqual(subscription.created_estates, 2)
+
+	def test_reserve_refuses_with_a_stale_cached_state(self):
+		subscription = self.subscribe(1)
+		# Cache the state with one remaining estate, then let another 
+		# request use it without dropping the cached state.
+		self.assertTrue(entitlements.has_quota(self.agent.id))
+		Subscription.objects.filter(pk=subscription.pk) \
+							.update(created_estates=1)
+		self.assertIsNone(entitlements.reserve(self.agent.id))
+		subscription.refresh_from_db()
+		self.assertEqual(subscription.created_estates, 1)
+
+	def test_reserve_uses_the_next_subscription(self):
+		first = self.subscribe(1)
+		second = self.subscribe(1)
+		self.assertTrue(entitlements.has_quota(self.agent.id))
+		Subscription.objects.filter(pk=first.pk).update(created_estates=1)
+		self.assertEqual(entitlements.reserve(self.agent.id), second.id)
+		self.assertIsNone(entitlements.reserve(self.agent.id))
 
-# Create your tests here.
+	def test_expired_subscription_is_not_reserved(self):
+		self.subscribe(5, days=0)
+		self.assertFalse(entitlements.has_quota(self.agent.id))
+		self.assertIsNone(entitlements.reserve(self.agent.id))
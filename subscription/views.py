@@ -1,4 +1,7 @@
+from datetime import timedelta
+
 from django.shortcuts import render, redirect, get_object_or_404
+from django.utils import timezone
 from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 
@@ -29,14 +32,13 @@ class BuySubscription(LoginRequiredMixin, BuySubscriptionMixin, TemplateView):
 	def get(self, request, plan_id, *args, **kwargs):
 		plan = get_object_or_404(Plan, id=plan_id)
 		agent = self.request.user
-		from datetime import datetime, timedelta
 		Subscription.objects.create(
 			agent=agent,
 			name=plan.name,
 			price=plan.price,
 			day_count=plan.day_count,
 			estate_count=plan.estate_count,
-			expiration_date=datetime.now() + timedelta(days=plan.day_count)
+			expiration_date=timezone.now() + timedelta(days=plan.day_count)
 		)
 		return redirect('account:subscription_list')
 